@@ -0,0 +1,53 @@
+from django.contrib import admin
+
+from .paginator import EstimatedCountPaginator
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Фильтр с текстовым полем вместо списка всех возможных значений."""
+    template = 'admin/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        # непустой список, чтобы фильтр отображался
+        return ((),)
+
+    def choices(self, changelist):
+        all_choice = next(super().choices(changelist))
+        all_choice['query_parts'] = (
+            (key, value)
+            for key, value in changelist.get_filters_params().items()
+            if key != self.parameter_name
+        )
+        yield all_choice
+
+
+def username_filter(field, title):
+    """Фильтр по точному username пользователя в поле `field`."""
+    lookup = f'{field}__username'
+
+    class UsernameFilter(InputFilter):
+        parameter_name = lookup
+
+        def queryset(self, request, queryset):
+            if self.value():
+                return queryset.filter(**{lookup: self.value()})
+            return queryset
+
+    UsernameFilter.title = title
+    return UsernameFilter
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    """Общие настройки для списков с большим количеством строк."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if formfield is not None and db_field.name in self.list_editable:
+            # варианты выбираются один раз на всю страницу списка,
+            # а не заново в каждой строке
+            formfield.choices = list(formfield.choices)
+        return formfield
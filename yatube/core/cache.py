@@ -0,0 +1,105 @@
+import math
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+
+# Запись в кэше хранится как (value, expires_at, delta): момент логического
+# устаревания и время, которое заняло последнее вычисление значения.
+LOCK_SUFFIX = ':lock'
+
+
+def _settings():
+    return getattr(settings, 'STAMPEDE_CACHE', {})
+
+
+def _is_fresh(expires_at, delta, beta, now):
+    """Вероятностное досрочное обновление (XFetch).
+
+    Чем дольше считается значение и чем ближе срок его жизни, тем выше
+    шанс, что очередной запрос пересчитает его заранее.
+    """
+    return now - delta * beta * math.log(1.0 - random.random()) < expires_at
+
+
+def _compute_and_store(cache, key, compute, timeout, stale_timeout):
+    started = time.monotonic()
+    value = compute()
+    delta = time.monotonic() - started
+    if timeout is None:
+        cache.set(key, (value, math.inf, delta), None)
+    else:
+        cache.set(
+            key,
+            (value, time.time() + timeout, delta),
+            timeout + stale_timeout
+        )
+    return value
+
+
+def _wait_for_entry(cache, key, options):
+    deadline = time.monotonic() + options.get('WAIT_TIMEOUT', 2)
+    while time.monotonic() < deadline:
+        time.sleep(options.get('WAIT_INTERVAL', 0.05))
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def _acquire(cache, lock_key, lock_timeout):
+    """Токен захваченной блокировки или None, если она уже занята."""
+    token = uuid.uuid4().hex
+    return token if cache.add(lock_key, token, lock_timeout) else None
+
+
+def _release(cache, lock_key, token):
+    # пересчет мог идти дольше lock_timeout: тогда блокировка уже
+    # истекла и, возможно, принадлежит другому процессу
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=None, beta=None,
+                   lock_timeout=None, cache=None):
+    """Достает значение из кэша, защищая его от одновременного пересчета.
+
+    Пересчитывает значение только тот запрос, который первым захватил
+    блокировку; остальные получают устаревшую копию (stale-while-revalidate),
+    которая хранится еще `stale_timeout` секунд после истечения `timeout`.
+    """
+    options = _settings()
+    cache = cache or default_cache
+    if stale_timeout is None:
+        stale_timeout = options.get('STALE_TIMEOUT', timeout or 0)
+    if beta is None:
+        beta = options.get('BETA', 1.0)
+    if lock_timeout is None:
+        lock_timeout = options.get('LOCK_TIMEOUT', 10)
+    lock_key = key + LOCK_SUFFIX
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires_at, delta = entry
+        if _is_fresh(expires_at, delta, beta, time.time()):
+            return value
+        token = _acquire(cache, lock_key, lock_timeout)
+        if token is None:
+            return value
+    else:
+        token = _acquire(cache, lock_key, lock_timeout)
+        if token is None:
+            # Холодный кэш: ждем, пока значение посчитает владелец блокировки.
+            entry = _wait_for_entry(cache, key, options)
+            if entry is not None:
+                return entry[0]
+            return _compute_and_store(
+                cache, key, compute, timeout, stale_timeout
+            )
+
+    try:
+        return _compute_and_store(cache, key, compute, timeout, stale_timeout)
+    finally:
+        _release(cache, lock_key, token)
@@ -0,0 +1,70 @@
+import hashlib
+from functools import wraps
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import parse_http_date_safe, urlencode
+
+from .cache import get_or_compute
+
+CACHE_KEY = 'conditional:{digest}'
+
+
+def _cache_key(request, params):
+    # в ответе бывают абсолютные адреса, поэтому схема и хост входят
+    # в ключ; прочие параметры запроса копий в кэше не плодят
+    query = sorted(
+        (name, value) for name, value in request.GET.items()
+        if name in params
+    )
+    url = f'{request.scheme}://{request.get_host()}{request.path}'
+    if query:
+        url = f'{url}?{urlencode(query)}'
+    return CACHE_KEY.format(digest=hashlib.md5(url.encode()).hexdigest())
+
+
+def cached_conditional(timeout, params=()):
+    """Кэширует ответ вьюхи и поддерживает условный GET.
+
+    Тело хранится в кэше вместе с ETag (хэш тела) и Last-Modified из
+    ответа вьюхи; на If-None-Match / If-Modified-Since без изменений
+    отдается 304. timeout - число или функция (request, *args, **kwargs),
+    params - параметры запроса, от которых зависит ответ.
+    Http404 из вьюхи не кэшируется.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            def render():
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+                return {
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'etag': quote_etag(
+                        hashlib.md5(response.content).hexdigest()
+                    ),
+                    'last_modified': response.get('Last-Modified'),
+                }
+
+            entry = get_or_compute(
+                _cache_key(request, params),
+                render,
+                timeout(request, *args, **kwargs) if callable(timeout)
+                else timeout
+            )
+            last_modified = entry['last_modified'] and parse_http_date_safe(
+                entry['last_modified']
+            )
+            response = get_conditional_response(
+                request, etag=entry['etag'], last_modified=last_modified
+            ) or HttpResponse(
+                entry['content'], content_type=entry['content_type']
+            )
+            response['ETag'] = entry['etag']
+            if entry['last_modified']:
+                response['Last-Modified'] = entry['last_modified']
+            return response
+        return wrapper
+    return decorator
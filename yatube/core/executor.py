@@ -0,0 +1,94 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def _log_failure(future):
+    # результат submit часто никто не ждет - ошибка не должна пропасть
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error('Фоновый вызов упал', exc_info=error)
+
+
+class BoundedPool:
+    """Пул потоков с ограниченной очередью.
+
+    Потоки создаются при первом вызове, в очереди ждут не больше
+    `queue_size` вызовов.
+    """
+
+    def __init__(self, name, workers, queue_size):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix=self.name
+                )
+        return self._executor
+
+    def _run(self, func, args, kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._slots.release()
+            connections.close_all()
+
+    def _submit(self, func, args, kwargs):
+        try:
+            return self._get_executor().submit(self._run, func, args, kwargs)
+        except RuntimeError:
+            self._slots.release()
+            raise
+
+    def submit(self, func, *args, **kwargs):
+        """Ставит вызов в пул. Если пул и очередь заполнены, вызов
+        выполняется в текущем потоке: нагрузка не копится в памяти,
+        а замедляет источник."""
+        if not self._slots.acquire(blocking=False):
+            future = Future()
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception as error:
+                future.set_exception(error)
+        else:
+            future = self._submit(func, args, kwargs)
+        future.add_done_callback(_log_failure)
+        return future
+
+    def run(self, func, *args, **kwargs):
+        """Выполняет вызов в пуле и ждет результата: одновременно
+        выполняется не больше `workers` таких вызовов."""
+        self._slots.acquire()
+        return self._submit(func, args, kwargs).result()
+
+
+_blocking_pool = None
+_blocking_pool_lock = threading.Lock()
+
+
+def submit_blocking(func, *args, **kwargs):
+    """Выполняет блокирующий вызов в общем пуле BLOCKING_POOL."""
+    global _blocking_pool
+    with _blocking_pool_lock:
+        if _blocking_pool is None:
+            _blocking_pool = BoundedPool(
+                'yatube-blocking',
+                settings.BLOCKING_POOL['WORKERS'],
+                settings.BLOCKING_POOL['QUEUE_SIZE']
+            )
+    return _blocking_pool.submit(func, *args, **kwargs)
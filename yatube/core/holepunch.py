@@ -0,0 +1,139 @@
+import base64
+import hashlib
+import json
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.template import loader
+from django.utils.http import urlencode
+
+# Общая для всех пользователей страница кэшируется с "дырками" на месте
+# персональных фрагментов; дырки заполняются вторым проходом по запросу.
+HOLE_RE = re.compile(r'<!--hole:([\w-]+):([\w=-]*)-->')
+CACHE_KEY = 'holepunch:{version}:{digest}'
+VERSION_KEY = 'holepunch:version'
+SHARED_ATTR = '_holepunch_shared'
+
+_holes = {}
+
+
+def _no_context(request, **params):
+    return {}
+
+
+def register_hole(name, template_name, get_context=None):
+    """Регистрирует персональный фрагмент страницы.
+
+    get_context(request, **params) возвращает то, что при обычном
+    рендере шаблону давала вьюха; params - простые значения из тега.
+    """
+    _holes[name] = (template_name, get_context or _no_context)
+
+
+def get_hole(name):
+    return _holes[name]
+
+
+def is_shared_render(context):
+    return getattr(context.get('request'), SHARED_ATTR, False)
+
+
+def placeholder(name, params):
+    data = json.dumps(params, sort_keys=True).encode()
+    return f'<!--hole:{name}:{base64.urlsafe_b64encode(data).decode()}-->'
+
+
+def fill_holes(page, request):
+    def render_hole(match):
+        template_name, get_context = get_hole(match.group(1))
+        params = json.loads(base64.urlsafe_b64decode(match.group(2)))
+        context = dict(params, **get_context(request, **params))
+        return loader.render_to_string(template_name, context, request)
+    return HOLE_RE.sub(render_hole, page)
+
+
+def _settings():
+    return getattr(settings, 'HOLEPUNCH', {})
+
+
+def get_cache():
+    """Кэш HOLEPUNCH['CACHE']: страницы и их версия должны быть общими
+    для всех процессов, иначе invalidate() сбросит только свой."""
+    return caches[_settings().get('CACHE', 'default')]
+
+
+def _bump_version():
+    cache = get_cache()
+    cache.add(VERSION_KEY, 0, None)
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:  # версию успели вытеснить из кэша
+        cache.set(VERSION_KEY, 1, None)
+
+
+def invalidate():
+    """Сбрасывает все общие страницы после коммита текущей транзакции."""
+    transaction.on_commit(_bump_version)
+
+
+def _cache_key(request, options):
+    # параметры, которых вьюхи не читают, не плодят копий страницы
+    params = sorted(
+        (name, value) for name, value in request.GET.items()
+        if name in options.get('QUERY_PARAMS', ())
+    )
+    path = request.path
+    if params:
+        path = f'{path}?{urlencode(params)}'
+    return CACHE_KEY.format(
+        version=get_cache().get(VERSION_KEY, 0),
+        digest=hashlib.md5(path.encode()).hexdigest()
+    )
+
+
+def holepunched(view):
+    """Отдает страницу из общего кэша, дорисовывая персональные части.
+
+    Вьюха рендерится в "общем" режиме: тег {% hole %} выводит вместо
+    фрагмента заглушку. Кэшируются только ответы 200 на GET/HEAD,
+    вместе с заголовками; сбрасывает кэш invalidate().
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        options = _settings()
+        if (not options.get('ENABLED')
+                or request.method not in ('GET', 'HEAD')):
+            return view(request, *args, **kwargs)
+        key = _cache_key(request, options)
+        cache = get_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            page, headers = cached
+            response = HttpResponse(fill_holes(page, request))
+            for header, value in headers:
+                response[header] = value
+            return response
+        setattr(request, SHARED_ATTR, True)
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            setattr(request, SHARED_ATTR, False)
+        # потоковый ответ рендерится позже, уже в обычном режиме
+        if response.streaming or response.status_code != 200:
+            return response
+        page = response.content.decode(response.charset)
+        headers = [
+            (header, value) for header, value in response.items()
+            if header.lower() != 'content-length'
+        ]
+        cache.set(key, (page, headers), options.get('TIMEOUT', 20))
+        response.content = fill_holes(page, request)
+        return response
+    return wrapper
+
+
+register_hole('user_nav', 'includes/user_nav.html')
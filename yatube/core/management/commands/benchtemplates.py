@@ -0,0 +1,89 @@
+import copy
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+
+from core.warmup import warm_templates
+from posts.models import Post
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def templates_profile(cached):
+    # без явного списка loaders Django сам включает cached.Loader при
+    # debug = False, поэтому оба варианта задаются явно
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['APP_DIRS'] = False
+    templates[0]['OPTIONS']['debug'] = False
+    templates[0]['OPTIONS']['loaders'] = (
+        [('django.template.loaders.cached.Loader', LOADERS)]
+        if cached else LOADERS
+    )
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендера страниц без кэша шаблонов '
+        'и с cached.Loader после прогрева'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Сколько раз рендерить каждую страницу'
+        )
+
+    def get_urls(self):
+        post = Post.objects.select_related('author', 'group').filter(
+            group__isnull=False
+        ).first()
+        if post is None:
+            return [reverse('posts:index')]
+        return [
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[post.group.slug]),
+            reverse('posts:profile', args=[post.author.username]),
+            reverse('posts:post_detail', args=[post.pk]),
+        ]
+
+    def measure(self, url, repeat):
+        factory = RequestFactory()
+        match = resolve(url)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            cache.clear()
+            request = factory.get(url)
+            request.user = AnonymousUser()
+            request.resolver_match = match
+            match.func(request, *match.args, **match.kwargs)
+        return (time.perf_counter() - started) / repeat * 1000
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        results = {}
+        for profile in ('uncached', 'cached'):
+            templates = templates_profile(profile == 'cached')
+            with override_settings(TEMPLATES=templates, DEBUG=False):
+                if profile == 'cached':
+                    warm_templates()
+                for url in self.get_urls():
+                    results.setdefault(url, {})[profile] = self.measure(
+                        url, repeat
+                    )
+        for url, timings in results.items():
+            self.stdout.write(
+                f"{url}: {timings['uncached']:.2f} мс -> "
+                f"{timings['cached']:.2f} мс "
+                f"(x{timings['uncached'] / timings['cached']:.1f})"
+            )
@@ -0,0 +1,43 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from core.static import collect_used_words, purge_css
+
+
+class Command(BaseCommand):
+    help = (
+        'Собирает статику для production: удаляет неиспользуемые правила '
+        'из STATIC_PURGE_CSS, затем collectstatic с хэшами и сжатием'
+    )
+
+    def purge(self):
+        used = collect_used_words(settings.TEMPLATES[0]['DIRS'])
+        used.update(settings.STATIC_PURGE_SAFELIST)
+        for name in settings.STATIC_PURGE_CSS:
+            # исходник ищется в обычных каталогах, минуя STATIC_BUILD_DIR
+            source = next((
+                path for path in finders.find(name, all=True)
+                if not path.startswith(settings.STATIC_BUILD_DIR)
+            ), None)
+            if source is None:
+                self.stderr.write(f'{name}: файл не найден')
+                continue
+            with open(source) as css_file:
+                css = css_file.read()
+            purged = purge_css(css, used)
+            target = os.path.join(settings.STATIC_BUILD_DIR, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'w') as css_file:
+                css_file.write(purged)
+            self.stdout.write(
+                f'{name}: {len(css)} -> {len(purged)} байт'
+            )
+
+    def handle(self, *args, **options):
+        self.purge()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        self.stdout.write(f'Статика собрана в {settings.STATIC_ROOT}')
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.ratelimit import get_metrics
+
+
+class Command(BaseCommand):
+    help = 'Счетчики пропущенных и отклоненных запросов по RATELIMITS'
+
+    def handle(self, *args, **options):
+        for view_name, counters in get_metrics().items():
+            self.stdout.write(
+                f"{view_name} ({settings.RATELIMITS[view_name]['rate']}): "
+                f"пропущено {counters['allowed']}, "
+                f"отклонено {counters['limited']}"
+            )
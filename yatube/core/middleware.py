@@ -0,0 +1,89 @@
+import math
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .ratelimit import check_request
+from .static import is_hashed
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticFilesMiddleware:
+    """Отдает файлы из STATIC_ROOT: заранее сжатые варианты по
+    Accept-Encoding и вечный Cache-Control для имен с хэшем."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+
+    def __call__(self, request):
+        if (
+            request.method in ('GET', 'HEAD')
+            and request.path.startswith(self.prefix)
+        ):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        if not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'),
+            stat.st_mtime,
+            stat.st_size
+        ):
+            return HttpResponseNotModified()
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        served_path, encoding = path, None
+        for candidate, suffix in ENCODINGS:
+            if candidate in accept_encoding and os.path.isfile(path + suffix):
+                served_path, encoding = path + suffix, candidate
+                break
+        content_type, _ = mimetypes.guess_type(path)
+        response = FileResponse(
+            open(served_path, 'rb'),
+            content_type=content_type or 'application/octet-stream'
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Vary'] = 'Accept-Encoding'
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = (
+            IMMUTABLE if is_hashed(name) else 'public, max-age=300'
+        )
+        return response
+
+
+class RateLimitMiddleware:
+    """Отклоняет с 429 запросы сверх лимитов RATELIMITS до вызова view,
+    то есть до любых запросов к БД."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        retry_after = check_request(request, request.resolver_match.view_name)
+        if retry_after is None:
+            return None
+        response = render(request, 'core/429.html', status=429)
+        response['Retry-After'] = str(math.ceil(retry_after))
+        return response
@@ -0,0 +1,48 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, который не считает COUNT(*) по большим таблицам на каждый
+    запрос.
+
+    Для PostgreSQL без фильтров берется оценка из pg_class.reltuples,
+    в остальных случаях точное значение кэшируется на
+    ESTIMATED_COUNT_TIMEOUT секунд.
+    """
+
+    def _estimate(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql' or queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < settings.ESTIMATED_COUNT_THRESHOLD:
+            return None
+        return int(row[0])
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        estimate = self._estimate(queryset)
+        if estimate is not None:
+            return estimate
+        key = 'count:' + hashlib.md5(
+            str(queryset.query).encode()
+        ).hexdigest()
+        value = cache.get(key)
+        if value is None:
+            value = super().count
+            cache.set(key, value, settings.ESTIMATED_COUNT_TIMEOUT)
+        return value
@@ -0,0 +1,109 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+BUCKET_KEY = 'ratelimit:bucket:{view_name}:{client}'
+METRIC_KEY = 'ratelimit:metrics:{view_name}:{result}'
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+def get_cache():
+    """Кэш RATELIMIT_CACHE, общий для всех процессов сайта."""
+    return caches[settings.RATELIMIT_CACHE]
+
+
+def parse_rate(rate):
+    """'10/m' -> (10 запросов, 60 секунд)."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def client_key(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+def _incr(cache, key, timeout):
+    # add и incr атомарны в memcached и LocMemCache, поэтому параллельные
+    # запросы не затирают счетчики друг друга
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:  # счетчик успели вытеснить из кэша
+        cache.add(key, 1, timeout)
+        return 1
+
+
+def take_token(key, rate, burst=None):
+    """Скользящее окно: за время, пока ведро на `burst` токенов
+    пополнялось бы со скоростью `rate`, разрешено не больше `burst`
+    запросов. Возвращает (разрешено, через сколько секунд повторить).
+    """
+    count, period = parse_rate(rate)
+    capacity = burst or count
+    window = capacity * period / count
+    now = time.time() / window
+    current = int(now)
+    elapsed = now - current
+    cache = get_cache()
+    previous = cache.get(f'{key}:{current - 1}', 0)
+    current_key = f'{key}:{current}'
+    hits = _incr(cache, current_key, int(2 * window) + 1)
+    # запросы прошлого окна учитываются пропорционально его остатку
+    if previous * (1 - elapsed) + hits <= capacity:
+        return True, 0
+    # отклоненный запрос токен не расходует
+    try:
+        cache.decr(current_key)
+    except ValueError:  # счетчик успели вытеснить из кэша
+        pass
+    hits -= 1
+    if previous and hits < capacity:
+        free_at = 1 - (capacity - hits) / previous
+    else:
+        free_at = 1
+    return False, max(free_at - elapsed, 0) * window
+
+
+def record(view_name, result):
+    _incr(
+        get_cache(),
+        METRIC_KEY.format(view_name=view_name, result=result),
+        None
+    )
+
+
+def get_metrics():
+    cache = get_cache()
+    metrics = {}
+    for view_name in settings.RATELIMITS:
+        metrics[view_name] = {
+            result: cache.get(
+                METRIC_KEY.format(view_name=view_name, result=result), 0
+            )
+            for result in ('allowed', 'limited')
+        }
+    return metrics
+
+
+def check_request(request, view_name):
+    """Проверяет лимит RATELIMITS[view_name] для запроса.
+
+    Возвращает None, если запрос разрешен, иначе время до следующей
+    попытки в секундах.
+    """
+    config = settings.RATELIMITS.get(view_name)
+    if config is None:
+        return None
+    methods = config.get('methods')
+    if methods and request.method not in methods:
+        return None
+    allowed, retry_after = take_token(
+        BUCKET_KEY.format(view_name=view_name, client=client_key(request)),
+        config['rate'],
+        config.get('burst')
+    )
+    record(view_name, 'allowed' if allowed else 'limited')
+    return None if allowed else retry_after
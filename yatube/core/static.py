@@ -0,0 +1,133 @@
+import gzip
+import os
+import re
+
+try:
+    import brotli
+except ImportError:  # brotli не обязателен, тогда готовится только gzip
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.ico', '.txt', '.json')
+# 12 символов md5 из ManifestStaticFilesStorage: bootstrap.min.3f1c2a9b7d4e.css
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+WORD_RE = re.compile(r'[\w-]+')
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+
+
+def is_hashed(name):
+    return HASHED_NAME_RE.search(name) is not None
+
+
+def compress_file(path):
+    """Сохраняет рядом с файлом path.gz и (если есть brotli) path.br."""
+    if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return []
+    with open(path, 'rb') as source:
+        content = source.read()
+    variants = [('.gz', gzip.compress(content, compresslevel=9))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(content)))
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) < len(content):
+            with open(path + suffix, 'wb') as target:
+                target.write(compressed)
+            written.append(path + suffix)
+    return written
+
+
+def collect_used_words(directories):
+    """Все слова из шаблонов: имена классов могут приходить и из
+    атрибутов class, и из аргументов фильтров вроде addclass."""
+    words = set()
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith('.html'):
+                    with open(os.path.join(root, filename)) as template:
+                        words.update(WORD_RE.findall(template.read()))
+    return words
+
+
+def _split_blocks(css):
+    """Разбивает CSS на блоки верхнего уровня: (prelude, body) или
+    (statement, None) для конструкций вида `@charset "UTF-8";`."""
+    blocks = []
+    depth = 0
+    start = 0
+    body_start = None
+    for position, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                body_start = position
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((
+                    css[start:body_start].strip(),
+                    css[body_start + 1:position]
+                ))
+                start = position + 1
+        elif char == ';' and depth == 0:
+            blocks.append((css[start:position + 1].strip(), None))
+            start = position + 1
+    return blocks
+
+
+def _split_selectors(prelude):
+    selectors = []
+    depth = 0
+    current = ''
+    for char in prelude:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            selectors.append(current)
+            current = ''
+        else:
+            current += char
+    selectors.append(current)
+    return [selector.strip() for selector in selectors]
+
+
+def _selector_used(selector, used):
+    # внутри :not(...) и [...] неиспользуемый класс не мешает совпадению
+    selector = re.sub(r':not\([^)]*\)|\[[^\]]*\]', '', selector)
+    return all(name in used for name in CLASS_RE.findall(selector))
+
+
+def purge_css(css, used):
+    """Удаляет правила, селекторы которых ссылаются на классы не из used.
+
+    Комментарии удаляются, кроме лицензионных вида /*! ... */.
+    """
+    result = [
+        comment for comment in COMMENT_RE.findall(css)
+        if comment.startswith('/*!')
+    ]
+    return ''.join(result) + _purge_rules(COMMENT_RE.sub('', css), used)
+
+
+def _purge_rules(css, used):
+    result = []
+    for prelude, body in _split_blocks(css):
+        if body is None:
+            result.append(prelude)
+        elif prelude.startswith(('@media', '@supports')):
+            inner = _purge_rules(body, used)
+            if inner:
+                result.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            result.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [
+                selector for selector in _split_selectors(prelude)
+                if _selector_used(selector, used)
+            ]
+            if selectors:
+                result.append(f"{','.join(selectors)}{{{body}}}")
+    return ''.join(result)
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+from .static import compress_file
+
+# <каталог>/<первые два символа хэша>/<sha256>/<исходное имя>
+DIGEST_RE = re.compile(r'(?:^|/)[0-9a-f]{2}/([0-9a-f]{64})/[^/]+$')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэширует имена файлов и кладет рядом сжатые gzip/brotli копии,
+    которые отдает core.middleware.StaticFilesMiddleware."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed_files = super().post_process(paths, dry_run, **options)
+        for name, hashed_name, processed in processed_files:
+            if (
+                hashed_name and not dry_run
+                and not isinstance(processed, Exception)
+            ):
+                compress_file(self.path(hashed_name))
+            yield name, hashed_name, processed
+
+
+def content_digest(name):
+    """sha256 содержимого из имени файла; None для обычных имен."""
+    match = DIGEST_RE.search(name or '')
+    return match.group(1) if match else None
+
+
+def file_digest(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит файлы по хэшу содержимого.
+
+    Исходное имя сохраняется последним элементом пути. Повторная
+    загрузка того же файла ничего не пишет: то же имя возвращается как
+    есть, другое становится жесткой ссылкой на уже сохраненный файл.
+    """
+
+    def hashed_name(self, name, digest, max_length=None):
+        directory, filename = posixpath.split(name)
+        name = posixpath.join(
+            directory, digest[:2], digest, self.get_valid_name(filename)
+        )
+        if max_length and len(name) > max_length:
+            root, ext = posixpath.splitext(name)
+            name = root[:max_length - len(ext)] + ext
+        return name
+
+    def _existing(self, directory):
+        try:
+            files = self.listdir(directory)[1]
+        except FileNotFoundError:
+            return None
+        return posixpath.join(directory, files[0]) if files else None
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.hashed_name(name, file_digest(content), max_length)
+        if self.exists(name):
+            return name
+        existing = self._existing(posixpath.dirname(name))
+        if existing is not None:
+            try:
+                os.link(self.path(existing), self.path(name))
+                return name
+            except FileExistsError:
+                return name
+            except OSError:
+                # файловая система без жестких ссылок: пишем копию
+                pass
+        return self._save(name, content)
+
+    def delete(self, name):
+        """Удаляет одно имя; каталог хэша удаляется вместе с последним."""
+        super().delete(name)
+        try:
+            os.rmdir(self.path(posixpath.dirname(name)))
+        except OSError:
+            pass
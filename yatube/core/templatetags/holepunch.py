@@ -0,0 +1,21 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from core.holepunch import get_hole, is_shared_render, placeholder
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name, **params):
+    """Персональный фрагмент: {% hole 'follow_button' username=usr.username %}.
+
+    В общем режиме (core.holepunch.holepunched) выводит заглушку, иначе
+    рендерит шаблон фрагмента в текущем контексте.
+    """
+    if is_shared_render(context):
+        return mark_safe(placeholder(name, params))
+    template_name, _ = get_hole(name)
+    fragment = context.template.engine.get_template(template_name)
+    with context.push(**params):
+        return fragment.render(context)
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.template import Context, Template
+from django.test import TestCase
+
+from core.cache import LOCK_SUFFIX, get_or_compute
+
+
+class StampedeCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return f'value {self.calls}'
+
+    def test_value_is_computed_once_while_fresh(self):
+        for _ in range(3):
+            value = get_or_compute('key', self.compute, 60)
+        self.assertEqual(value, 'value 1')
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_value_is_recomputed(self):
+        cache.set('key', ('stale', 0, 0))  # срок жизни истек
+        value = get_or_compute('key', self.compute, 60)
+        self.assertEqual(value, 'value 1')
+        self.assertEqual(cache.get('key')[0], 'value 1')
+
+    def test_stale_value_served_while_locked(self):
+        cache.set('key', ('stale', 0, 0))
+        cache.add('key' + LOCK_SUFFIX, 1)  # кто-то уже пересчитывает
+        value = get_or_compute('key', self.compute, 60)
+        self.assertEqual(value, 'stale')
+        self.assertEqual(self.calls, 0)
+
+    def test_foreign_lock_survives_slow_compute(self):
+        def slow_compute():
+            # блокировка истекла, и ее взял другой процесс
+            cache.set('key' + LOCK_SUFFIX, 'other')
+            return 'value'
+
+        get_or_compute('key', slow_compute, 60)
+        self.assertEqual(cache.get('key' + LOCK_SUFFIX), 'other')
+        get_or_compute('other', self.compute, 60)
+        self.assertIsNone(cache.get('other' + LOCK_SUFFIX))
+
+    def test_template_tag_is_drop_in(self):
+        template = Template(
+            '{% load swr_cache %}{% cache 20 frag number %}{{ text }}'
+            '{% endcache %}'
+        )
+        first = template.render(Context({'number': 1, 'text': 'one'}))
+        second = template.render(Context({'number': 1, 'text': 'two'}))
+        self.assertEqual(first, 'one')
+        self.assertEqual(second, 'one')
+        self.assertIsNotNone(
+            cache.get(make_template_fragment_key('frag', [1]))
+        )
@@ -0,0 +1,49 @@
+import threading
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from core.executor import submit_blocking
+
+
+class BlockingPoolTests(SimpleTestCase):
+    def test_call_runs_in_pool(self):
+        future = submit_blocking(lambda: threading.current_thread().name)
+        self.assertTrue(future.result(timeout=5).startswith('yatube-blocking'))
+
+    def test_full_pool_runs_inline(self):
+        release = threading.Event()
+        capacity = sum(settings.BLOCKING_POOL.values())
+        futures = [submit_blocking(release.wait, 5) for _ in range(capacity)]
+        future = submit_blocking(lambda: threading.current_thread().name)
+        self.assertEqual(future.result(), threading.current_thread().name)
+        release.set()
+        for blocked in futures:
+            blocked.result(timeout=5)
+
+    def test_errors_are_logged(self):
+        def fail():
+            raise ValueError('сбой')
+
+        logged = threading.Event()
+        with self.assertLogs('core.executor', 'ERROR'):
+            future = submit_blocking(fail)
+            # колбэки вызываются по порядку: этот - после логирования
+            future.add_done_callback(lambda future: logged.set())
+            self.assertTrue(logged.wait(5))
+        with self.assertRaises(ValueError):
+            future.result()
+
+    def test_inline_error_goes_to_future(self):
+        release = threading.Event()
+        capacity = sum(settings.BLOCKING_POOL.values())
+        futures = [submit_blocking(release.wait, 5) for _ in range(capacity)]
+        try:
+            with self.assertLogs('core.executor', 'ERROR'):
+                future = submit_blocking(int, 'не число')
+            with self.assertRaises(ValueError):
+                future.result()
+        finally:
+            release.set()
+            for blocked in futures:
+                blocked.result(timeout=5)
@@ -0,0 +1,115 @@
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory, TransactionTestCase, override_settings
+)
+from django.urls import reverse
+
+from core.holepunch import HOLE_RE, VERSION_KEY, holepunched, invalidate
+from posts.models import Follow, Post, User
+
+
+@override_settings(HOLEPUNCH={
+    'ENABLED': True, 'TIMEOUT': 60, 'QUERY_PARAMS': ('page',)
+})
+class HolePunchTests(TransactionTestCase):
+    # кэши сбрасываются в on_commit, поэтому нужны настоящие коммиты
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='Author')
+        self.reader = User.objects.create_user(username='Reader')
+        self.post = Post.objects.create(text='Пост', author=self.author)
+
+    def test_shared_page_gets_personal_fragments(self):
+        url = reverse('posts:profile', args=[self.author.username])
+        anonymous = self.client.get(url).content.decode()
+        self.assertIn('Войти', anonymous)
+        self.assertNotIn('Пользователь:', anonymous)
+        self.assertIsNone(HOLE_RE.search(anonymous))
+
+        self.client.force_login(self.reader)
+        reader = self.client.get(url).content.decode()
+        self.assertIn('Пользователь: Reader', reader)
+        self.assertIn('Подписаться', reader)
+        Follow.objects.create(user=self.reader, author=self.author)
+        self.assertIn('Отписаться', self.client.get(url).content.decode())
+
+    def test_cached_body_is_not_rendered_again(self):
+        url = reverse('posts:post_detail', args=[self.post.pk])
+        self.client.get(url)
+        # правка в обход моделей не сбрасывает общую страницу
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
+        self.client.force_login(self.author)
+        page = self.client.get(url, {'utm_source': 'mail'}).content.decode()
+        self.assertNotIn('Новый текст', page)
+        self.assertIn('редактировать запись', page)
+        self.assertIn('csrfmiddlewaretoken', page)
+        self.client.force_login(self.reader)
+        page = self.client.get(url).content.decode()
+        self.assertNotIn('редактировать запись', page)
+
+    def test_writes_invalidate_shared_pages(self):
+        url = reverse('posts:post_detail', args=[self.post.pk])
+        profile = reverse('posts:profile', args=[self.author.username])
+        self.client.get(url)
+        self.client.get(profile)
+        self.client.force_login(self.author)
+        self.client.post(
+            reverse('posts:post_edit', args=[self.post.pk]),
+            {'text': 'Исправленный пост'}
+        )
+        self.assertContains(self.client.get(url), 'Исправленный пост')
+        self.client.post(
+            reverse('posts:add_comment', args=[self.post.pk]),
+            {'text': 'Свежий комментарий'}
+        )
+        self.assertContains(self.client.get(url), 'Свежий комментарий')
+        self.client.post(
+            reverse('posts:post_create'), {'text': 'Второй пост'}
+        )
+        self.assertContains(self.client.get(profile), 'Второй пост')
+
+    def test_cached_response_keeps_view_headers(self):
+        def view(request):
+            response = HttpResponse('Страница', content_type='text/plain')
+            response['X-Page'] = 'shared'
+            return response
+
+        cached_view = holepunched(view)
+        for _ in range(2):
+            response = cached_view(RequestFactory().get('/page/'))
+            self.assertEqual(response['Content-Type'], 'text/plain')
+            self.assertEqual(response['X-Page'], 'shared')
+
+    @override_settings(
+        CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            },
+            'pages': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'pages',
+            },
+        },
+        HOLEPUNCH={'ENABLED': True, 'TIMEOUT': 60, 'CACHE': 'pages'}
+    )
+    def test_pages_and_version_live_in_configured_cache(self):
+        cache.clear()
+        pages = caches['pages']
+        pages.clear()
+        calls = []
+
+        def view(request):
+            calls.append(request)
+            return HttpResponse('Страница')
+
+        cached_view = holepunched(view)
+        cached_view(RequestFactory().get('/page/'))
+        cached_view(RequestFactory().get('/page/'))
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(cache.get(VERSION_KEY))
+        invalidate()
+        self.assertEqual(pages.get(VERSION_KEY), 1)
+        self.assertIsNone(cache.get(VERSION_KEY))
+        cached_view(RequestFactory().get('/page/'))
+        self.assertEqual(len(calls), 2)
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.ratelimit import get_cache, get_metrics, take_token
+from posts.models import Follow
+
+User = get_user_model()
+
+
+@override_settings(RATELIMITS={
+    'posts:profile_follow': {'rate': '2/m'},
+    'posts:post_create': {'rate': '1/m', 'methods': ['POST']},
+})
+class RateLimitTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Bot')
+        cls.author = User.objects.create_user(username='Author')
+
+    def setUp(self):
+        cache.clear()
+        get_cache().clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_token_bucket(self):
+        self.assertTrue(take_token('bucket', '2/m')[0])
+        self.assertTrue(take_token('bucket', '2/m')[0])
+        allowed, retry_after = take_token('bucket', '2/m')
+        self.assertFalse(allowed)
+        self.assertGreater(retry_after, 0)
+
+    def test_evicted_counter_does_not_break_rejection(self):
+        take_token('bucket', '1/m')
+        with mock.patch.object(
+            get_cache(), 'decr', side_effect=ValueError('evicted')
+        ):
+            allowed, retry_after = take_token('bucket', '1/m')
+        self.assertFalse(allowed)
+        self.assertGreater(retry_after, 0)
+
+    def test_concurrent_requests_share_one_bucket(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(
+                lambda _: take_token('bucket', '5/m')[0], range(40)
+            ))
+        self.assertEqual(results.count(True), 5)
+
+    def test_limited_request_is_rejected_before_view(self):
+        address = reverse('posts:profile_follow', kwargs={
+            'username': self.author.username
+        })
+        for _ in range(2):
+            self.authorized_client.get(address)
+        Follow.objects.all().delete()
+        response = self.authorized_client.get(address)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(
+            get_metrics()['posts:profile_follow'],
+            {'allowed': 2, 'limited': 1}
+        )
+        output = StringIO()
+        call_command('ratelimitstats', stdout=output)
+        self.assertIn('пропущено 2, отклонено 1', output.getvalue())
+
+    def test_only_configured_methods_are_limited(self):
+        address = reverse('posts:post_create')
+        for _ in range(3):
+            response = self.authorized_client.get(address)
+            self.assertEqual(response.status_code, 200)
+        self.authorized_client.post(address, {'text': 'Пост'})
+        response = self.authorized_client.post(address, {'text': 'Пост'})
+        self.assertEqual(response.status_code, 429)
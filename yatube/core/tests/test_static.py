@@ -0,0 +1,71 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from core.static import compress_file, is_hashed, purge_css
+
+TEMP_STATIC_ROOT = tempfile.mkdtemp()
+
+
+class PurgeCssTests(SimpleTestCase):
+    def test_unused_rules_are_removed(self):
+        css = (
+            '@charset "UTF-8";body{margin:0}.nav,.unused{color:red}'
+            '.unused .x{color:blue}a:not(.unused){color:green}'
+            '@media (min-width:576px){.unused{top:0}.nav{top:1px}}'
+            '@media print{.unused{top:0}}'
+            '@keyframes spin{0%{top:0}to{top:1px}}'
+        )
+        self.assertEqual(
+            purge_css(css, {'nav'}),
+            '@charset "UTF-8";body{margin:0}.nav{color:red}'
+            'a:not(.unused){color:green}'
+            '@media (min-width:576px){.nav{top:1px}}'
+            '@keyframes spin{0%{top:0}to{top:1px}}'
+        )
+
+
+@override_settings(
+    STATIC_ROOT=TEMP_STATIC_ROOT,
+    MIDDLEWARE=[
+        'core.middleware.StaticFilesMiddleware',
+        'django.middleware.common.CommonMiddleware',
+    ]
+)
+class StaticFilesMiddlewareTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(TEMP_STATIC_ROOT, 'css'), exist_ok=True)
+        cls.name = 'css/site.0123456789ab.css'
+        with open(os.path.join(TEMP_STATIC_ROOT, cls.name), 'w') as css:
+            css.write('.nav{color:red}' * 100)
+        compress_file(os.path.join(TEMP_STATIC_ROOT, cls.name))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+
+    def test_hashed_name(self):
+        self.assertTrue(is_hashed(self.name))
+        self.assertFalse(is_hashed('css/bootstrap.min.css'))
+
+    def test_precompressed_file_is_served_immutable(self):
+        response = self.client.get(
+            '/static/' + self.name,
+            HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        content = gzip.decompress(b''.join(response.streaming_content))
+        self.assertTrue(content.startswith(b'.nav{color:red}'))
+
+    def test_plain_file_without_accept_encoding(self):
+        response = self.client.get('/static/' + self.name)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
@@ -0,0 +1,39 @@
+from django.test import SimpleTestCase
+from django.urls import reverse, set_script_prefix
+
+from core.urlbuilder import build_url
+from posts.models import Group, Post, User
+
+
+class BuildUrlTests(SimpleTestCase):
+    def test_matches_reverse(self):
+        cases = (
+            ('posts:post_detail', (42,), {}),
+            ('posts:group_list', ('cats',), {}),
+            ('posts:profile', ('Лев Толстой',), {}),
+            ('posts:profile', ('a+b@c.d',), {}),
+            ('posts:profile_follow', (), {'username': 'name%20'}),
+            ('posts:index', (), {}),
+        )
+        for viewname, args, kwargs in cases:
+            with self.subTest(viewname=viewname, args=args, kwargs=kwargs):
+                self.assertEqual(
+                    build_url(viewname, *args, **kwargs),
+                    reverse(viewname, args=args or None, kwargs=kwargs)
+                )
+
+    def test_script_prefix(self):
+        set_script_prefix('/yatube/')
+        try:
+            self.assertEqual(
+                build_url('posts:post_detail', 1), '/yatube/posts/1/'
+            )
+        finally:
+            set_script_prefix('/')
+
+    def test_model_urls(self):
+        self.assertEqual(Post(pk=5).get_absolute_url(), '/posts/5/')
+        self.assertEqual(Group(slug='cats').get_absolute_url(), '/group/cats/')
+        self.assertEqual(
+            User(username='leo').get_absolute_url(), '/profile/leo/'
+        )
@@ -0,0 +1,26 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from core.warmup import iter_template_names, warm_templates
+
+
+class WarmUpTemplatesTests(SimpleTestCase):
+    def test_all_project_templates_are_loaded(self):
+        names = list(iter_template_names())
+        self.assertIn('base.html', names)
+        self.assertIn('posts/includes/post_card.html', names)
+        self.assertEqual(warm_templates(), len(names))
+
+    def test_broken_template_is_logged(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'broken.html'), 'w') as file:
+                file.write('{% if %}')
+            with self.settings(TEMPLATES=[{
+                'BACKEND': 'django.template.backends.django.DjangoTemplates',
+                'DIRS': [directory],
+            }]):
+                with self.assertLogs('core.warmup', 'ERROR') as logs:
+                    self.assertEqual(warm_templates(), 0)
+        self.assertIn('broken.html', logs.output[0])
@@ -0,0 +1,50 @@
+import os
+import posixpath
+
+from sorl.thumbnail import default
+from sorl.thumbnail.base import EXTENSIONS, ThumbnailBackend
+from sorl.thumbnail.conf import settings
+from sorl.thumbnail.helpers import serialize, tokey
+from sorl.thumbnail.images import ImageFile
+
+from .storage import content_digest
+
+
+def thumbnail_directory(digest):
+    return f'{settings.THUMBNAIL_PREFIX}{digest[:2]}/{digest}'
+
+
+class ContentAddressedThumbnailBackend(ThumbnailBackend):
+    """Имя миниатюры строится из хэша содержимого исходника, а не из его
+    имени: посты с одинаковой картинкой получают одну миниатюру."""
+
+    def _get_thumbnail_filename(self, source, geometry_string, options):
+        digest = content_digest(source.name)
+        if digest is None:
+            return super()._get_thumbnail_filename(
+                source, geometry_string, options
+            )
+        key = tokey(digest, geometry_string, serialize(options))
+        return (
+            f'{thumbnail_directory(digest)}/{key}.'
+            f'{EXTENSIONS[options["format"]]}'
+        )
+
+
+def delete_thumbnails(digest):
+    """Удаляет все миниатюры содержимого вместе с записями sorl."""
+    directory = thumbnail_directory(digest)
+    try:
+        files = default.storage.listdir(directory)[1]
+    except FileNotFoundError:
+        return
+    for filename in files:
+        thumbnail = ImageFile(
+            posixpath.join(directory, filename), default.storage
+        )
+        default.kvstore.delete(thumbnail, delete_thumbnails=False)
+        thumbnail.delete()
+    try:
+        os.rmdir(default.storage.path(directory))
+    except (NotImplementedError, OSError):
+        pass
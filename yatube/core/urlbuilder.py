@@ -0,0 +1,50 @@
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.conf import settings
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils.http import RFC3986_SUBDELIMS
+
+# Цифровая заглушка подходит под любой конвертер пути (int, slug, str),
+# поэтому шаблон адреса можно получить одним обычным reverse().
+SENTINEL = '7350291846{}'
+SAFE_CHARS = RFC3986_SUBDELIMS + '/~:@'
+
+
+@lru_cache(maxsize=None)
+def _route(viewname, names, count, prefix, urlconf):
+    """Статические куски адреса между аргументами маршрута."""
+    sentinels = [SENTINEL.format(i) for i in range(count)]
+    if names:
+        url = reverse(viewname, urlconf, kwargs=dict(zip(names, sentinels)))
+    else:
+        url = reverse(viewname, urlconf, args=sentinels)
+    parts = []
+    for sentinel in sentinels:
+        head, url = url.split(sentinel, 1)
+        parts.append(head)
+    parts.append(url)
+    return tuple(parts)
+
+
+def build_url(viewname, *args, **kwargs):
+    """Быстрый reverse(): шаблон адреса вычисляется один раз на маршрут,
+    дальше аргументы только экранируются и подставляются.
+
+    Аргументы не проверяются по регулярным выражениям маршрута - сюда
+    передаются значения из базы, которые им заведомо соответствуют.
+    """
+    names = tuple(sorted(kwargs))
+    values = [kwargs[name] for name in names] if names else args
+    parts = _route(
+        viewname,
+        names,
+        len(values),
+        get_script_prefix(),
+        get_urlconf() or settings.ROOT_URLCONF
+    )
+    chunks = [parts[0]]
+    for value, part in zip(values, parts[1:]):
+        chunks.append(quote(str(value), safe=SAFE_CHARS))
+        chunks.append(part)
+    return ''.join(chunks)
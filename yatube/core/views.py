@@ -1,4 +1,6 @@
+from django.http import HttpResponse
 from django.shortcuts import render
+from django.urls import reverse
 
 
 def page_not_found(request, exception):
@@ -15,3 +17,14 @@ def permission_denied(request, exception):
 
 def csrf_failure(request, reason=''):
     return render(request, 'core/403csrf.html')
+
+
+def robots_txt(request):
+    """Поисковикам - карта сайта и ленты вместо глубокой пагинации."""
+    lines = [
+        'User-agent: *',
+        'Disallow: /*?page=',
+        'Disallow: /*&page=',
+        f"Sitemap: {request.build_absolute_uri(reverse('posts:sitemap'))}",
+    ]
+    return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain')
@@ -0,0 +1,33 @@
+import logging
+import os
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, loader
+
+logger = logging.getLogger(__name__)
+
+
+def iter_template_names():
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith('.html'):
+                    yield os.path.relpath(
+                        os.path.join(root, filename), directory
+                    ).replace(os.sep, '/')
+
+
+def warm_templates():
+    """Загружает все шаблоны проекта, чтобы cached.Loader скомпилировал их
+    до первого запроса. Возвращает количество загруженных шаблонов."""
+    count = 0
+    for name in iter_template_names():
+        try:
+            loader.get_template(name)
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            # сломанный шаблон не должен ронять старт процесса,
+            # но и пропадать молча тоже
+            logger.exception('Шаблон %s не скомпилирован', name)
+            continue
+        count += 1
+    return count
@@ -0,0 +1,116 @@
+import asyncio
+from urllib.parse import urlsplit
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class HttpClient:
+    """Минимальный HTTP/1.1 клиент на asyncio: одно keep-alive
+    соединение, Content-Length и chunked-ответы, cookies сессии."""
+
+    def __init__(self, base_url, cookies=None):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.cookies = dict(cookies or {})
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b'', headers=None):
+        # сервер мог закрыть простаивающее соединение - одна повторная
+        # попытка на новом
+        for attempt in range(2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+            try:
+                self.writer.write(self._build(method, path, body, headers))
+                await self.writer.drain()
+                response, keep_alive = await self._read_response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if attempt:
+                    raise
+                continue
+            if not keep_alive:
+                await self.close()
+            return response
+
+    def _build(self, method, path, body, headers):
+        lines = [
+            f'{method} {path} HTTP/1.1',
+            f'Host: {self.host}:{self.port}',
+            'Connection: keep-alive',
+            f'Content-Length: {len(body)}',
+        ]
+        if self.cookies:
+            lines.append('Cookie: ' + '; '.join(
+                f'{name}={value}' for name, value in self.cookies.items()
+            ))
+        for name, value in (headers or {}).items():
+            lines.append(f'{name}: {value}')
+        head = '\r\n'.join(lines) + '\r\n\r\n'
+        return head.encode('latin-1') + body
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('соединение закрыто сервером')
+        version, status = status_line.decode('latin-1').split()[:2]
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, value = line.decode('latin-1').split(':', 1)
+            name, value = name.strip().lower(), value.strip()
+            if name == 'set-cookie':
+                self._store_cookie(value)
+            headers[name] = value
+        keep_alive = (
+            version == 'HTTP/1.1'
+            and headers.get('connection', '').lower() != 'close'
+        )
+        if 'content-length' in headers:
+            body = await self.reader.readexactly(
+                int(headers['content-length'])
+            )
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self._read_chunked()
+        else:
+            body = await self.reader.read()
+            keep_alive = False
+        return Response(int(status), headers, body), keep_alive
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0], 16)
+            if not size:
+                await self.reader.readline()
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+    def _store_cookie(self, header):
+        name, value = header.split(';', 1)[0].split('=', 1)
+        value = value.strip('"')
+        if value:
+            self.cookies[name.strip()] = value
+        else:
+            self.cookies.pop(name.strip(), None)
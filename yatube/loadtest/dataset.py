@@ -0,0 +1,87 @@
+import math
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+)
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+
+from posts.models import Group, Post, User
+
+from .generator import USERNAME_PREFIX, Plan, generate
+
+# сколько адресов каждого вида держать в памяти
+SAMPLE_SIZE = 10000
+
+
+def generate_small(users, seed=0, workers=1):
+    """Небольшой набор данных для прогона с нуля (loadtest --generate)."""
+    return generate(Plan(
+        users=users,
+        groups=max(users // 20, 1),
+        posts=users * 20,
+        comments=users * 10,
+        follows_per_user=10,
+        seed=seed,
+        images=3
+    ), workers)
+
+
+def login_cookies(user):
+    """Cookies сессии и CSRF, как после входа через форму."""
+    store = import_module(settings.SESSION_ENGINE).SessionStore()
+    store[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    store.save()
+    request = HttpRequest()
+    csrf_token = get_token(request)
+    cookies = {
+        settings.SESSION_COOKIE_NAME: store.session_key,
+        settings.CSRF_COOKIE_NAME: request.META['CSRF_COOKIE'],
+    }
+    return cookies, csrf_token
+
+
+class VirtualUser:
+    def __init__(self, user):
+        self.username = user.username
+        self.cookies, self.csrf_token = login_cookies(user)
+
+
+class Dataset:
+    """Что есть в базе: адреса, по которым ходят сценарии."""
+
+    def __init__(self, usernames, post_ids, group_slugs, index_pages,
+                 virtual_users):
+        self.usernames = usernames
+        self.post_ids = post_ids
+        self.group_slugs = group_slugs
+        self.index_pages = index_pages
+        self.virtual_users = virtual_users
+
+    @classmethod
+    def load(cls, virtual_users=20):
+        post_count = Post.objects.count()
+        return cls(
+            usernames=list(User.objects.filter(
+                posts__isnull=False
+            ).distinct().values_list('username', flat=True)[:SAMPLE_SIZE]),
+            post_ids=list(Post.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            )[:SAMPLE_SIZE]),
+            group_slugs=list(Group.objects.values_list(
+                'slug', flat=True
+            )[:SAMPLE_SIZE]),
+            index_pages=max(
+                1, math.ceil(post_count / settings.PAGE_ROWS_COUNT)
+            ),
+            virtual_users=[
+                VirtualUser(user) for user in User.objects.filter(
+                    username__startswith=USERNAME_PREFIX,
+                    is_active=True
+                )[:virtual_users]
+            ]
+        )
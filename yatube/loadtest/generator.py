@@ -0,0 +1,355 @@
+import io
+import multiprocessing
+import os
+import time
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from PIL import Image
+
+from posts.groupstats import rebuild_group_stats
+from posts.models import Comment, Follow, Group, Post, User
+
+USERNAME_PREFIX = 'loadtest_'
+IMAGE_DIR = 'posts/loadtest'
+SYLLABLES = (
+    'ка', 'ло', 'ми', 'но', 'пра', 'ве', 'ста', 'ри', 'до', 'за', 'тель',
+    'ный', 'ско', 'го', 'ра', 'бо', 'ту', 'зе', 'ли', 'сти', 'мо', 'ва',
+)
+# порядок таблиц: строки каждой фазы ссылаются только на прошлые фазы
+PHASES = (('users', 'groups'), ('posts', 'follows'), ('comments',))
+TABLE_CODES = {
+    'users': 1, 'groups': 2, 'posts': 3, 'follows': 4, 'comments': 5,
+}
+
+
+class Plan:
+    """Что и сколько генерировать. Содержимое порции зависит только от
+    seed и ее номера, поэтому одинаковые seed и размер порции на пустой
+    базе дают одинаковые данные при любом числе процессов."""
+
+    def __init__(self, users, groups, posts, comments, follows_per_user,
+                 seed=0, images=20, image_rate=0.1, days=365,
+                 password='loadtest'):
+        self.counts = {
+            'users': users,
+            'groups': groups,
+            'posts': posts,
+            # подписки генерируются блоками подписчиков
+            'follows': users,
+            'comments': comments,
+        }
+        self.follows_per_user = follows_per_user
+        self.seed = seed
+        self.images = images
+        self.image_rate = image_rate
+        self.days = days
+        self.password = password
+        self.offsets = {}
+        self.now = None
+        self.password_hash = None
+        self.image_names = []
+
+    def prepare(self):
+        """Первые свободные id таблиц, общий хэш пароля и картинки."""
+        for name, model in (('users', User), ('groups', Group),
+                            ('posts', Post), ('comments', Comment)):
+            self.offsets[name] = (
+                model.objects.aggregate(last=Max('pk'))['last'] or 0
+            ) + 1
+        self.now = np.datetime64('now', 's')
+        self.password_hash = make_password(self.password)
+        self.image_names = write_images(self.images, self.seed)
+
+    def rng(self, table, chunk):
+        return np.random.default_rng(
+            [self.seed, TABLE_CODES[table], chunk]
+        )
+
+    def post_dates(self, indexes):
+        """Дата поста - функция его номера: посты идут по времени."""
+        span = self.days * 24 * 3600
+        total = max(self.counts['posts'], 1)
+        seconds = (indexes * span) // total
+        return self.now - span + seconds.astype('timedelta64[s]')
+
+    def popularity(self, count, exponent):
+        """Степенное распределение: веса ~ 1 / rank^exponent."""
+        weights = 1.0 / np.arange(1, count + 1) ** exponent
+        return weights / weights.sum()
+
+
+def write_images(count, seed):
+    """Небольшой набор настоящих картинок, на которые ссылаются посты."""
+    rng = np.random.default_rng([seed, 0])
+    directory = os.path.join(settings.MEDIA_ROOT, IMAGE_DIR)
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    for number in range(count):
+        name = f'{IMAGE_DIR}/{seed}_{number}.png'
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        if not os.path.exists(path):
+            pixels = rng.integers(0, 255, (339, 960, 3), dtype=np.uint8)
+            buffer = io.BytesIO()
+            Image.fromarray(pixels).save(buffer, 'PNG')
+            with open(path, 'wb') as file:
+                file.write(buffer.getvalue())
+        names.append(name)
+    return names
+
+
+def build_corpus(seed, size=1 << 20):
+    """Псевдотекст из слогов; тексты - срезы корпуса."""
+    rng = np.random.default_rng([seed, 99])
+    words = [
+        ''.join(rng.choice(SYLLABLES, rng.integers(1, 5)))
+        for _ in range(5000)
+    ]
+    parts = rng.choice(words, size // 6)
+    return ' '.join(parts)
+
+
+def text_slices(corpus, rng, count, median, sigma, maximum):
+    """Тексты с логнормальной длиной, как у настоящих постов."""
+    lengths = np.clip(
+        rng.lognormal(np.log(median), sigma, count), 1, maximum
+    ).astype(np.int64)
+    starts = rng.integers(0, len(corpus) - maximum, count)
+    return [
+        corpus[start:start + length].strip() or '.'
+        for start, length in zip(starts.tolist(), lengths.tolist())
+    ]
+
+
+def as_strings(dates):
+    return np.char.replace(
+        np.datetime_as_string(dates, unit='s'), 'T', ' '
+    ).tolist()
+
+
+def user_rows(plan, rng, start, count, corpus):
+    ids = np.arange(start, start + count) + plan.offsets['users']
+    joined = as_strings(plan.now - rng.integers(
+        0, plan.days * 24 * 3600, count
+    ).astype('timedelta64[s]'))
+    return [
+        (
+            pk, plan.password_hash, None, False,
+            f'{USERNAME_PREFIX}{pk}', '', '', '', False, True, date_joined
+        )
+        for pk, date_joined in zip(ids.tolist(), joined)
+    ]
+
+
+def group_rows(plan, rng, start, count, corpus):
+    ids = np.arange(start, start + count) + plan.offsets['groups']
+    descriptions = text_slices(corpus, rng, count, 150, 0.6, 1000)
+    return [
+        (pk, f'Группа {pk}', f'{USERNAME_PREFIX}{pk}', description)
+        for pk, description in zip(ids.tolist(), descriptions)
+    ]
+
+
+def post_rows(plan, rng, start, count, corpus):
+    indexes = np.arange(start, start + count)
+    # немногие авторы пишут большую часть постов
+    authors = rng.choice(
+        plan.counts['users'], count, p=plan.popularity(
+            plan.counts['users'], 1.1
+        )
+    ) + plan.offsets['users']
+    groups = rng.integers(0, plan.counts['groups'] + 1, count)
+    group_ids = [
+        None if group == plan.counts['groups']
+        else group + plan.offsets['groups']
+        for group in groups.tolist()
+    ]
+    with_image = rng.random(count) < plan.image_rate
+    images = rng.integers(0, max(len(plan.image_names), 1), count)
+    texts = text_slices(corpus, rng, count, 300, 1.0, 5000)
+    dates = as_strings(plan.post_dates(indexes))
+    return [
+        (
+            pk, text, date, author, group,
+            plan.image_names[image] if has_image and plan.image_names
+            else ''
+        )
+        for pk, text, date, author, group, has_image, image in zip(
+            (indexes + plan.offsets['posts']).tolist(), texts, dates,
+            authors.tolist(), group_ids, with_image.tolist(),
+            images.tolist()
+        )
+    ]
+
+
+def follow_rows(plan, rng, start, count, corpus):
+    """Граф подписок со степенным распределением: число подписок
+    пользователя - закон Ципфа, популярность авторов - степенная.
+
+    Порция подписок - это блок пользователей [start, start + count).
+    """
+    users = plan.counts['users']
+    block = np.arange(start, start + count)
+    degrees = np.minimum(
+        rng.zipf(2.0, count) * max(plan.follows_per_user // 2, 1),
+        min(users - 1, plan.follows_per_user * 50)
+    )
+    followers = np.repeat(block, degrees)
+    authors = rng.choice(
+        users, len(followers), p=plan.popularity(users, 0.9)
+    )
+    # повторы и подписки на себя отбрасываются
+    keys = np.unique(followers * users + authors)
+    followers, authors = keys // users, keys % users
+    keep = followers != authors
+    return list(zip(
+        (followers[keep] + plan.offsets['users']).tolist(),
+        (authors[keep] + plan.offsets['users']).tolist()
+    ))
+
+
+def comment_rows(plan, rng, start, count, corpus):
+    """Комментарии приходят всплесками: большая часть - к немногим
+    популярным постам вскоре после публикации."""
+    posts = rng.choice(
+        plan.counts['posts'], count, p=plan.popularity(
+            plan.counts['posts'], 1.2
+        )
+    )
+    # перемешиваем ранги, чтобы популярными были не только старые посты
+    posts = (posts * 2654435761 + plan.seed) % plan.counts['posts']
+    delays = rng.exponential(1800, count).astype('timedelta64[s]')
+    created = as_strings(np.minimum(
+        plan.post_dates(posts) + delays, plan.now
+    ))
+    authors = rng.integers(0, plan.counts['users'], count)
+    texts = text_slices(corpus, rng, count, 60, 0.8, 1000)
+    ids = np.arange(start, start + count) + plan.offsets['comments']
+    return [
+        (pk, post, author, text, date)
+        for pk, post, author, text, date in zip(
+            ids.tolist(),
+            (posts + plan.offsets['posts']).tolist(),
+            (authors + plan.offsets['users']).tolist(),
+            texts, created
+        )
+    ]
+
+
+TABLES = {
+    'users': (User, (
+        'id', 'password', 'last_login', 'is_superuser', 'username',
+        'first_name', 'last_name', 'email', 'is_staff', 'is_active',
+        'date_joined'
+    ), user_rows),
+    'groups': (Group, ('id', 'title', 'slug', 'description'), group_rows),
+    'posts': (Post, (
+        'id', 'text', 'pub_date', 'author_id', 'group_id', 'image'
+    ), post_rows),
+    'follows': (Follow, ('user_id', 'author_id'), follow_rows),
+    'comments': (Comment, (
+        'id', 'post_id', 'author_id', 'text', 'created'
+    ), comment_rows),
+}
+
+_corpus = None
+
+
+def build_chunk(job):
+    """Строки одной порции; вызывается в дочерних процессах."""
+    global _corpus
+    plan, table, chunk, start, count = job
+    if _corpus is None:
+        _corpus = build_corpus(plan.seed)
+    build = TABLES[table][2]
+    return table, build(plan, plan.rng(table, chunk), start, count, _corpus)
+
+
+def insert_rows(table, rows):
+    """Одна транзакция и один executemany на порцию."""
+    model, columns, _ = TABLES[table]
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES '.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(column) for column in columns)
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # executemany в psycopg2 - запрос на строку, execute_values -
+            # многострочный VALUES
+            from psycopg2.extras import execute_values
+            execute_values(cursor.cursor, sql + '%s', rows, page_size=1000)
+        else:
+            cursor.executemany(
+                sql + '({})'.format(', '.join(['%s'] * len(columns))), rows
+            )
+    return len(rows)
+
+
+def insert_chunk(job):
+    table, rows = build_chunk(job)
+    return table, insert_rows(table, rows)
+
+
+def _jobs(plan, tables, chunk_size):
+    for table in tables:
+        total = plan.counts[table]
+        size = chunk_size
+        if table == 'follows':
+            # порция - блок пользователей с ~chunk_size подписками
+            size = max(chunk_size // plan.follows_per_user, 1)
+        for chunk, start in enumerate(range(0, total, size)):
+            yield plan, table, chunk, start, min(size, total - start)
+
+
+def generate(plan, workers=None, chunk_size=50000, progress=None):
+    """Заполняет базу по плану, порции готовятся параллельно.
+
+    В PostgreSQL каждый процесс сам вставляет свои порции. SQLite не
+    допускает одновременной записи: процессы только готовят строки,
+    а вставляет их родитель. Возвращает {таблица: число строк}.
+    """
+    plan.prepare()
+    if not hasattr(os, 'fork'):
+        workers = 1
+    workers = workers or os.cpu_count()
+    parallel_writes = connection.vendor != 'sqlite'
+    task = insert_chunk if parallel_writes else build_chunk
+    inserted = dict.fromkeys(TABLES, 0)
+    pool = None
+    if workers > 1:
+        # соединение родителя не должно достаться дочерним процессам
+        connections.close_all()
+        pool = multiprocessing.get_context('fork').Pool(workers)
+    try:
+        for tables in PHASES:
+            started = time.monotonic()
+            jobs = _jobs(plan, tables, chunk_size)
+            results = (
+                pool.imap_unordered(task, jobs) if pool else map(task, jobs)
+            )
+            rows = 0
+            for table, result in results:
+                count = result if parallel_writes else insert_rows(
+                    table, result
+                )
+                inserted[table] += count
+                rows += count
+            if progress is not None:
+                progress(tables, rows, time.monotonic() - started)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    # id вставлены явно - сдвигаем последовательности (PostgreSQL)
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(
+            no_style(), [User, Group, Post, Follow, Comment]
+        ):
+            cursor.execute(sql)
+    rebuild_group_stats()
+    return inserted
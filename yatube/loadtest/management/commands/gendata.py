@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from loadtest.generator import Plan, generate
+
+
+class Command(BaseCommand):
+    help = (
+        'Синтетические данные для проверки масштабирования: пользователи, '
+        'группы, посты, подписки и комментарии (детерминированно по seed)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--groups', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--comments', type=int, default=2000000)
+        parser.add_argument(
+            '--follows', type=int, default=20,
+            help='Среднее число подписок пользователя'
+        )
+        parser.add_argument('--images', type=int, default=20,
+                            help='Сколько разных картинок создать')
+        parser.add_argument('--image-rate', type=float, default=0.1,
+                            help='Доля постов с картинкой')
+        parser.add_argument('--days', type=int, default=365,
+                            help='За сколько дней распределить посты')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--workers', type=int,
+                            help='Число процессов (по умолчанию - по ядрам)')
+        parser.add_argument('--chunk-size', type=int, default=50000)
+
+    def handle(self, *args, **options):
+        plan = Plan(
+            users=options['users'],
+            groups=options['groups'],
+            posts=options['posts'],
+            comments=options['comments'],
+            follows_per_user=options['follows'],
+            seed=options['seed'],
+            images=options['images'],
+            image_rate=options['image_rate'],
+            days=options['days'],
+        )
+
+        def progress(tables, rows, seconds):
+            self.stdout.write(
+                f"{', '.join(tables)}: {rows} строк за {seconds:.1f} с "
+                f'({rows / max(seconds, 1e-9):,.0f} строк/с)'
+            )
+
+        inserted = generate(
+            plan, options['workers'], options['chunk_size'], progress
+        )
+        self.stdout.write(', '.join(
+            f'{table}: {count}' for table, count in inserted.items()
+        ))
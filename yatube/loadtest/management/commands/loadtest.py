@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from loadtest import dataset, report, runner
+from loadtest.scenarios import SCENARIOS
+
+
+def parse_mix(value):
+    """'anonymous_index=5,profile=2' -> {'anonymous_index': 5, ...}"""
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise CommandError(
+                f'Неизвестный сценарий {name!r}, '
+                f'доступны: {", ".join(SCENARIOS)}'
+            )
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест запущенного сервера: смесь сценариев, '
+        'req/s и перцентили задержек по маршрутам'
+    )
+
+    def add_arguments(self, parser):
+        options = settings.LOADTEST
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument(
+            '--duration', type=float, default=options['DURATION'],
+            help='Длительность прогона, секунд'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=options['CONCURRENCY'],
+            help='Число одновременных виртуальных пользователей'
+        )
+        parser.add_argument(
+            '--mix',
+            help='Веса сценариев: anonymous_index=5,comment_burst=1'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--generate', type=int, default=0, metavar='USERS',
+            help='Сначала создать USERS пользователей loadtest_* с постами '
+                 '(для больших объемов - manage.py gendata)'
+        )
+        parser.add_argument(
+            '--compare', metavar='PATH',
+            help='Сравнить с сохраненным прогоном (по умолчанию - '
+                 'с последним в RESULTS_DIR)'
+        )
+        parser.add_argument(
+            '--no-save', action='store_true',
+            help='Не сохранять результат'
+        )
+
+    def handle(self, *args, **options):
+        results_dir = settings.LOADTEST['RESULTS_DIR']
+        mix = (
+            parse_mix(options['mix']) if options['mix']
+            else settings.LOADTEST['MIX']
+        )
+        if options['generate']:
+            inserted = dataset.generate_small(
+                options['generate'], options['seed'], workers=None
+            )
+            self.stdout.write(', '.join(
+                f'{table}: {count}' for table, count in inserted.items()
+            ))
+        data = dataset.Dataset.load(options['concurrency'])
+        previous_path = options['compare'] or report.latest(results_dir)
+
+        self.stdout.write(
+            f"{options['url']}: {options['concurrency']} пользователей, "
+            f"{options['duration']:g} с"
+        )
+        stats = runner.run(
+            options['url'],
+            mix,
+            data,
+            options['concurrency'],
+            options['duration'],
+            options['seed']
+        )
+        summary = stats.summary()
+        self.stdout.write(report.format_summary(summary))
+
+        if previous_path:
+            previous = report.load(previous_path)
+            self.stdout.write(f'\nСравнение с {previous_path}:')
+            self.stdout.write(
+                report.compare(summary, previous['summary'])
+            )
+        if not options['no_save']:
+            path = report.save({
+                'commit': report.current_commit(),
+                'url': options['url'],
+                'concurrency': options['concurrency'],
+                'duration': stats.duration,
+                'mix': mix,
+                'summary': summary,
+            }, results_dir)
+            self.stdout.write(f'\nРезультат сохранен в {path}')
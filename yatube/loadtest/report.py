@@ -0,0 +1,124 @@
+import json
+import os
+import subprocess
+from collections import Counter, defaultdict
+from datetime import datetime
+
+TOTAL = 'total'
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(values, q):
+    """Перцентиль по ближайшему рангу; values отсортированы."""
+    if not values:
+        return 0.0
+    rank = max(1, -(-q * len(values) // 100))
+    return values[int(rank) - 1]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.duration = 0.0
+
+    def add(self, name, status, latency):
+        self.latencies[name].append(latency)
+        self.statuses[name][str(status)] += 1
+
+    def add_error(self, name, error):
+        self.statuses[name][type(error).__name__] += 1
+
+    def summary(self):
+        names = sorted(set(self.latencies) | set(self.statuses))
+        rows = {name: self._row(
+            self.latencies[name], self.statuses[name]
+        ) for name in names}
+        rows[TOTAL] = self._row(
+            [value for name in names for value in self.latencies[name]],
+            sum(self.statuses.values(), Counter())
+        )
+        return rows
+
+    def _row(self, latencies, statuses):
+        latencies = sorted(latencies)
+        requests = sum(statuses.values())
+        row = {
+            'requests': requests,
+            'rps': requests / self.duration if self.duration else 0.0,
+            # ошибки - ответы 4xx/5xx и обрывы соединения; 429 от
+            # ограничителя частоты - штатный ответ под нагрузкой
+            'errors': sum(
+                count for status, count in statuses.items()
+                if not status.isdigit()
+                or int(status) >= 400 and status != '429'
+            ),
+            'statuses': dict(statuses),
+            'max': latencies[-1] if latencies else 0.0,
+        }
+        for q in PERCENTILES:
+            row[f'p{q}'] = percentile(latencies, q)
+        return row
+
+
+def format_summary(summary):
+    lines = [
+        f"{'маршрут':<24}{'запросов':>10}{'req/s':>9}{'ошибок':>8}"
+        f"{'p50, мс':>10}{'p90, мс':>10}{'p99, мс':>10}{'max, мс':>10}"
+    ]
+    for name, row in summary.items():
+        lines.append(
+            f"{name:<24}{row['requests']:>10}{row['rps']:>9.1f}"
+            f"{row['errors']:>8}{row['p50'] * 1000:>10.1f}"
+            f"{row['p90'] * 1000:>10.1f}{row['p99'] * 1000:>10.1f}"
+            f"{row['max'] * 1000:>10.1f}"
+        )
+    return '\n'.join(lines)
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def save(result, results_dir):
+    """Сохраняет прогон в <results_dir>/<время>-<коммит>.json."""
+    os.makedirs(results_dir, exist_ok=True)
+    started = datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(results_dir, f"{started}-{result['commit']}.json")
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(result, file, ensure_ascii=False, indent=2)
+    return path
+
+
+def latest(results_dir):
+    if not os.path.isdir(results_dir):
+        return None
+    names = sorted(
+        name for name in os.listdir(results_dir) if name.endswith('.json')
+    )
+    return os.path.join(results_dir, names[-1]) if names else None
+
+
+def load(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare(summary, previous):
+    """Изменение пропускной способности и p90 относительно прошлого
+    прогона по маршрутам, которые есть в обоих."""
+    lines = []
+    for name, row in summary.items():
+        old = previous.get(name)
+        if not old or not old['rps'] or not old['p90']:
+            continue
+        rps = (row['rps'] - old['rps']) / old['rps'] * 100
+        p90 = (row['p90'] - old['p90']) / old['p90'] * 100
+        lines.append(f'{name:<24}req/s {rps:+6.1f}%   p90 {p90:+6.1f}%')
+    return '\n'.join(lines)
@@ -0,0 +1,65 @@
+import asyncio
+import random
+import time
+
+from .client import HttpClient
+from .report import Stats
+from .scenarios import SCENARIOS
+
+
+async def _worker(number, base_url, mix, data, deadline, seed, stats):
+    rng = random.Random(seed + number)
+    names, weights = zip(*mix.items())
+    anonymous = HttpClient(base_url)
+    user = authenticated = None
+    if data.virtual_users:
+        user = data.virtual_users[number % len(data.virtual_users)]
+        authenticated = HttpClient(base_url, user.cookies)
+    try:
+        while time.monotonic() < deadline:
+            scenario = SCENARIOS[rng.choices(names, weights)[0]]
+            client = authenticated if scenario.authenticated else anonymous
+            for step in scenario.steps(data, user, rng):
+                started = time.monotonic()
+                try:
+                    response = await client.request(
+                        step.method, step.path, step.body, step.headers
+                    )
+                except (OSError, asyncio.IncompleteReadError,
+                        ValueError) as error:
+                    stats.add_error(step.name, error)
+                    await client.close()
+                    break
+                stats.add(
+                    step.name,
+                    response.status,
+                    time.monotonic() - started
+                )
+    finally:
+        await anonymous.close()
+        if authenticated is not None:
+            await authenticated.close()
+
+
+def run(base_url, mix, data, concurrency, duration, seed=0):
+    """Прогоняет смесь сценариев concurrency виртуальными пользователями
+    в течение duration секунд и возвращает Stats."""
+    if not data.virtual_users:
+        # сценариям со входом нужны пользователи loadtest_*
+        mix = {
+            name: weight for name, weight in mix.items()
+            if not SCENARIOS[name].authenticated
+        }
+    stats = Stats()
+    started = time.monotonic()
+    deadline = started + duration
+
+    async def main():
+        await asyncio.gather(*(
+            _worker(number, base_url, mix, data, deadline, seed, stats)
+            for number in range(concurrency)
+        ))
+
+    asyncio.run(main())
+    stats.duration = time.monotonic() - started
+    return stats
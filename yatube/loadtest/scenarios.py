@@ -0,0 +1,126 @@
+import uuid
+from urllib.parse import urlencode
+
+from core.urlbuilder import build_url
+
+# 2x1 GIF для загрузки картинок
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+FORM_CONTENT_TYPE = 'application/x-www-form-urlencoded'
+
+
+class Step:
+    """Один запрос сценария; name - имя маршрута для отчета."""
+
+    def __init__(self, name, path, method='GET', body=b'', headers=None):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.body = body
+        self.headers = headers or {}
+
+
+class Scenario:
+    def __init__(self, steps, authenticated=False):
+        self.steps = steps
+        self.authenticated = authenticated
+
+
+def _index_page(page):
+    return Step('posts:index', f"{build_url('posts:index')}?page={page}")
+
+
+def _form(user, **fields):
+    fields['csrfmiddlewaretoken'] = user.csrf_token
+    return urlencode(fields).encode(), {'Content-Type': FORM_CONTENT_TYPE}
+
+
+def _multipart(user, fields, files):
+    boundary = uuid.uuid4().hex
+    lines = []
+    fields = dict(fields, csrfmiddlewaretoken=user.csrf_token)
+    for name, value in fields.items():
+        lines.append(
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+            f'{value}\r\n'.encode()
+        )
+    for name, (filename, content_type, content) in files.items():
+        lines.append(
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{name}"; '
+            f'filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode()
+            + content + b'\r\n'
+        )
+    lines.append(f'--{boundary}--\r\n'.encode())
+    content_type = f'multipart/form-data; boundary={boundary}'
+    return b''.join(lines), {'Content-Type': content_type}
+
+
+def anonymous_index(data, user, rng):
+    for page in range(1, min(3, data.index_pages) + 1):
+        yield _index_page(page)
+
+
+def deep_pagination(data, user, rng):
+    first = max(1, data.index_pages // 2)
+    yield _index_page(rng.randint(first, data.index_pages))
+
+
+def profile(data, user, rng):
+    if data.usernames:
+        username = rng.choice(data.usernames)
+        yield Step('posts:profile', build_url('posts:profile', username))
+
+
+def follow_feed(data, user, rng):
+    yield Step('posts:follow_index', build_url('posts:follow_index'))
+
+
+def comment_burst(data, user, rng):
+    if not data.post_ids:
+        return
+    post_id = rng.choice(data.post_ids)
+    yield Step('posts:post_detail', build_url('posts:post_detail', post_id))
+    for number in range(rng.randint(3, 6)):
+        body, headers = _form(user, text=f'Комментарий {number}')
+        yield Step(
+            'posts:add_comment',
+            build_url('posts:add_comment', post_id),
+            'POST',
+            body,
+            headers
+        )
+
+
+def image_upload(data, user, rng):
+    yield Step('posts:post_create', build_url('posts:post_create'))
+    body, headers = _multipart(
+        user,
+        {'text': 'Пост с картинкой из нагрузочного теста'},
+        {'image': ('loadtest.gif', 'image/gif', SMALL_GIF)}
+    )
+    yield Step(
+        'posts:post_create',
+        build_url('posts:post_create'),
+        'POST',
+        body,
+        headers
+    )
+
+
+SCENARIOS = {
+    'anonymous_index': Scenario(anonymous_index),
+    'deep_pagination': Scenario(deep_pagination),
+    'profile': Scenario(profile),
+    'follow_feed': Scenario(follow_feed, authenticated=True),
+    'comment_burst': Scenario(comment_burst, authenticated=True),
+    'image_upload': Scenario(image_upload, authenticated=True),
+}
@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from loadtest.generator import Plan, generate
+from posts.models import Comment, Follow, Group, GroupStats, Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class GeneratorTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def plan(self, seed=1):
+        return Plan(
+            users=50, groups=3, posts=400, comments=300,
+            follows_per_user=4, seed=seed, images=2, image_rate=0.5
+        )
+
+    def snapshot(self):
+        return list(Post.objects.order_by('pk').values_list(
+            'text', 'author__username', 'group__slug', 'image'
+        ))
+
+    def test_counts_and_invariants(self):
+        inserted = generate(self.plan(), workers=1, chunk_size=100)
+        self.assertEqual(User.objects.count(), 50)
+        self.assertEqual(Post.objects.count(), 400)
+        self.assertEqual(Comment.objects.count(), 300)
+        self.assertEqual(Follow.objects.count(), inserted['follows'])
+        self.assertFalse(Follow.objects.filter(user=F('author')).exists())
+        self.assertFalse(
+            Comment.objects.filter(created__lt=F('post__pub_date')).exists()
+        )
+        self.assertTrue(Post.objects.exclude(image='').exists())
+        self.assertEqual(
+            sum(GroupStats.objects.values_list('post_count', flat=True)),
+            Post.objects.filter(group__isnull=False).count()
+        )
+
+    def test_same_seed_same_data(self):
+        generate(self.plan(), workers=1, chunk_size=100)
+        first = self.snapshot()
+        for model in (Comment, Follow, Post, Group, User):
+            model.objects.all().delete()
+        generate(self.plan(), workers=1, chunk_size=100)
+        self.assertEqual(self.snapshot(), first)
+        Post.objects.all().delete()
+        generate(self.plan(seed=2), workers=1, chunk_size=100)
+        self.assertNotEqual(
+            [row[0] for row in self.snapshot()[:10]],
+            [row[0] for row in first[:10]]
+        )
@@ -0,0 +1,58 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import LiveServerTestCase, SimpleTestCase, override_settings
+
+from loadtest import dataset, runner
+from loadtest.report import Stats, compare, percentile
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+class ReportTests(SimpleTestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 90), 7)
+        self.assertEqual(percentile([], 90), 0.0)
+
+    def test_summary_counts_rate_limited_as_handled(self):
+        stats = Stats()
+        stats.add('posts:index', 200, 0.1)
+        stats.add('posts:index', 429, 0.2)
+        stats.add('posts:index', 500, 0.3)
+        stats.add_error('posts:index', ConnectionResetError())
+        stats.duration = 2
+        row = stats.summary()['posts:index']
+        self.assertEqual(row['requests'], 4)
+        self.assertEqual(row['errors'], 2)
+        self.assertEqual(row['rps'], 2)
+        self.assertIn('+100.0%', compare(
+            {'posts:index': {'rps': 2, 'p90': 0.3}},
+            {'posts:index': {'rps': 1, 'p90': 0.3}}
+        ))
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class LoadTestRunTests(LiveServerTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_traffic_mix_against_live_server(self):
+        dataset.generate_small(users=4)
+        data = dataset.Dataset.load(virtual_users=2)
+        stats = runner.run(
+            self.live_server_url,
+            settings.LOADTEST['MIX'],
+            data,
+            concurrency=2,
+            duration=1
+        )
+        summary = stats.summary()
+        self.assertGreater(summary['total']['requests'], 0)
+        self.assertEqual(summary['total']['errors'], 0, summary)
+        self.assertIn('posts:index', summary)
@@ -1,34 +1,85 @@
 from django.contrib import admin
 
-from .models import Group, Post, Comment, Follow
+from core.admin import ScalableAdmin, username_filter
+from .deletion import delete_group
+from .models import ArchivedPost, Group, Post, Comment, Follow
+from .tasks import delete_group_in_chunks
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(ScalableAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group')
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
-    list_filter = ('pub_date',)
+    list_filter = ('pub_date', username_filter('author', 'автору'))
+    autocomplete_fields = ('author',)
     empty_value_display = '-пусто-'
 
 
+class ArchivedPostAdmin(ScalableAdmin):
+    """Архив только для просмотра: посты переносит posts.archive."""
+    list_display = ('pk', 'text', 'pub_date', 'author', 'group', 'archived')
+    list_select_related = ('author', 'group')
+    search_fields = ('text',)
+    list_filter = ('pub_date', username_filter('author', 'автору'))
+    empty_value_display = '-пусто-'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 class GroupAdmin(admin.ModelAdmin):
     list_display = ('pk', 'title', 'slug', 'description')
     search_fields = ('title', 'description',)
+    actions = ('delete_in_background',)
+
+    def get_actions(self, request):
+        # SET_NULL по всем постам группы выполняется порциями в фоне
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def delete_in_background(self, request, queryset):
+        for group in queryset:
+            delete_group_in_chunks.delay(group.pk)
+        self.message_user(
+            request,
+            f'Групп поставлено в очередь на удаление: {queryset.count()}'
+        )
+    delete_in_background.short_description = 'Удалить в фоне'
+
+    def get_deleted_objects(self, objs, request):
+        # подтверждение не обходит посты группы: их отвязывает delete_group
+        return [str(obj) for obj in objs], {}, set(), []
+
+    def delete_model(self, request, obj):
+        delete_group(obj.pk)
 
 
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(ScalableAdmin):
     list_display = ('pk', 'post', 'author', 'text', 'created')
+    list_select_related = ('post', 'author')
     search_fields = ('text',)
-    list_filter = ('created', 'author',)
+    list_filter = ('created', username_filter('author', 'автору'))
+    autocomplete_fields = ('post', 'author')
     empty_value_display = '-пусто-'
 
 
-class FollowAdmin(admin.ModelAdmin):
+class FollowAdmin(ScalableAdmin):
     list_display = ('pk', 'user', 'author')
-    list_filter = ('user', 'author',)
+    list_select_related = ('user', 'author')
+    list_filter = (
+        username_filter('user', 'подписчику'),
+        username_filter('author', 'автору'),
+    )
+    autocomplete_fields = ('user', 'author')
 
 
 admin.site.register(Post, PostAdmin)
+admin.site.register(ArchivedPost, ArchivedPostAdmin)
 admin.site.register(Group, GroupAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Follow, FollowAdmin)
@@ -0,0 +1,149 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+
+from .deletion import _chunks
+from .groupstats import deferred_refresh
+from .models import (
+    ArchivedComment, ArchivedPost, ArchivedRevision, Comment, Post,
+    PostRevision
+)
+
+POST_FIELDS = (
+    'id', 'text', 'pub_date', 'edited_at', 'author_id', 'group_id', 'image'
+)
+COMMENT_FIELDS = ('id', 'post_id', 'author_id', 'text', 'created')
+REVISION_FIELDS = (
+    'id', 'post_id', 'number', 'created', 'editor_id', 'delta', 'is_snapshot'
+)
+COUNT_KEY = 'archive:count:{digest}'
+FEED_ORDERING = ('-pub_date', '-pk')
+
+
+class ChainedQuerySet:
+    """Две выборки подряд для Paginator.
+
+    count() складывает счетчики, срез берет строки из первой выборки и
+    добирает из второй; вторая читается, только если страница до нее
+    дошла. Счетчики выборок из cached берутся из кэша.
+    """
+
+    def __init__(self, *querysets, cached=()):
+        self.querysets = querysets
+        self.cached = cached
+        self._counts = None
+
+    def _count(self, queryset):
+        if queryset not in self.cached:
+            return queryset.count()
+        key = COUNT_KEY.format(
+            digest=hashlib.md5(str(queryset.query).encode()).hexdigest()
+        )
+        value = cache.get(key)
+        if value is None:
+            value = queryset.count()
+            cache.set(key, value, settings.ARCHIVE['COUNT_TIMEOUT'])
+        return value
+
+    def count(self):
+        if self._counts is None:
+            self._counts = [
+                self._count(queryset) for queryset in self.querysets
+            ]
+        return sum(self._counts)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            items = self[key:key + 1]
+            if not items:
+                raise IndexError(key)
+            return items[0]
+        total = self.count()
+        start = 0 if key.start is None else key.start
+        stop = total if key.stop is None else key.stop
+        items = []
+        for queryset, count in zip(self.querysets, self._counts):
+            if start < count and stop > 0:
+                items.extend(queryset[max(start, 0):min(stop, count)])
+            start -= count
+            stop -= count
+        return items
+
+
+def with_archive(posts, archived):
+    """Лента горячих и архивных постов, от новых к старым.
+
+    Архивные посты старше горячих, поэтому первые страницы целиком
+    отдает горячая таблица, а архив читается только на дальних. Срез
+    архива идет по индексу pub_date, а его COUNT(*), который иначе
+    считался бы на каждый запрос, кэшируется на ARCHIVE['COUNT_TIMEOUT']
+    секунд - архив меняется только фоновой задачей.
+    """
+    archived = archived.order_by(*FEED_ORDERING)
+    return ChainedQuerySet(
+        posts.order_by(*FEED_ORDERING), archived, cached=(archived,)
+    )
+
+
+def get_post_or_404(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None:
+        post = ArchivedPost.objects.filter(pk=post_id).first()
+    if post is None:
+        raise Http404('Пост не найден')
+    return post
+
+
+def author_post_count(author):
+    return author.posts.count() + author.archived_posts.count()
+
+
+def _move(ids):
+    ArchivedPost.objects.bulk_create([
+        ArchivedPost(**row)
+        for row in Post.objects.filter(pk__in=ids).values(*POST_FIELDS)
+    ])
+    ArchivedComment.objects.bulk_create([
+        ArchivedComment(**row)
+        for row in Comment.objects.filter(post__in=ids).values(
+            *COMMENT_FIELDS
+        )
+    ])
+    ArchivedRevision.objects.bulk_create([
+        ArchivedRevision(**row)
+        for row in PostRevision.objects.filter(post__in=ids).values(
+            *REVISION_FIELDS
+        )
+    ])
+    # комментарии, версии и рейтинг удаляются каскадом
+    Post.objects.filter(pk__in=ids).delete()
+
+
+def archive_posts(age=None, chunk_size=None, progress=None):
+    """Переносит посты старше age вместе с комментариями в архив.
+
+    Каждая порция - отдельная транзакция, счетчики групп пересчитываются
+    один раз на порцию. Возвращает число перенесенных постов.
+    """
+    if age is None:
+        age = timedelta(days=settings.ARCHIVE['AGE_DAYS'])
+    chunk_size = chunk_size or settings.ARCHIVE['CHUNK_SIZE']
+    queryset = Post.objects.filter(
+        pub_date__lt=timezone.now() - age
+    ).order_by('pub_date')
+    done = 0
+    for ids in _chunks(queryset, chunk_size):
+        with transaction.atomic(), deferred_refresh():
+            _move(ids)
+        done += len(ids)
+        if progress is not None:
+            progress(done)
+    return done
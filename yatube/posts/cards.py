@@ -0,0 +1,60 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template import loader
+from django.utils import translation
+
+from .variants import attach_pictures
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+CARD_KEY = 'post_card:{post_id}:{fingerprint}'
+# флаги шаблона карточки, которые берутся из контекста страницы
+CARD_FLAGS = ('hide_author', 'hide_group')
+
+
+def card_fingerprint(post, flags):
+    """Версия карточки: меняется при правке текста, смене картинки или
+    группы, переименовании автора или группы - старый ключ просто
+    перестает запрашиваться."""
+    author = post.author
+    group = post.group
+    parts = (
+        post.text, post.pub_date.isoformat(), post.image.name,
+        author.username, author.first_name, author.last_name,
+        group.slug if group else '', group.title if group else '',
+        translation.get_language() or '',
+    ) + tuple(sorted(name for name in CARD_FLAGS if flags.get(name)))
+    return hashlib.md5('\x00'.join(parts).encode()).hexdigest()
+
+
+def render_cards(posts, context):
+    """HTML карточек постов: все ключи читаются одним get_many,
+    рендерятся и записываются одним set_many только промахи."""
+    flags = {name: bool(context.get(name)) for name in CARD_FLAGS}
+    posts = list(posts)
+    keys = [
+        CARD_KEY.format(
+            post_id=post.pk,
+            fingerprint=card_fingerprint(post, flags)
+        )
+        for post in posts
+    ]
+    cards = cache.get_many(keys)
+    missing = [(key, post) for key, post in zip(keys, posts)
+               if key not in cards]
+    if missing:
+        attach_pictures([post for _, post in missing])
+        template = loader.get_template(CARD_TEMPLATE)
+        rendered = {
+            key: template.render(dict(flags, post=post))
+            for key, post in missing
+        }
+        cards.update(rendered)
+        # карточку с миниатюрой-заглушкой не кэшируем: варианты
+        # картинки вот-вот подготовит фоновая задача
+        cache.set_many({
+            key: rendered[key] for key, post in missing
+            if post.picture or not post.image
+        }, settings.POST_CARD_CACHE_TIMEOUT)
+    return [cards[key] for key in keys]
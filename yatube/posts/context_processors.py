@@ -0,0 +1,15 @@
+from django.utils.functional import SimpleLazyObject
+
+from .following import get_request_following
+
+
+def following(request):
+    """Подписки пользователя для шаблонов.
+
+    `{% if post.author_id in following_ids %}` не делает запросов к БД.
+    """
+    return {
+        'following_ids': SimpleLazyObject(
+            lambda: get_request_following(request)
+        )
+    }
@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.db import transaction
+from django.db.models import Q
+
+from tasks.worker import report_progress
+from users.backends import forget_user
+
+from .groupstats import deferred_refresh
+from .models import (
+    ArchivedComment, ArchivedPost, ArchivedRevision, Comment, Follow,
+    FollowSuggestion, Group, Post, PostRevision, TrendingPost, User
+)
+
+
+def _report(progress, step, done):
+    # в фоне прогресс виден в строке Task, из консоли - через progress
+    report_progress(step, done)
+    if progress is not None:
+        progress(step, done)
+
+
+def _chunks(queryset, chunk_size):
+    """Отдает списки pk не длиннее chunk_size, пока queryset не опустеет.
+
+    Вызывающий код обязан убрать строки из queryset: удалить или изменить.
+    """
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return
+        yield ids
+
+
+def _run_steps(steps, chunk_size, progress):
+    """Шаг - (имя, queryset, changes): строки queryset порциями
+    удаляются или, если задан changes, обновляются через update()."""
+    for step, queryset, changes in steps:
+        done = 0
+        for ids in _chunks(queryset, chunk_size):
+            with transaction.atomic():
+                chunk = queryset.model.objects.filter(pk__in=ids)
+                if changes is None:
+                    chunk.delete()
+                else:
+                    chunk.update(**changes)
+            done += len(ids)
+            _report(progress, step, done)
+
+
+def delete_user(user_id, chunk_size=None, progress=None):
+    """Удаляет пользователя и его историю порциями по chunk_size строк.
+
+    Каждая порция - отдельная короткая транзакция, поэтому база не
+    блокируется надолго, а в памяти одновременно не больше порции строк.
+    К моменту удаления самой строки пользователя каскаду удалять нечего.
+    """
+    chunk_size = chunk_size or settings.DELETION_CHUNK_SIZE
+    # пока идет удаление, пользователь не может войти
+    User.objects.filter(pk=user_id).update(is_active=False)
+    forget_user(user_id)
+    steps = (
+        ('comments_on_posts', Comment.objects.filter(post__author=user_id),
+         None),
+        ('comments', Comment.objects.filter(author=user_id), None),
+        ('follows', Follow.objects.filter(
+            Q(user=user_id) | Q(author=user_id)
+        ), None),
+        ('follow_suggestions', FollowSuggestion.objects.filter(
+            Q(user=user_id) | Q(author=user_id)
+        ), None),
+        ('trending', TrendingPost.objects.filter(post__author=user_id),
+         None),
+        ('revisions', PostRevision.objects.filter(post__author=user_id),
+         None),
+        ('edited_revisions', PostRevision.objects.filter(editor=user_id),
+         {'editor': None}),
+        ('posts', Post.objects.filter(author=user_id), None),
+        ('archived_comments_on_posts', ArchivedComment.objects.filter(
+            post__author=user_id
+        ), None),
+        ('archived_comments', ArchivedComment.objects.filter(
+            author=user_id
+        ), None),
+        ('archived_revisions', ArchivedRevision.objects.filter(
+            post__author=user_id
+        ), None),
+        ('edited_archived_revisions', ArchivedRevision.objects.filter(
+            editor=user_id
+        ), {'editor': None}),
+        ('archived_posts', ArchivedPost.objects.filter(author=user_id),
+         None),
+        ('admin_log', LogEntry.objects.filter(user=user_id), None),
+    )
+    # счетчики групп пересчитываются один раз в конце, а не на каждую порцию
+    with deferred_refresh():
+        _run_steps(steps, chunk_size, progress)
+        User.objects.filter(pk=user_id).delete()
+    _report(progress, 'user', 1)
+
+
+def delete_group(group_id, chunk_size=None, progress=None):
+    """Отвязывает посты от группы порциями и удаляет группу."""
+    chunk_size = chunk_size or settings.DELETION_CHUNK_SIZE
+    steps = (
+        ('posts', Post.objects.filter(group=group_id), {'group': None}),
+        ('archived_posts', ArchivedPost.objects.filter(group=group_id),
+         {'group': None}),
+    )
+    _run_steps(steps, chunk_size, progress)
+    Group.objects.filter(pk=group_id).delete()
+    _report(progress, 'group', 1)
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.template.defaultfilters import truncatechars
+from django.utils.feedgenerator import Atom1Feed
+
+from .models import Group, Post, User
+
+
+class LatestPostsFeed(Feed):
+    title = 'Yatube: последние записи'
+    description = 'Новые записи всех авторов'
+
+    def link(self):
+        return '/'
+
+    def items(self):
+        return Post.objects.select_related('author', 'group').order_by(
+            '-pub_date'
+        )[:settings.FEEDS['SIZE']]
+
+    def item_title(self, post):
+        return truncatechars(post.text, 60)
+
+    def item_description(self, post):
+        return post.text
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.last_modified
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_author_link(self, post):
+        return post.author.get_absolute_url()
+
+
+class GroupFeed(LatestPostsFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def description(self, group):
+        return group.description
+
+    def link(self, group):
+        return group.get_absolute_url()
+
+    def items(self, group):
+        return group.posts.select_related('author').order_by(
+            '-pub_date'
+        )[:settings.FEEDS['SIZE']]
+
+
+class AuthorFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Yatube: {author.get_full_name() or author.username}'
+
+    def description(self, author):
+        return f'Записи пользователя {author.username}'
+
+    def link(self, author):
+        return author.get_absolute_url()
+
+    def items(self, author):
+        return author.posts.select_related('group').order_by(
+            '-pub_date'
+        )[:settings.FEEDS['SIZE']]
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+
+class LatestPostsAtomFeed(AtomFeedMixin, LatestPostsFeed):
+    pass
+
+
+class GroupAtomFeed(AtomFeedMixin, GroupFeed):
+    pass
+
+
+class AuthorAtomFeed(AtomFeedMixin, AuthorFeed):
+    pass
@@ -0,0 +1,98 @@
+from array import array
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Follow, FollowSuggestion
+
+CACHE_KEY = 'following:{user_id}'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class FollowingSet:
+    """Отсортированный массив id авторов, на которых подписан пользователь.
+
+    Проверка `author_id in following` - бинарный поиск без запросов к БД.
+    """
+
+    def __init__(self, author_ids=()):
+        self.ids = array('l', sorted(set(author_ids)))
+
+    def __contains__(self, author_id):
+        if hasattr(author_id, 'pk'):
+            author_id = author_id.pk
+        index = bisect_left(self.ids, author_id)
+        return index < len(self.ids) and self.ids[index] == author_id
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+
+def _store(user_id, author_ids):
+    following = FollowingSet(author_ids)
+    cache.set(
+        CACHE_KEY.format(user_id=user_id),
+        following.ids.tobytes(),
+        CACHE_TIMEOUT
+    )
+    return following
+
+
+def _load(user_id):
+    data = cache.get(CACHE_KEY.format(user_id=user_id))
+    if data is None:
+        return _store(
+            user_id,
+            Follow.objects.filter(user=user_id).values_list(
+                'author',
+                flat=True
+            )
+        )
+    following = FollowingSet()
+    following.ids.frombytes(data)
+    return following
+
+
+def get_following(user):
+    if not user.is_authenticated:
+        return FollowingSet()
+    return _load(user.pk)
+
+
+def get_request_following(request):
+    """Подписки текущего пользователя, загруженные один раз на запрос."""
+    if not hasattr(request, '_following'):
+        request._following = get_following(request.user)
+    return request._following
+
+
+def follow_changed(user_id):
+    """Сбрасывает кэш подписок после коммита; _load пересоберет его.
+
+    Правка закэшированного набора на месте теряла бы параллельные
+    изменения и переживала бы откат транзакции.
+    """
+    key = CACHE_KEY.format(user_id=user_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def get_suggestions(request, limit=5):
+    """Рекомендованные авторы одним запросом.
+
+    Таблицу заполняет фоновая задача, поэтому уже оформленные с тех пор
+    подписки отсеиваются подзапросом в том же запросе.
+    """
+    if not request.user.is_authenticated:
+        return []
+    suggestions = FollowSuggestion.objects.filter(
+        user=request.user
+    ).exclude(
+        author__in=Follow.objects.filter(
+            user=request.user
+        ).values('author')
+    ).select_related('author')[:limit]
+    return [suggestion.author for suggestion in suggestions]
@@ -0,0 +1,75 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models import F
+
+from .models import ArchivedPost, Group, GroupStats, Post
+
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_refresh():
+    """Внутри блока пересчеты групп копятся и выполняются по одному
+    на группу при выходе - для массовых операций с постами."""
+    _deferred.group_ids = set()
+    try:
+        yield
+    finally:
+        group_ids, _deferred.group_ids = _deferred.group_ids, None
+        for group_id in group_ids:
+            refresh_group_stats(group_id)
+
+
+def _last_post(posts):
+    return posts.order_by('-pub_date', '-pk').values(
+        'pk', 'pub_date'
+    ).first()
+
+
+def refresh_group_stats(group_id):
+    """Пересчитывает счетчики одной группы по индексу posts.group_id.
+
+    Архивные посты учитываются в счетчике; последним постом архивный
+    становится, только если в горячей таблице у группы постов нет.
+    """
+    pending = getattr(_deferred, 'group_ids', None)
+    if pending is not None:
+        pending.add(group_id)
+        return None
+    if group_id is None or not Group.objects.filter(pk=group_id).exists():
+        return None
+    posts = Post.objects.filter(group=group_id)
+    archived = ArchivedPost.objects.filter(group=group_id)
+    last = _last_post(posts)
+    last_post_id = last and last['pk']
+    if last is None:
+        last = _last_post(archived) or {}
+    stats, _ = GroupStats.objects.update_or_create(
+        group_id=group_id,
+        defaults={
+            'post_count': posts.count() + archived.count(),
+            'last_post_id': last_post_id,
+            'last_post_date': last.get('pub_date'),
+        }
+    )
+    return stats
+
+
+def post_added(post):
+    """Новый пост - самый свежий в группе, пересчет не нужен."""
+    updated = GroupStats.objects.filter(group=post.group_id).update(
+        post_count=F('post_count') + 1,
+        last_post=post.pk,
+        last_post_date=post.pub_date
+    )
+    if not updated:
+        refresh_group_stats(post.group_id)
+
+
+def rebuild_group_stats():
+    """Полный пересчет: после массовых update() в обход сигналов."""
+    group_ids = list(Group.objects.values_list('pk', flat=True))
+    for group_id in group_ids:
+        refresh_group_stats(group_id)
+    return len(group_ids)
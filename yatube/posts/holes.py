@@ -0,0 +1,25 @@
+from core.holepunch import register_hole
+
+from .following import get_request_following, get_suggestions
+from .forms import CommentForm
+
+
+def follow_button(request, username, author_id):
+    return {'following': author_id in get_request_following(request)}
+
+
+def comment_form(request, post_id):
+    return {'form': CommentForm()}
+
+
+def suggestions(request):
+    return {'suggestions': get_suggestions(request)}
+
+
+register_hole(
+    'follow_button', 'posts/includes/follow_button.html', follow_button
+)
+register_hole('follow_tab', 'posts/includes/follow_tab.html')
+register_hole('edit_link', 'posts/includes/edit_link.html')
+register_hole('comment_form', 'includes/comment_form.html', comment_form)
+register_hole('suggestions', 'posts/includes/suggestions.html', suggestions)
@@ -0,0 +1,34 @@
+import posixpath
+
+from core.storage import content_digest
+from core.thumbnails import delete_thumbnails
+
+from .models import ArchivedPost, ImageVariant, Post
+
+
+def image_references(name):
+    """Сколько постов, горячих и архивных, ссылаются на файл."""
+    return (
+        Post.objects.filter(image=name).count()
+        + ArchivedPost.objects.filter(image=name).count()
+    )
+
+
+def release_image(name):
+    """Удаляет файл картинки, на который больше не ссылается ни один пост.
+
+    Когда у содержимого не остается ни одного имени, удаляются и его
+    миниатюры. Файлы вне хранилища по хэшу не трогаются. Сигналы
+    вызывают ее через задачу с задержкой IMAGE_RELEASE_DELAY: storage
+    отдает загрузке уже существующее имя до того, как пост с ним
+    сохранен, и ссылки считаются, когда такие посты уже в базе.
+    """
+    digest = content_digest(name)
+    if digest is None or image_references(name):
+        return False
+    storage = Post._meta.get_field('image').storage
+    storage.delete(name)
+    if not storage.exists(posixpath.dirname(name)):
+        delete_thumbnails(digest)
+        ImageVariant.objects.filter(source=digest).delete()
+    return True
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from posts.archive import archive_posts
+from posts.tasks import archive_old_posts
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые посты с комментариями в архивные таблицы'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Возраст поста в днях (ARCHIVE["AGE_DAYS"])'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Постов в одной транзакции (ARCHIVE["CHUNK_SIZE"])'
+        )
+        parser.add_argument(
+            '--background',
+            action='store_true',
+            help='Запустить периодический перенос в очереди задач'
+        )
+
+    def progress(self, done):
+        self.stdout.write(f'posts: {done}')
+
+    def handle(self, *args, **options):
+        if options['background']:
+            archive_old_posts.delay()
+            self.stdout.write('Перенос поставлен в очередь')
+            return
+        age = None
+        if options['days'] is not None:
+            age = timedelta(days=options['days'])
+        done = archive_posts(age, options['chunk_size'], self.progress)
+        self.stdout.write(f'Перенесено постов: {done}')
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.deletion import delete_group, delete_user
+from posts.models import Group, User
+from posts.tasks import delete_group_in_chunks, delete_user_in_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет пользователя со всей историей или группу порциями, '
+        'не блокируя базу надолго'
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--user', help='username пользователя')
+        target.add_argument('--group', help='slug группы')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Строк в одной транзакции (DELETION_CHUNK_SIZE)'
+        )
+        parser.add_argument(
+            '--background',
+            action='store_true',
+            help='Поставить удаление в очередь задач'
+        )
+
+    def progress(self, step, done):
+        self.stdout.write(f'{step}: {done}')
+
+    def handle(self, *args, **options):
+        if options['user']:
+            target = User.objects.filter(username=options['user']).first()
+            delete, task = delete_user, delete_user_in_chunks
+        else:
+            target = Group.objects.filter(slug=options['group']).first()
+            delete, task = delete_group, delete_group_in_chunks
+        if target is None:
+            raise CommandError('Объект не найден')
+        if options['background']:
+            task.delay(target.pk)
+            self.stdout.write('Удаление поставлено в очередь')
+            return
+        delete(target.pk, options['chunk_size'], self.progress)
+        self.stdout.write(self.style.SUCCESS('Удалено'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import ArchivedPost, Post
+from posts.variants import generate_variants, variant_source
+
+
+class Command(BaseCommand):
+    help = (
+        'Готовит адаптивные варианты картинок для уже опубликованных постов '
+        '(новые посты получают их из фоновой задачи)'
+    )
+
+    def handle(self, *args, **options):
+        seen = set()
+        created = 0
+        for model in (Post, ArchivedPost):
+            posts = model.objects.exclude(image='').only('pk', 'image')
+            for post in posts.order_by('pk').iterator():
+                source = variant_source(post.image.name)
+                if source in seen:
+                    continue
+                seen.add(source)
+                created += generate_variants(post.image)
+        self.stdout.write(
+            f'Картинок: {len(seen)}, новых вариантов: {created}'
+        )
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from posts.groupstats import rebuild_group_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счетчики всех групп для каталога'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Пересчитано групп: {rebuild_group_stats()}')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from posts.tasks import update_follow_suggestions
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рекомендации "на кого подписаться" (для cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--background',
+            action='store_true',
+            help='Поставить пересчет в очередь задач'
+        )
+
+    def handle(self, *args, **options):
+        if options['background']:
+            update_follow_suggestions.delay()
+            self.stdout.write('Пересчет поставлен в очередь')
+            return
+        from posts.recommendations import update_suggestions
+
+        def progress(done, total):
+            self.stdout.write(f'{done}/{total} пользователей')
+
+        total = update_suggestions(progress)
+        self.stdout.write(f'Сохранено рекомендаций: {total}')
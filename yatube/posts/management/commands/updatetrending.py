@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from posts.tasks import update_trending_posts
+from posts.trending import update_trending
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг популярных постов (для cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--background',
+            action='store_true',
+            help='Запустить периодический пересчет в очереди задач'
+        )
+
+    def handle(self, *args, **options):
+        if options['background']:
+            update_trending_posts.delay()
+            self.stdout.write('Пересчет поставлен в очередь')
+            return
+        self.stdout.write(f'Пересчитано постов: {update_trending()}')
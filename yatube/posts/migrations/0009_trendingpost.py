@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-19 15:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_auto_20211225_0952'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingPost',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='posts.Post')),
+                ('score', models.FloatField(db_index=True, verbose_name='Рейтинг')),
+                ('computed', models.DateTimeField(auto_now=True, verbose_name='Пересчитан')),
+            ],
+            options={
+                'ordering': ['-score'],
+            },
+        ),
+    ]
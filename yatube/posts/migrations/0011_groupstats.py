@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-19 15:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    Post = apps.get_model('posts', 'Post')
+    for group_id in Group.objects.values_list('pk', flat=True).iterator():
+        posts = Post.objects.filter(group=group_id)
+        last = posts.order_by('-pub_date', '-pk').values(
+            'pk', 'pub_date'
+        ).first() or {}
+        GroupStats.objects.create(
+            group_id=group_id,
+            post_count=posts.count(),
+            last_post_id=last.get('pk'),
+            last_post_date=last.get('pub_date')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_followsuggestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group')),
+                ('post_count', models.PositiveIntegerField(db_index=True, default=0, verbose_name='Постов')),
+                ('last_post_date', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Последний пост')),
+                ('last_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='posts.Post')),
+            ],
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 2.2.16 on 2026-10-19 15:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0011_groupstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='edited_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата изменения'),
+        ),
+        migrations.CreateModel(
+            name='PostRevision',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='Номер версии')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата правки')),
+                ('delta', models.TextField(verbose_name='Дельта')),
+                ('is_snapshot', models.BooleanField(default=False, verbose_name='Полный текст')),
+                ('editor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='posts.Post')),
+            ],
+            options={
+                'ordering': ['post', '-number'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postrevision',
+            constraint=models.UniqueConstraint(fields=('post', 'number'), name='unique_post_revision'),
+        ),
+    ]
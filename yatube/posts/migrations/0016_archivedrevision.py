@@ -0,0 +1,35 @@
+# Generated by Django 2.2.16 on 2026-10-19 16:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0015_imagevariant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRevision',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('number', models.PositiveIntegerField(verbose_name='Номер версии')),
+                ('created', models.DateTimeField(verbose_name='Дата правки')),
+                ('delta', models.TextField(verbose_name='Дельта')),
+                ('is_snapshot', models.BooleanField(default=False, verbose_name='Полный текст')),
+                ('editor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='posts.ArchivedPost')),
+            ],
+            options={
+                'ordering': ['post', '-number'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='archivedrevision',
+            constraint=models.UniqueConstraint(fields=('post', 'number'), name='unique_archived_revision'),
+        ),
+    ]
@@ -1,7 +1,12 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from core.storage import ContentAddressedStorage
+from core.urlbuilder import build_url
+
 User = get_user_model()
+# одинаковые картинки хранятся один раз (core.storage)
+image_storage = ContentAddressedStorage()
 
 
 class Group(models.Model):
@@ -12,6 +17,9 @@ class Group(models.Model):
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return build_url('posts:group_list', self.slug)
+
 
 class Post(models.Model):
     text = models.TextField(
@@ -23,6 +31,11 @@ class Post(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    edited_at = models.DateTimeField(
+        'Дата изменения',
+        null=True,
+        blank=True
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -41,15 +54,64 @@ class Post(models.Model):
     image = models.ImageField(
         'Картинка',
         upload_to='posts/',
-        blank=True
+        blank=True,
+        max_length=255,
+        db_index=True,
+        storage=image_storage
     )
 
+    # архивные посты (ArchivedPost) только для чтения
+    is_archived = False
+
     class Meta:
         ordering = ['pub_date']
 
     def __str__(self):
         return self.text[:15]
 
+    def get_absolute_url(self):
+        return build_url('posts:post_detail', self.pk)
+
+    @property
+    def last_modified(self):
+        return self.edited_at or self.pub_date
+
+
+class PostRevision(models.Model):
+    """Прошлая версия текста поста (posts.revisions).
+
+    Хранится не текст, а обратная дельта от следующей версии, поэтому
+    таблица растет на размер правки, а не поста.
+    """
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='revisions'
+    )
+    number = models.PositiveIntegerField('Номер версии')
+    created = models.DateTimeField('Дата правки', auto_now_add=True)
+    editor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    delta = models.TextField('Дельта')
+    is_snapshot = models.BooleanField('Полный текст', default=False)
+
+    class Meta:
+        ordering = ['post', '-number']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'number'],
+                name='unique_post_revision'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.post_id}#{self.number}'
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -96,3 +158,219 @@ class Follow(models.Model):
                 name='unique_follow'
             )
         ]
+
+
+class TrendingPost(models.Model):
+    """Предрасчитанный рейтинг популярных постов (posts.trending)."""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending'
+    )
+    score = models.FloatField('Рейтинг', db_index=True)
+    computed = models.DateTimeField('Пересчитан', auto_now=True)
+
+    class Meta:
+        ordering = ['-score']
+
+    def __str__(self):
+        return f'{self.post_id}: {self.score:.3f}'
+
+
+class FollowSuggestion(models.Model):
+    """Рекомендация "на кого подписаться" (posts.recommendations)."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follow_suggestions'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    score = models.FloatField('Оценка')
+
+    class Meta:
+        ordering = ['user', '-score']
+        indexes = [
+            models.Index(fields=['user', '-score']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'],
+                name='unique_follow_suggestion'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.author_id}: {self.score:.3f}'
+
+
+class ArchivedPost(models.Model):
+    """Старый пост, перенесенный из горячей таблицы (posts.archive).
+
+    Первичный ключ совпадает с исходным, поэтому адрес поста и ключи
+    кэша карточек не меняются.
+    """
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField('Текст поста')
+    pub_date = models.DateTimeField('Дата публикации', db_index=True)
+    edited_at = models.DateTimeField(
+        'Дата изменения',
+        null=True,
+        blank=True
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+        verbose_name='Автор'
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='archived_posts',
+        verbose_name='Группа'
+    )
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        blank=True,
+        max_length=255,
+        db_index=True,
+        storage=image_storage
+    )
+    archived = models.DateTimeField('Перенесен в архив', auto_now_add=True)
+
+    is_archived = True
+
+    class Meta:
+        ordering = ['pub_date']
+
+    def __str__(self):
+        return self.text[:15]
+
+    def get_absolute_url(self):
+        return build_url('posts:post_detail', self.pk)
+
+    @property
+    def last_modified(self):
+        return self.edited_at or self.pub_date
+
+
+class ArchivedComment(models.Model):
+    """Комментарий к архивному посту."""
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments'
+    )
+    text = models.TextField('Текст комментария')
+    created = models.DateTimeField('Дата комментария')
+
+    class Meta:
+        ordering = ['created']
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedRevision(models.Model):
+    """Версия архивного поста: переносится в архив вместе с постом."""
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='revisions'
+    )
+    number = models.PositiveIntegerField('Номер версии')
+    created = models.DateTimeField('Дата правки')
+    editor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    delta = models.TextField('Дельта')
+    is_snapshot = models.BooleanField('Полный текст', default=False)
+
+    class Meta:
+        ordering = ['post', '-number']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'number'],
+                name='unique_archived_revision'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.post_id}#{self.number}'
+
+
+class ImageVariant(models.Model):
+    """Готовая миниатюра картинки поста одной ширины и формата
+    (posts.variants)."""
+    # хэш содержимого для картинок в core.storage, иначе имя файла
+    source = models.CharField('Исходник', max_length=255)
+    format = models.CharField('Формат', max_length=10)
+    width = models.PositiveIntegerField('Ширина')
+    height = models.PositiveIntegerField('Высота')
+    name = models.CharField('Файл', max_length=255)
+
+    class Meta:
+        ordering = ['source', 'format', 'width']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'format', 'width'],
+                name='unique_image_variant'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.source}: {self.format} {self.width}w'
+
+
+class GroupStats(models.Model):
+    """Счетчики группы для каталога (posts.groupstats).
+
+    Обновляются при создании, правке и удалении постов, поэтому каталог
+    сортируется без агрегации по таблице постов.
+    """
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    post_count = models.PositiveIntegerField(
+        'Постов',
+        default=0,
+        db_index=True
+    )
+    last_post = models.ForeignKey(
+        Post,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    last_post_date = models.DateTimeField(
+        'Последний пост',
+        null=True,
+        blank=True,
+        db_index=True
+    )
+
+    def __str__(self):
+        return f'{self.group_id}: {self.post_count}'
@@ -0,0 +1,119 @@
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from scipy import sparse
+
+from .models import Follow, FollowSuggestion
+
+FETCH_SIZE = 100000
+
+
+def load_follow_graph():
+    """Читает ребра user -> author в массивы без создания моделей.
+
+    Возвращает (ids, матрица смежности CSR в индексах ids).
+    """
+    user_column = Follow._meta.get_field('user').column
+    author_column = Follow._meta.get_field('author').column
+    chunks = []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {user_column}, {author_column} '
+            f'FROM {Follow._meta.db_table}'
+        )
+        rows = cursor.fetchmany(FETCH_SIZE)
+        while rows:
+            chunks.append(np.array(rows, dtype=np.int64))
+            rows = cursor.fetchmany(FETCH_SIZE)
+    if not chunks:
+        return np.array([], dtype=np.int64), sparse.csr_matrix((0, 0))
+    edges = np.concatenate(chunks)
+    ids, index = np.unique(edges, return_inverse=True)
+    index = index.reshape(edges.shape)
+    adjacency = sparse.csr_matrix(
+        (np.ones(len(edges), dtype=np.float32), (index[:, 0], index[:, 1])),
+        shape=(len(ids), len(ids))
+    )
+    adjacency.sum_duplicates()
+    adjacency.data[:] = 1
+    return ids, adjacency
+
+
+def cofollow_similarity(adjacency, max_degree):
+    """Косинусная близость авторов по общим подписчикам.
+
+    Подписчики с числом подписок больше max_degree не учитываются:
+    они дают квадратичное число пар и почти не несут сигнала.
+    """
+    out_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    keep = sparse.diags((out_degree <= max_degree).astype(np.float32))
+    filtered = keep @ adjacency
+    cooccurrence = (filtered.T @ filtered).tocsr()
+    cooccurrence.setdiag(0)
+    cooccurrence.eliminate_zeros()
+    followers = np.asarray(filtered.sum(axis=0)).ravel()
+    norm = np.sqrt(np.maximum(followers, 1)).astype(np.float32)
+    inverse = sparse.diags(1 / norm)
+    return (inverse @ cooccurrence @ inverse).tocsr()
+
+
+def top_k(scores, followed, k):
+    """Для каждой строки scores - k лучших столбцов, кроме followed."""
+    scores = scores.tocsr()
+    scores = scores - scores.multiply(followed)
+    scores.eliminate_zeros()
+    for row in range(scores.shape[0]):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        columns = scores.indices[start:end]
+        values = scores.data[start:end]
+        if len(values) > k:
+            best = np.argpartition(-values, k)[:k]
+            columns, values = columns[best], values[best]
+        order = np.argsort(-values)
+        yield row, columns[order], values[order]
+
+
+def update_suggestions(progress=None):
+    """Считает top-K рекомендаций для всех подписчиков блоками
+    пользователей и перезаписывает FollowSuggestion этих блоков."""
+    options = settings.RECOMMENDATIONS
+    ids, adjacency = load_follow_graph()
+    if not len(ids):
+        FollowSuggestion.objects.all().delete()
+        return 0
+    similarity = cofollow_similarity(adjacency, options['MAX_DEGREE'])
+    identity = sparse.identity(len(ids), dtype=np.float32, format='csr')
+    users = np.flatnonzero(np.diff(adjacency.indptr))
+    total = 0
+    for start in range(0, len(users), options['BLOCK_SIZE']):
+        block = users[start:start + options['BLOCK_SIZE']]
+        follows = adjacency[block]
+        scores = (
+            options['FOF_WEIGHT'] * (follows @ adjacency)
+            + options['COFOLLOW_WEIGHT'] * (follows @ similarity)
+        )
+        # уже подписан или это сам пользователь
+        followed = follows + identity[block]
+        rows = []
+        for row, columns, values in top_k(scores, followed, options['TOP_K']):
+            rows.extend(
+                FollowSuggestion(
+                    user_id=int(ids[block[row]]),
+                    author_id=int(ids[column]),
+                    score=float(value)
+                )
+                for column, value in zip(columns, values)
+            )
+        with transaction.atomic():
+            FollowSuggestion.objects.filter(
+                user__in=ids[block].tolist()
+            ).delete()
+            FollowSuggestion.objects.bulk_create(rows, batch_size=1000)
+        total += len(rows)
+        if progress is not None:
+            progress(start + len(block), len(users))
+    # у тех, кто отписался от всех, старые рекомендации больше не нужны
+    FollowSuggestion.objects.exclude(
+        user__in=Follow.objects.values('user')
+    ).delete()
+    return total
@@ -0,0 +1,99 @@
+import json
+import re
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Post, PostRevision
+
+# слово вместе с пробелами перед ним: ''.join(токены) дает исходный текст
+TOKEN_RE = re.compile(r'\s*\S+|\s+')
+
+
+def _dump(ops):
+    return json.dumps(ops, ensure_ascii=False, separators=(',', ':'))
+
+
+def make_delta(new, old):
+    """Дельта, из которой old восстанавливается по new.
+
+    Совпадающие куски записываются отрезком [начало, конец] в new,
+    остальное - строкой, поэтому размер дельты зависит от правки.
+    """
+    new_tokens = TOKEN_RE.findall(new)
+    old_tokens = TOKEN_RE.findall(old)
+    offsets = [0]
+    for token in new_tokens:
+        offsets.append(offsets[-1] + len(token))
+    ops = []
+    matcher = SequenceMatcher(None, new_tokens, old_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([offsets[i1], offsets[i2]])
+        elif j1 < j2:
+            ops.append(''.join(old_tokens[j1:j2]))
+    return _dump(ops)
+
+
+def apply_delta(new, delta):
+    return ''.join(
+        op if isinstance(op, str) else new[op[0]:op[1]]
+        for op in json.loads(delta)
+    )
+
+
+def record_edit(post, editor=None):
+    """Ставит edited_at и сохраняет версию текста до правки.
+
+    Вызывается перед post.save() в той же транзакции для любой правки:
+    смена картинки или группы тоже меняет edited_at. Строка поста
+    блокируется (select_for_update), и текст до правки читается уже под
+    блокировкой, поэтому параллельные правки не получат один номер
+    версии. Если текст не изменился, версия не создается - возвращает
+    None.
+    """
+    post.edited_at = timezone.now()
+    with transaction.atomic():
+        old_text = Post.objects.select_for_update().values_list(
+            'text', flat=True
+        ).get(pk=post.pk)
+        if post.text == old_text:
+            return None
+        return _create_revision(post, old_text, editor)
+
+
+def _create_revision(post, old_text, editor):
+    number = post.revisions.values_list('number', flat=True).first() or 0
+    number += 1
+    is_snapshot = number % settings.REVISIONS['SNAPSHOT_EVERY'] == 0
+    return PostRevision.objects.create(
+        post=post,
+        number=number,
+        editor=editor,
+        delta=_dump([old_text]) if is_snapshot else make_delta(
+            post.text, old_text
+        ),
+        is_snapshot=is_snapshot
+    )
+
+
+def text_at(post, number):
+    """Текст поста в версии number (1 - исходный).
+
+    Дельты применяются от текущего текста или от ближайшего более
+    нового снимка, так что читаются только нужные ревизии.
+    """
+    revisions = post.revisions.filter(number__gte=number)
+    snapshot = revisions.filter(is_snapshot=True).order_by(
+        'number'
+    ).values_list('number', flat=True).first()
+    if snapshot is not None:
+        revisions = revisions.filter(number__lte=snapshot)
+    text = post.text
+    for delta in revisions.order_by('-number').values_list(
+        'delta', flat=True
+    ).iterator():
+        text = apply_delta(text, delta)
+    return text
@@ -0,0 +1,84 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.holepunch import invalidate as invalidate_shared_pages
+
+from .following import follow_changed
+from .groupstats import post_added, refresh_group_stats
+from .models import ArchivedPost, Comment, Follow, Group, Post
+from .tasks import release_post_image
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=ArchivedPost)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def shared_content_changed(sender, **kwargs):
+    # общие страницы (core.holepunch) показывают посты, комментарии,
+    # группы и число подписчиков
+    invalidate_shared_pages()
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, **kwargs):
+    if created:
+        follow_changed(instance.user_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    follow_changed(instance.user_id)
+
+
+@receiver(pre_save, sender=Post)
+def post_saving(sender, instance, **kwargs):
+    # группа и картинка до правки: пост мог переехать в другую группу,
+    # а старая картинка - остаться без ссылок
+    instance._old_group_id = instance._old_image = None
+    if instance.pk is not None:
+        instance._old_group_id, instance._old_image = Post.objects.filter(
+            pk=instance.pk
+        ).values_list('group', 'image').first() or (None, None)
+
+
+def _release_on_commit(name):
+    # файл удаляется только после коммита: откат не должен терять картинку
+    transaction.on_commit(partial(
+        release_post_image.enqueue_in, settings.IMAGE_RELEASE_DELAY, name
+    ))
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    old_group_id = getattr(instance, '_old_group_id', None)
+    old_image = getattr(instance, '_old_image', None)
+    if old_image and old_image != instance.image.name:
+        _release_on_commit(old_image)
+    if created:
+        if instance.group_id is not None:
+            post_added(instance)
+    elif old_group_id != instance.group_id:
+        refresh_group_stats(old_group_id)
+        refresh_group_stats(instance.group_id)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    refresh_group_stats(instance.group_id)
+    if instance.image:
+        _release_on_commit(instance.image.name)
+
+
+@receiver(post_delete, sender=ArchivedPost)
+def archived_post_deleted(sender, instance, **kwargs):
+    if instance.image:
+        _release_on_commit(instance.image.name)
@@ -0,0 +1,170 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap
+from django.db.models import DateTimeField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .archive import with_archive
+from .models import ArchivedPost, Group, Post, User
+
+MONTH_PREFIX = 'posts-'
+MONTH_FORMAT = '%Y-%m'
+
+
+def _next_month(month):
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def _month_start(moment):
+    moment = timezone.localtime(moment)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+class PostMonthSitemap(Sitemap):
+    """Посты одного месяца: прошлые месяцы почти не меняются, поэтому
+    поисковик перечитывает в основном текущий."""
+    limit = settings.SITEMAPS['LIMIT']
+
+    def __init__(self, month):
+        self.start = month
+        self.end = _next_month(month)
+
+    def posts(self):
+        """Горячие и архивные посты месяца."""
+        return [
+            model.objects.filter(
+                pub_date__gte=self.start,
+                pub_date__lt=self.end
+            ).order_by('pk').only('pk', 'pub_date', 'edited_at')
+            for model in (Post, ArchivedPost)
+        ]
+
+    def items(self):
+        return with_archive(*self.posts())
+
+    def lastmod(self, post):
+        return post.last_modified
+
+    def last_modified(self):
+        dates = [
+            posts.aggregate(
+                last=Max(Coalesce('edited_at', 'pub_date'))
+            )['last']
+            for posts in self.posts()
+        ]
+        return max(filter(None, dates), default=None)
+
+
+class GroupSitemap(Sitemap):
+    limit = settings.SITEMAPS['LIMIT']
+
+    def items(self):
+        return Group.objects.select_related('stats').order_by('pk')
+
+    def lastmod(self, group):
+        stats = getattr(group, 'stats', None)
+        return stats.last_post_date if stats else None
+
+    def last_modified(self):
+        return Group.objects.aggregate(
+            last=Max('stats__last_post_date')
+        )['last']
+
+
+def _last_post(model):
+    """Дата последнего поста или правки автора, подзапросом."""
+    return Subquery(
+        model.objects.filter(author=OuterRef('pk')).values('author').annotate(
+            last=Max(Coalesce('edited_at', 'pub_date'))
+        ).values('last'),
+        output_field=DateTimeField()
+    )
+
+
+class AuthorSitemap(Sitemap):
+    """Профили: страница меняется с новым постом автора или его правкой,
+    у авторов без постов - дата регистрации."""
+    limit = settings.SITEMAPS['LIMIT']
+
+    def items(self):
+        return User.objects.filter(is_active=True).order_by('pk').only(
+            'pk', 'username', 'date_joined'
+        ).annotate(
+            last_post=_last_post(Post),
+            last_archived_post=_last_post(ArchivedPost)
+        )
+
+    def lastmod(self, user):
+        return max(filter(None, (
+            user.last_post, user.last_archived_post, user.date_joined
+        )))
+
+    def last_modified(self):
+        dates = [
+            model.objects.aggregate(
+                last=Max(Coalesce('edited_at', 'pub_date'))
+            )['last']
+            for model in (Post, ArchivedPost)
+        ]
+        dates.append(User.objects.filter(is_active=True).aggregate(
+            last=Max('date_joined')
+        )['last'])
+        return max(filter(None, dates), default=None)
+
+
+def post_months():
+    """Месяцы от первого до последнего поста: выборки по индексам
+    pub_date архива и горячей таблицы вместо группировки."""
+    dates = [
+        model.objects.order_by('pub_date').values_list('pub_date', flat=True)
+        for model in (ArchivedPost, Post)
+    ]
+    first = dates[0].first() or dates[1].first()
+    last = dates[1].last() or dates[0].last()
+    if first is None:
+        return []
+    months = [_month_start(first)]
+    while _next_month(months[-1]) <= last:
+        months.append(_next_month(months[-1]))
+    return months
+
+
+def _parse_month(section):
+    if not section.startswith(MONTH_PREFIX):
+        return None
+    try:
+        month = datetime.strptime(section[len(MONTH_PREFIX):], MONTH_FORMAT)
+    except ValueError:
+        return None
+    return timezone.make_aware(month)
+
+
+def get_sitemaps():
+    sitemaps = {'groups': GroupSitemap(), 'authors': AuthorSitemap()}
+    for month in post_months():
+        section = MONTH_PREFIX + month.strftime(MONTH_FORMAT)
+        sitemaps[section] = PostMonthSitemap(month)
+    return sitemaps
+
+
+def get_sitemap(section):
+    """Один раздел без перебора месяцев; None, если такого нет."""
+    if section == 'groups':
+        return GroupSitemap()
+    if section == 'authors':
+        return AuthorSitemap()
+    month = _parse_month(section)
+    return PostMonthSitemap(month) if month else None
+
+
+def is_closed_section(section):
+    """Прошедший месяц: такой раздел можно кэшировать надолго."""
+    month = _parse_month(section)
+    now = timezone.localtime()
+    return month is not None and (month.year, month.month) < (
+        now.year, now.month
+    )
@@ -0,0 +1,71 @@
+from django.conf import settings
+
+from tasks.models import Task
+from tasks.registry import task
+
+from .archive import archive_posts
+from .deletion import delete_group, delete_user
+from .images import release_image
+from .models import Post
+from .trending import update_trending
+from .variants import generate_variants
+
+
+@task()
+def warm_post_thumbnail(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None:
+        generate_variants(post.image)
+
+
+@task()
+def release_post_image(name):
+    release_image(name)
+
+
+@task(max_attempts=5)
+def delete_user_in_chunks(user_id):
+    delete_user(user_id)
+
+
+@task(max_attempts=5)
+def delete_group_in_chunks(group_id):
+    delete_group(group_id)
+
+
+@task()
+def update_trending_posts(reschedule=True):
+    """Периодическая задача: после пересчета ставит в очередь следующий.
+
+    Следующий пересчет ставится и после ошибки, иначе цепочка
+    оборвалась бы до ручного перезапуска.
+    """
+    try:
+        update_trending()
+    finally:
+        if reschedule and not Task.objects.filter(
+            name=update_trending_posts.task_name,
+            status=Task.QUEUED
+        ).exists():
+            update_trending_posts.enqueue_in(settings.TRENDING['INTERVAL'])
+
+
+@task()
+def update_follow_suggestions():
+    # scipy нужен только воркеру, веб-процессы его не загружают
+    from .recommendations import update_suggestions
+    update_suggestions()
+
+
+@task()
+def archive_old_posts(reschedule=True):
+    """Периодический перенос старых постов в архив; следующий запуск
+    ставится и после ошибки."""
+    try:
+        archive_posts()
+    finally:
+        if reschedule and not Task.objects.filter(
+            name=archive_old_posts.task_name,
+            status=Task.QUEUED
+        ).exists():
+            archive_old_posts.enqueue_in(settings.ARCHIVE['INTERVAL'])
@@ -0,0 +1,12 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from posts.cards import render_cards
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def post_cards(context, posts):
+    """Готовый HTML карточек: {% post_cards page_obj as cards %}."""
+    return [mark_safe(card) for card in render_cards(posts, context)]
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class AdminChangelistTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test1',
+            description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def add_rows(self, count):
+        for _ in range(count):
+            post = Post.objects.create(
+                text='Текст', author=self.user, group=self.group
+            )
+            Comment.objects.create(post=post, author=self.user, text='Текст')
+            # подписки разных пользователей на разных авторов
+            number = Follow.objects.count()
+            Follow.objects.create(
+                user=User.objects.create_user(username=f'Reader{number}'),
+                author=User.objects.create_user(username=f'Writer{number}')
+            )
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelists_have_no_n_plus_one(self):
+        for model in ('post', 'comment', 'follow'):
+            with self.subTest(model=model):
+                url = reverse(f'admin:posts_{model}_changelist')
+                self.add_rows(2)
+                few = self.count_queries(url)
+                self.add_rows(8)
+                self.assertEqual(self.count_queries(url), few)
+
+    def test_username_filter(self):
+        another = User.objects.create_user(username='Another')
+        Follow.objects.create(user=self.user, author=another)
+        Follow.objects.create(user=another, author=self.user)
+        response = self.admin_client.get(
+            reverse('admin:posts_follow_changelist'),
+            {'user__username': self.user.username}
+        )
+        self.assertEqual(response.context['cl'].result_count, 1)
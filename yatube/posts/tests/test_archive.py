@@ -0,0 +1,174 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.archive import archive_posts
+from posts.models import (
+    ArchivedComment, ArchivedPost, ArchivedRevision, Comment, Group,
+    GroupStats, Post, PostRevision, User
+)
+from posts.revisions import record_edit
+from posts.tasks import archive_old_posts
+from tasks.models import Task
+
+
+class ArchiveTests(TestCase):
+    # в архив уходят шесть самых старых постов из пятнадцати
+    age = timedelta(days=24, hours=12)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Author')
+        cls.reader = User.objects.create_user(username='Reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='-'
+        )
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.posts = []
+        for number in range(15):
+            post = Post.objects.create(
+                text=f'Пост {number}', author=self.author, group=self.group
+            )
+            post.pub_date = now - timedelta(days=30 - number)
+            post.save()
+            self.posts.append(post)
+        Comment.objects.create(
+            post=self.posts[0], author=self.reader, text='Старый комментарий'
+        )
+
+    def test_old_posts_are_moved_with_comments(self):
+        moved = archive_posts(self.age, chunk_size=4)
+        self.assertEqual(moved, 6)
+        self.assertEqual(Post.objects.count(), 9)
+        self.assertEqual(
+            sorted(ArchivedPost.objects.values_list('pk', flat=True)),
+            [post.pk for post in self.posts[:6]]
+        )
+        comment = ArchivedComment.objects.get()
+        self.assertEqual(comment.post_id, self.posts[0].pk)
+        self.assertFalse(Comment.objects.exists())
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 15)
+        self.assertEqual(stats.last_post_id, self.posts[-1].pk)
+        self.assertEqual(archive_posts(self.age), 0)
+
+    def test_pages_include_archive(self):
+        archive_posts(self.age)
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[self.group.slug]),
+            reverse('posts:profile', args=[self.author.username]),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                second = self.client.get(url, {'page': 2})
+                self.assertEqual(first.context['page_obj'].paginator.count, 15)
+                posts = (
+                    list(first.context['page_obj'])
+                    + list(second.context['page_obj'])
+                )
+                self.assertEqual(
+                    [post.pk for post in posts],
+                    [post.pk for post in reversed(self.posts)]
+                )
+                # ленты идут от новых к старым: архив - в конце
+                self.assertIsInstance(posts[0], Post)
+                self.assertIsInstance(posts[-1], ArchivedPost)
+
+    def test_first_page_does_not_read_archive(self):
+        archive_posts(self.age)
+        Post.objects.bulk_create(
+            Post(text='Свежий пост', author=self.author) for _ in range(10)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:index'))
+        self.assertTrue(all(
+            isinstance(post, Post) for post in response.context['page_obj']
+        ))
+        self.assertFalse(any(
+            'posts_archivedpost' in query['sql']
+            and 'COUNT' not in query['sql']
+            for query in queries.captured_queries
+        ))
+
+    def test_archive_count_is_cached(self):
+        archive_posts(self.age)
+        url = reverse('posts:index')
+        self.client.get(url)
+        ArchivedPost.objects.filter(pk=self.posts[0].pk).delete()
+        response = self.client.get(url)
+        self.assertEqual(response.context['page_obj'].paginator.count, 15)
+        cache.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.context['page_obj'].paginator.count, 14)
+
+    def test_failed_run_is_rescheduled(self):
+        with mock.patch(
+            'posts.tasks.archive_posts', side_effect=ValueError('boom')
+        ):
+            with self.assertRaises(ValueError):
+                archive_old_posts()
+        self.assertTrue(Task.objects.filter(
+            name=archive_old_posts.task_name, status=Task.QUEUED
+        ).exists())
+
+    def test_archived_post_detail_is_read_only(self):
+        archive_posts(self.age)
+        post = self.posts[0]
+        self.client.force_login(self.author)
+        response = self.client.get(
+            reverse('posts:post_detail', args=[post.pk])
+        )
+        self.assertEqual(response.context['user_posts_count'], 15)
+        self.assertContains(response, 'Старый комментарий')
+        self.assertNotContains(
+            response, reverse('posts:post_edit', args=[post.pk])
+        )
+        response = self.client.get(reverse('posts:post_detail', args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_archived_post_keeps_history(self):
+        post = self.posts[0]
+        post.text = 'Исправленный старый пост'
+        record_edit(post, self.author)
+        post.save()
+        archive_posts(self.age)
+        self.assertFalse(PostRevision.objects.exists())
+        revision = ArchivedRevision.objects.get()
+        self.assertEqual(revision.editor, self.author)
+        response = self.client.get(
+            reverse('posts:post_history', args=[post.pk])
+        )
+        self.assertContains(
+            response, reverse('posts:post_revision', args=[post.pk, 1])
+        )
+        response = self.client.get(
+            reverse('posts:post_revision', args=[post.pk, 1])
+        )
+        self.assertEqual(response.context['text'], 'Пост 0')
+
+    def test_sitemap_lists_archived_posts(self):
+        archive_posts(self.age)
+        post = self.posts[0]
+        section = 'posts-' + timezone.localtime(post.pub_date).strftime(
+            '%Y-%m'
+        )
+        self.assertContains(
+            self.client.get(reverse('posts:sitemap')),
+            reverse('posts:sitemap_section', args=[section])
+        )
+        response = self.client.get(
+            reverse('posts:sitemap_section', args=[section])
+        )
+        self.assertContains(response, post.get_absolute_url())
@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+
+
+class PostCardsCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='-'
+        )
+        cls.post = Post.objects.create(
+            text='Исходный текст', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cards_are_rendered_once(self):
+        url = reverse('posts:group_list', args=[self.group.slug])
+        self.assertTemplateUsed(self.client.get(url), CARD_TEMPLATE)
+        response = self.client.get(url)
+        self.assertTemplateNotUsed(response, CARD_TEMPLATE)
+        self.assertContains(response, 'Исходный текст')
+
+    def test_card_changes_with_post_and_author(self):
+        url = reverse('posts:group_list', args=[self.group.slug])
+        self.client.get(url)
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
+        self.assertContains(self.client.get(url), 'Новый текст')
+        User.objects.filter(pk=self.author.pk).update(first_name='Лев')
+        self.assertContains(self.client.get(url), 'Автор: Лев')
@@ -0,0 +1,108 @@
+import json
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.deletion import delete_group, delete_user
+from posts.groupstats import refresh_group_stats
+from posts.models import (
+    Comment, Follow, FollowSuggestion, Group, GroupStats, Post, PostRevision,
+    TrendingPost, User
+)
+from posts.tasks import delete_group_in_chunks
+from tasks.models import Task
+from tasks.worker import claim, run_task
+from users.backends import CachedModelBackend
+
+
+class ChunkedDeletionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Prolific')
+        cls.reader = User.objects.create_user(username='Reader')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test1',
+            description='Описание'
+        )
+        cls.reader_post = Post.objects.create(
+            text='Пост читателя', author=cls.reader, group=cls.group
+        )
+        for i in range(7):
+            post = Post.objects.create(
+                text=f'Пост {i}', author=cls.author, group=cls.group
+            )
+            Comment.objects.create(post=post, author=cls.reader, text='К')
+            Comment.objects.create(
+                post=cls.reader_post, author=cls.author, text='К'
+            )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        Follow.objects.create(user=cls.author, author=cls.reader)
+        FollowSuggestion.objects.create(
+            user=cls.reader, author=cls.author, score=1
+        )
+        TrendingPost.objects.create(post=post, score=1)
+        PostRevision.objects.create(post=post, number=1, delta='')
+        PostRevision.objects.create(
+            post=cls.reader_post, number=1, editor=cls.author, delta=''
+        )
+
+    def test_delete_user_in_chunks(self):
+        # снимок сессии не должен пережить деактивацию
+        CachedModelBackend().get_user(self.author.pk)
+        steps = []
+        sessions = []
+
+        def progress(step, done):
+            steps.append((step, done))
+            sessions.append(CachedModelBackend().get_user(self.author.pk))
+
+        # счетчики группы пересчитываются один раз, а не на каждую порцию
+        with mock.patch(
+            'posts.groupstats.refresh_group_stats', wraps=refresh_group_stats
+        ) as refresh:
+            delete_user(self.author.pk, chunk_size=3, progress=progress)
+        refresh.assert_called_once_with(self.group.pk)
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+        self.assertFalse(Post.objects.filter(author=self.author.pk).exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertFalse(FollowSuggestion.objects.exists())
+        self.assertFalse(TrendingPost.objects.exists())
+        self.assertEqual(
+            list(PostRevision.objects.values_list('post', 'editor')),
+            [(self.reader_post.pk, None)]
+        )
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).post_count, 1
+        )
+        self.assertTrue(Post.objects.filter(pk=self.reader_post.pk).exists())
+        self.assertIn(('posts', 3), steps)
+        self.assertIn(('posts', 7), steps)
+        self.assertEqual(set(sessions), {None})
+
+    def test_admin_delete_goes_through_delete_user(self):
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin)
+        address = reverse('admin:auth_user_delete', args=[self.author.pk])
+        with mock.patch('users.admin.delete_user') as delete:
+            self.assertEqual(self.client.get(address).status_code, 200)
+            self.client.post(address, {'post': 'yes'})
+        delete.assert_called_once_with(self.author.pk)
+
+    def test_delete_group_in_chunks(self):
+        delete_group(self.group.pk, chunk_size=3)
+        self.assertFalse(Group.objects.filter(pk=self.group.pk).exists())
+        self.assertEqual(Post.objects.filter(group__isnull=True).count(), 8)
+
+    @override_settings(DELETION_CHUNK_SIZE=3)
+    def test_background_progress_is_stored_on_task(self):
+        queued = delete_group_in_chunks.delay(self.group.pk)
+        for pk in claim(10):
+            run_task(pk)
+        progress = json.loads(Task.objects.get(pk=queued.pk).progress)
+        self.assertEqual(progress, {'posts': 8, 'group': 1})
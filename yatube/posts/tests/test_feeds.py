@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+class FeedsAndSitemapsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            text='Текст для ленты', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds(self):
+        urls = (
+            reverse('posts:feed'),
+            reverse('posts:feed_atom'),
+            reverse('posts:group_feed', args=[self.group.slug]),
+            reverse('posts:group_feed_atom', args=[self.group.slug]),
+            reverse('posts:author_feed', args=[self.author.username]),
+            reverse('posts:author_feed_atom', args=[self.author.username]),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Текст для ленты')
+                self.assertContains(response, self.post.get_absolute_url())
+        response = self.client.get(reverse('posts:group_feed', args=['no']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_conditional_get(self):
+        url = reverse('posts:feed')
+        response = self.client.get(url)
+        self.assertTrue(response.has_header('Last-Modified'))
+        not_modified = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        not_modified = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_sitemap_is_split_by_month(self):
+        section = 'posts-' + self.post.pub_date.strftime('%Y-%m')
+        index = self.client.get(reverse('posts:sitemap'))
+        for name in (section, 'groups', 'authors'):
+            self.assertContains(
+                index, reverse('posts:sitemap_section', args=[name])
+            )
+        response = self.client.get(
+            reverse('posts:sitemap_section', args=[section])
+        )
+        self.assertContains(response, self.post.get_absolute_url())
+        self.assertNotContains(
+            self.client.get(
+                reverse('posts:sitemap_section', args=['posts-1999-01'])
+            ),
+            self.post.get_absolute_url()
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse('posts:sitemap_section', args=['unknown'])
+            ).status_code,
+            404
+        )
+
+    @override_settings(ALLOWED_HOSTS=['one.example', 'two.example'])
+    def test_sitemap_cache_is_per_host(self):
+        url = reverse('posts:sitemap')
+        response = self.client.get(url, HTTP_HOST='one.example')
+        self.assertContains(response, 'http://one.example/')
+        response = self.client.get(
+            url, {'utm_source': 'bot'}, HTTP_HOST='two.example'
+        )
+        self.assertContains(response, 'http://two.example/')
+        self.assertNotContains(response, 'one.example')
+
+    def test_authors_have_lastmod(self):
+        response = self.client.get(
+            reverse('posts:sitemap_section', args=['authors'])
+        )
+        self.assertContains(
+            response,
+            f'<lastmod>{self.post.pub_date.date().isoformat()}</lastmod>'
+        )
+
+    def test_robots_txt_points_to_sitemap(self):
+        response = self.client.get('/robots.txt')
+        self.assertContains(response, 'Disallow: /*?page=')
+        self.assertContains(response, reverse('posts:sitemap'))
@@ -0,0 +1,60 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, GroupStats, Post, User
+
+
+class GroupStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Author')
+        cls.quiet = Group.objects.create(
+            title='Тихая', slug='quiet', description='-'
+        )
+        cls.busy = Group.objects.create(
+            title='Активная', slug='busy', description='-'
+        )
+        cls.empty = Group.objects.create(
+            title='Пустая', slug='empty', description='-'
+        )
+
+    def create_post(self, group):
+        return Post.objects.create(text='Пост', author=self.user, group=group)
+
+    def test_create_edit_delete_update_stats(self):
+        first = self.create_post(self.busy)
+        second = self.create_post(self.busy)
+        stats = GroupStats.objects.get(group=self.busy)
+        self.assertEqual(stats.post_count, 2)
+        self.assertEqual(stats.last_post_id, second.pk)
+
+        second.group = self.quiet
+        second.save()
+        self.assertEqual(
+            GroupStats.objects.get(group=self.busy).last_post_id, first.pk
+        )
+        self.assertEqual(
+            GroupStats.objects.get(group=self.quiet).post_count, 1
+        )
+
+        first.delete()
+        stats = GroupStats.objects.get(group=self.busy)
+        self.assertEqual(stats.post_count, 0)
+        self.assertIsNone(stats.last_post_date)
+
+    def test_directory_sorting_without_aggregation(self):
+        self.create_post(self.quiet)
+        self.create_post(self.busy)
+        self.create_post(self.busy)
+        url = reverse('posts:group_index')
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+            groups = list(response.context['page_obj'])
+        self.assertEqual(groups, [self.busy, self.quiet, self.empty])
+        response = self.client.get(url, {'sort': 'title'})
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.busy, self.empty, self.quiet]
+        )
+        self.assertTemplateUsed(response, 'posts/groups.html')
@@ -0,0 +1,184 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from sorl.thumbnail import get_thumbnail
+
+from core.storage import content_digest
+from core.thumbnails import thumbnail_directory
+from posts.models import ImageVariant, Post, User
+from posts.variants import THUMBNAIL_OPTIONS, generate_variants
+from tasks.worker import claim, run_task
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+def upload(name, content=SMALL_GIF):
+    return SimpleUploadedFile(name, content, content_type='image/gif')
+
+
+def run_tasks():
+    for pk in claim(100):
+        run_task(pk)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, IMAGE_RELEASE_DELAY=0)
+class ContentAddressedImagesTests(TransactionTestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='Author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def create_post(self, image):
+        return Post.objects.create(text='Мем', author=self.author, image=image)
+
+    def test_identical_uploads_are_stored_once(self):
+        first = self.create_post(upload('meme.gif'))
+        again = self.create_post(upload('meme.gif'))
+        renamed = self.create_post(upload('copy.gif'))
+        other = self.create_post(upload('other.gif', SMALL_GIF + b'\x00'))
+        digest = content_digest(first.image.name)
+        self.assertTrue(first.image.name.startswith(f'posts/{digest[:2]}/'))
+        self.assertTrue(first.image.name.endswith('/meme.gif'))
+        self.assertEqual(again.image.name, first.image.name)
+        self.assertEqual(content_digest(renamed.image.name), digest)
+        self.assertEqual(
+            os.stat(first.image.path).st_ino,
+            os.stat(renamed.image.path).st_ino
+        )
+        self.assertNotEqual(content_digest(other.image.name), digest)
+
+        thumbnails = {
+            get_thumbnail(
+                post.image, '960x339', **THUMBNAIL_OPTIONS
+            ).name
+            for post in (first, renamed)
+        }
+        self.assertEqual(len(thumbnails), 1)
+        self.assertTrue(
+            thumbnails.pop().startswith(thumbnail_directory(digest))
+        )
+
+    def test_files_are_deleted_with_last_reference(self):
+        first = self.create_post(upload('meme.gif'))
+        second = self.create_post(upload('meme.gif'))
+        renamed = self.create_post(upload('copy.gif'))
+        digest = content_digest(first.image.name)
+        thumbnail = get_thumbnail(
+            first.image, '960x339', **THUMBNAIL_OPTIONS
+        )
+        first.delete()
+        run_tasks()
+        self.assertTrue(os.path.exists(second.image.path))
+        second.delete()
+        run_tasks()
+        self.assertFalse(os.path.exists(second.image.path))
+        self.assertTrue(thumbnail.exists())
+
+        renamed.image = upload('new.gif', SMALL_GIF + b'\x00')
+        renamed.save()
+        run_tasks()
+        self.assertFalse(os.path.exists(
+            os.path.dirname(first.image.path)
+        ))
+        self.assertFalse(thumbnail.exists())
+        self.assertNotEqual(content_digest(renamed.image.name), digest)
+
+    def test_plain_names_are_left_alone(self):
+        with tempfile.NamedTemporaryFile(suffix='.gif') as legacy:
+            self.create_post(legacy.name).delete()
+            run_tasks()
+            self.assertTrue(os.path.exists(legacy.name))
+
+    def test_upload_racing_release_keeps_file(self):
+        first = self.create_post(upload('meme.gif'))
+        storage = Post._meta.get_field('image').storage
+        # загрузка получила имя существующего файла, но пост еще не сохранен
+        name = storage.save('posts/meme.gif', upload('meme.gif'))
+        self.assertEqual(name, first.image.name)
+        first.delete()
+        again = self.create_post(name)
+        run_tasks()
+        self.assertTrue(os.path.exists(again.image.path))
+
+
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT,
+    IMAGE_RELEASE_DELAY=0,
+    IMAGE_VARIANTS=dict(
+        settings.IMAGE_VARIANTS, WIDTHS=(480, 960), FORMATS=('AVIF', 'JPEG')
+    )
+)
+class ImageVariantsTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='Author')
+        self.post = Post.objects.create(
+            text='Мем', author=self.author, image=upload('meme.gif')
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_variants_are_precomputed_once(self):
+        # форматы, которые Pillow не умеет сохранять, пропускаются
+        self.assertEqual(generate_variants(self.post.image), 2)
+        self.assertEqual(generate_variants(self.post.image), 0)
+        copy = Post.objects.create(
+            text='Копия', author=self.author, image=upload('copy.gif')
+        )
+        self.assertEqual(generate_variants(copy.image), 0)
+        self.assertEqual(
+            list(ImageVariant.objects.values_list('width', 'height')),
+            [(480, 170), (960, 339)]
+        )
+        copy.delete()
+        self.post.delete()
+        run_tasks()
+        self.assertFalse(ImageVariant.objects.exists())
+
+    def test_templates_use_srcset_and_lazy_loading(self):
+        profile = reverse('posts:profile', args=[self.author.username])
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotContains(response, 'srcset')
+        self.assertContains(response, 'loading="lazy"')
+        # пока вариантов нет, отдается миниатюра sorl, а не оригинал
+        self.assertNotContains(response, f'src="{self.post.image.url}"')
+        self.assertContains(response, 'width="960" height="339"')
+        self.assertNotContains(self.client.get(profile), 'srcset')
+        self.assertTrue(os.path.exists(os.path.join(
+            TEMP_MEDIA_ROOT,
+            thumbnail_directory(content_digest(self.post.image.name))
+        )))
+
+        generate_variants(self.post.image)
+        # карточка с заглушкой не попала в кэш карточек
+        self.assertContains(self.client.get(profile), 'srcset')
+        cache.clear()
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, ' 480w, ')
+        self.assertContains(response, 'width="960" height="339"')
+        self.assertContains(response, 'loading="lazy"')
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.post.pk])
+        )
+        self.assertContains(response, ' 960w"')
+        self.assertContains(response, 'loading="eager"')
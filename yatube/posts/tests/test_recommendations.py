@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from posts.following import get_suggestions
+from posts.models import Follow, FollowSuggestion, User
+from posts.recommendations import update_suggestions
+
+
+class RecommendationsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='User')
+        cls.friend = User.objects.create_user(username='Friend')
+        cls.fof = User.objects.create_user(username='FriendOfFriend')
+        cls.similar = User.objects.create_user(username='Similar')
+        cls.stranger = User.objects.create_user(username='Stranger')
+        cls.fan = User.objects.create_user(username='Fan')
+        Follow.objects.create(user=cls.user, author=cls.friend)
+        Follow.objects.create(user=cls.friend, author=cls.fof)
+        Follow.objects.create(user=cls.friend, author=cls.user)
+        # у Friend и Similar общий подписчик
+        Follow.objects.create(user=cls.fan, author=cls.friend)
+        Follow.objects.create(user=cls.fan, author=cls.similar)
+
+    def setUp(self):
+        cache.clear()
+
+    def suggested(self, user):
+        return list(
+            FollowSuggestion.objects.filter(user=user).values_list(
+                'author', flat=True
+            )
+        )
+
+    def test_suggestions_skip_self_and_followed(self):
+        update_suggestions()
+        suggested = self.suggested(self.user)
+        self.assertCountEqual(suggested, [self.fof.pk, self.similar.pk])
+        self.assertNotIn(self.stranger.pk, suggested)
+
+    def test_recompute_replaces_stale_rows(self):
+        update_suggestions()
+        Follow.objects.create(user=self.user, author=self.fof)
+        update_suggestions()
+        self.assertNotIn(self.fof.pk, self.suggested(self.user))
+
+    def test_suggestions_on_follow_page(self):
+        update_suggestions()
+        self.client.force_login(self.user)
+        Follow.objects.create(user=self.user, author=self.similar)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.context['suggestions'], [self.fof])
+        self.assertTemplateUsed(response, 'posts/includes/suggestions.html')
+
+    def test_followed_suggestions_do_not_shrink_the_list(self):
+        reader = User.objects.create_user(username='Reader')
+        authors = [
+            User.objects.create_user(username=f'Author{i}') for i in range(8)
+        ]
+        FollowSuggestion.objects.bulk_create(
+            FollowSuggestion(user=reader, author=author, score=10 - i)
+            for i, author in enumerate(authors)
+        )
+        # лучшие рекомендации уже оформлены подписками
+        for author in authors[:3]:
+            Follow.objects.create(user=reader, author=author)
+        request = RequestFactory().get('/')
+        request.user = reader
+        with self.assertNumQueries(1):
+            suggestions = get_suggestions(request, limit=4)
+        self.assertEqual(suggestions, authors[3:7])
@@ -0,0 +1,128 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from posts.models import Group, Post, PostRevision, User
+from posts.revisions import apply_delta, make_delta, record_edit, text_at
+
+
+class RevisionsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Author')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.author)
+        self.post = Post.objects.create(
+            text='Первая версия поста', author=self.author
+        )
+
+    def edit(self, text):
+        self.post.text = text
+        record_edit(self.post, self.author)
+        self.post.save()
+
+    def test_delta_roundtrip_and_size(self):
+        old = ' '.join(f'слово{number}' for number in range(500)) + '\n'
+        new = old.replace('слово250', 'исправлено')
+        delta = make_delta(new, old)
+        self.assertEqual(apply_delta(new, delta), old)
+        self.assertLess(len(delta), 50)
+        for new, old in (('', 'текст'), ('текст', ''), ('a  b\n', ' b a')):
+            with self.subTest(new=new, old=old):
+                self.assertEqual(apply_delta(new, make_delta(new, old)), old)
+
+    @override_settings(REVISIONS={'SNAPSHOT_EVERY': 3})
+    def test_versions_are_reconstructed(self):
+        versions = [self.post.text]
+        for number in range(1, 8):
+            versions.append(f'Версия {number} поста')
+            self.edit(versions[-1])
+        self.assertEqual(self.post.revisions.count(), 7)
+        self.assertEqual(
+            list(self.post.revisions.filter(is_snapshot=True).values_list(
+                'number', flat=True
+            )),
+            [6, 3]
+        )
+        for number, text in enumerate(versions[:-1], start=1):
+            with self.subTest(number=number):
+                self.assertEqual(text_at(self.post, number), text)
+
+    def test_concurrent_edits_get_own_versions(self):
+        # оба редактора открыли пост до первой правки
+        first = Post.objects.get(pk=self.post.pk)
+        second = Post.objects.get(pk=self.post.pk)
+        edits = ((first, 'Правка первого'), (second, 'Правка второго'))
+        for post, text in edits:
+            post.text = text
+            record_edit(post, self.author)
+            post.save()
+        self.assertEqual(
+            list(self.post.revisions.values_list('number', flat=True)), [2, 1]
+        )
+        self.assertEqual(text_at(second, 1), 'Первая версия поста')
+        self.assertEqual(text_at(second, 2), 'Правка первого')
+
+    def test_edit_view_records_revision(self):
+        url = reverse('posts:post_edit', args=[self.post.pk])
+        self.client.post(url, {'text': 'Первая версия поста'})
+        self.post.refresh_from_db()
+        self.assertIsNone(self.post.edited_at)
+        self.assertFalse(PostRevision.objects.exists())
+
+        self.client.post(url, {'text': 'Вторая версия поста'})
+        self.post.refresh_from_db()
+        self.assertIsNotNone(self.post.edited_at)
+        revision = self.post.revisions.get()
+        self.assertEqual(revision.number, 1)
+        self.assertEqual(revision.editor, self.author)
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.post.pk])
+        )
+        self.assertEqual(
+            response['Last-Modified'],
+            http_date(self.post.edited_at.timestamp())
+        )
+
+        response = self.client.get(
+            reverse('posts:post_history', args=[self.post.pk])
+        )
+        self.assertContains(
+            response, reverse('posts:post_revision', args=[self.post.pk, 1])
+        )
+        response = self.client.get(
+            reverse('posts:post_revision', args=[self.post.pk, 1])
+        )
+        self.assertEqual(response.context['text'], 'Первая версия поста')
+        response = self.client.get(
+            reverse('posts:post_revision', args=[self.post.pk, 2])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_group_change_updates_edit_date(self):
+        group = Group.objects.create(title='Группа', slug='group')
+        url = reverse('posts:post_edit', args=[self.post.pk])
+        self.client.post(url, {'text': self.post.text, 'group': group.pk})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.group, group)
+        self.assertIsNotNone(self.post.edited_at)
+        self.assertFalse(PostRevision.objects.exists())
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.post.pk])
+        )
+        self.assertEqual(
+            response['Last-Modified'],
+            http_date(self.post.edited_at.timestamp())
+        )
+
+    def test_feed_uses_edit_date(self):
+        self.edit('Исправленный текст')
+        response = self.client.get(reverse('posts:feed_atom'))
+        self.assertContains(response, 'Исправленный текст')
+        self.assertContains(
+            response, self.post.edited_at.strftime('%Y-%m-%dT%H:%M:%S')
+        )
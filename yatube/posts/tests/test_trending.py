@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Post, TrendingPost, User
+from posts.tasks import update_trending_posts
+from posts.trending import update_trending
+from tasks.models import Task
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.popular_author = User.objects.create_user(username='Popular')
+        cls.author = User.objects.create_user(username='Author')
+        cls.readers = [
+            User.objects.create_user(username=f'Reader{i}') for i in range(3)
+        ]
+        for reader in cls.readers:
+            Follow.objects.create(user=reader, author=cls.popular_author)
+        cls.quiet_post = Post.objects.create(text='Тихий', author=cls.author)
+        cls.hot_post = Post.objects.create(text='Горячий', author=cls.author)
+        cls.popular_post = Post.objects.create(
+            text='Популярный автор', author=cls.popular_author
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_comment_velocity_and_followers_raise_score(self):
+        for reader in self.readers:
+            Comment.objects.create(
+                post=self.hot_post, author=reader, text='!'
+            )
+        update_trending()
+        ranking = list(TrendingPost.objects.values_list('post', flat=True))
+        self.assertEqual(ranking[0], self.hot_post.pk)
+        self.assertLess(
+            ranking.index(self.popular_post.pk),
+            ranking.index(self.quiet_post.pk)
+        )
+
+    def test_incremental_update_picks_new_comments(self):
+        update_trending()
+        first = TrendingPost.objects.first().post_id
+        self.assertNotEqual(first, self.quiet_post.pk)
+        for _ in range(5):
+            Comment.objects.create(
+                post=self.quiet_post, author=self.readers[0], text='!'
+            )
+        update_trending()
+        self.assertEqual(
+            TrendingPost.objects.first().post_id,
+            self.quiet_post.pk
+        )
+
+    def test_trending_page(self):
+        update_trending()
+        response = self.client.get(reverse('posts:trending'))
+        self.assertTemplateUsed(response, 'posts/trending.html')
+        self.assertEqual(len(response.context['page_obj']), 3)
+
+    def test_failed_update_is_rescheduled(self):
+        with mock.patch(
+            'posts.tasks.update_trending', side_effect=ValueError('boom')
+        ):
+            with self.assertRaises(ValueError):
+                update_trending_posts()
+        update_trending_posts()
+        self.assertEqual(Task.objects.filter(
+            name=update_trending_posts.task_name, status=Task.QUEUED
+        ).count(), 1)
@@ -1,6 +1,5 @@
 import shutil
 import tempfile
-import math
 
 from django import forms
 from django.conf import settings
@@ -8,9 +7,13 @@ from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.core.cache.utils import make_template_fragment_key
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.db import transaction
+from django.test import (
+    Client, TestCase, TransactionTestCase, override_settings
+)
 from django.urls import reverse
 
+from posts.following import get_following
 from posts.models import Group, Post, Follow
 
 User = get_user_model()
@@ -112,11 +115,15 @@ class PostsViewsTests(TestCase):
             self.assertEqual(obj.text, self.post.text)
             self.assertEqual(obj.author, self.post.author)
             self.assertEqual(obj.group, self.post.group)
-            self.assertEqual(obj.image, self.images_names[str(obj.pk)])
         else:
             self.assertEqual(obj.text, self.user_post.text)
             self.assertEqual(obj.author, self.user_post.author)
             self.assertEqual(obj.group, self.user_post.group)
+            # картинки есть только у постов первой группы
+            self.assertEqual(
+                obj.image.name.rsplit('/', 1)[-1],
+                self.images_names[str(obj.pk)]
+            )
 
     def postlist_testing(self, address, type=None):
         """ Проверка списка постов и паджинатора """
@@ -216,14 +223,11 @@ class PostsViewsTests(TestCase):
             author=self.user,
             group=self.grp
         )
-        post_count = self.user_post.author.posts.count()
-        pages = math.ceil(post_count / settings.PAGE_ROWS_COUNT)
         cache.clear()
-        response = self.client.get(
-            reverse('posts:index') + f'?page={str(pages)}'
-        )
+        # лента идет от новых постов к старым: новый пост на первой странице
+        response = self.client.get(reverse('posts:index'))
         self.assertIn(new_post, response.context['page_obj'])
-        key = make_template_fragment_key('index_page', str(pages))
+        key = make_template_fragment_key('index_page', '1')
         cache1 = cache.get(key)  # сохранили кэш (1)
         new_post.delete()  # удалили пост
         cache2 = cache.get(key)  # сохранили кэш (2)
@@ -296,3 +300,103 @@ class PostsViewsTests(TestCase):
         )
         response = self.authorized_client.get(reverse('posts:follow_index'))
         self.assertIn(new_post, response.context['page_obj'])
+
+
+@override_settings(POSTS_STREAMING=True)
+class PostsStreamingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Streamer')
+        cls.grp = Group.objects.create(
+            title='Группа для потока',
+            slug='stream',
+            description='Описание'
+        )
+        cls.follower = User.objects.create_user(username='Follower')
+        Follow.objects.create(user=cls.follower, author=cls.user)
+        for i in range(3):
+            Post.objects.create(
+                text=f'Потоковый пост {i}',
+                author=cls.user,
+                group=cls.grp
+            )
+
+    def test_post_lists_are_streamed(self):
+        cache.clear()
+        self.client.force_login(self.follower)
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:follow_index'),
+            reverse('posts:group_list', kwargs={'any_slug': self.grp.slug}),
+            reverse('posts:profile', kwargs={
+                'username': self.user.username
+            }),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.client.get(address)
+                self.assertTrue(response.streaming)
+                chunks = [
+                    chunk.decode() for chunk in response.streaming_content
+                ]
+                self.assertIn('<header>', chunks[0])
+                self.assertNotIn('Потоковый пост', chunks[0])
+                self.assertNotIn('<footer', chunks[0])
+                content = ''.join(chunks)
+                for i in range(3):
+                    self.assertIn(f'Потоковый пост {i}', content)
+                self.assertEqual(content.count('<header>'), 1)
+                self.assertIn('</html>', chunks[-1])
+                # шапка, три карточки, два разделителя и подвал
+                self.assertEqual(len(chunks), 7)
+                self.assertEqual(chunks[2], '<hr>')
+
+    def test_streamed_index_uses_fragment_cache(self):
+        cache.clear()
+        b''.join(self.client.get(reverse('posts:index')).streaming_content)
+        key = make_template_fragment_key('index_page', [1, 'stream'])
+        self.assertIsNotNone(cache.get(key))
+        Post.objects.create(text='Свежий пост', author=self.user)
+        content = b''.join(
+            self.client.get(reverse('posts:index')).streaming_content
+        ).decode()
+        self.assertNotIn('Свежий пост', content)
+
+
+class FollowingCacheTests(TransactionTestCase):
+    # кэш подписок сбрасывается в on_commit, поэтому нужны настоящие коммиты
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='Reader')
+        self.authors = [
+            User.objects.create_user(username=f'Author{i}') for i in range(3)
+        ]
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_following_set_is_kept_current(self):
+        following = get_following(self.user)
+        self.assertEqual(len(following), 0)
+        Follow.objects.create(user=self.user, author=self.authors[1])
+        following = get_following(self.user)
+        self.assertIn(self.authors[1].pk, following)
+        self.assertNotIn(self.authors[0], following)
+        with self.assertNumQueries(0):
+            self.assertIn(self.authors[1].pk, get_following(self.user))
+        with transaction.atomic():
+            Follow.objects.create(user=self.user, author=self.authors[2])
+            # до коммита в кэше остается прежний набор
+            self.assertNotIn(self.authors[2].pk, get_following(self.user))
+        self.assertIn(self.authors[2].pk, get_following(self.user))
+        Follow.objects.filter(user=self.user).delete()
+        self.assertEqual(len(get_following(self.user)), 0)
+
+    def test_profile_uses_following_set(self):
+        Follow.objects.create(user=self.user, author=self.authors[0])
+        response = self.authorized_client.get(reverse(
+            'posts:profile', kwargs={'username': self.authors[0].username}
+        ))
+        self.assertTrue(response.context['following'])
+        self.assertIn(self.authors[0].pk, response.context['following_ids'])
+        self.assertNotIn(self.authors[2].pk, response.context['following_ids'])
@@ -0,0 +1,85 @@
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Comment, Follow, Post, TrendingPost
+
+LAST_RUN_KEY = 'trending:last_run'
+
+
+def score(recent_comments, followers, age_hours):
+    """Скорость комментирования и аудитория автора, затухающие со временем
+    публикации (как в рейтинге Hacker News)."""
+    options = settings.TRENDING
+    weight = (
+        1
+        + options['COMMENT_WEIGHT'] * recent_comments
+        + options['FOLLOWER_WEIGHT'] * math.log1p(followers)
+    )
+    return weight / (age_hours + 2) ** options['GRAVITY']
+
+
+def _candidates(since):
+    """Посты, рейтинг которых мог измениться с прошлого запуска: уже
+    попавшие в рейтинг, новые и получившие комментарии."""
+    ids = set(TrendingPost.objects.values_list('post', flat=True))
+    ids.update(
+        Post.objects.filter(pub_date__gte=since).values_list('pk', flat=True)
+    )
+    ids.update(
+        Comment.objects.filter(created__gte=since).values_list(
+            'post', flat=True
+        )
+    )
+    return ids
+
+
+def update_trending(now=None):
+    """Пересчитывает рейтинг только для постов-кандидатов и оставляет
+    в таблице TRENDING['SIZE'] лучших."""
+    options = settings.TRENDING
+    now = now or timezone.now()
+    window_start = now - timedelta(hours=options['WINDOW_HOURS'])
+    since = max(cache.get(LAST_RUN_KEY, window_start), window_start)
+    ids = _candidates(since)
+    oldest = now - timedelta(hours=options['MAX_AGE_HOURS'])
+    posts = Post.objects.filter(pk__in=ids, pub_date__gte=oldest).annotate(
+        recent_comments=Count(
+            'comments',
+            filter=Q(comments__created__gte=window_start)
+        )
+    ).values_list('pk', 'author', 'pub_date', 'recent_comments')
+    posts = list(posts)
+    followers = dict(
+        Follow.objects.filter(
+            author__in={author for _, author, _, _ in posts}
+        ).values('author').annotate(total=Count('pk')).values_list(
+            'author', 'total'
+        )
+    )
+    rows = [
+        TrendingPost(
+            post_id=pk,
+            score=score(
+                recent_comments,
+                followers.get(author, 0),
+                (now - pub_date).total_seconds() / 3600
+            )
+        )
+        for pk, author, pub_date, recent_comments in posts
+    ]
+    with transaction.atomic():
+        TrendingPost.objects.filter(post__in=ids).delete()
+        TrendingPost.objects.bulk_create(rows)
+        cutoff = TrendingPost.objects.values_list(
+            'score', flat=True
+        )[options['SIZE']:options['SIZE'] + 1]
+        if cutoff:
+            TrendingPost.objects.filter(score__lte=cutoff[0]).delete()
+    cache.set(LAST_RUN_KEY, now, None)
+    return len(rows)
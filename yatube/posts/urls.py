@@ -6,17 +6,53 @@ app_name = 'posts'
 
 jls_extract_var = [
     path('', views.index, name='index'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:any_slug>/', views.group_posts, name='group_list'),
+    path('group/<slug:slug>/rss/', views.group_feed_rss, name='group_feed'),
+    path(
+        'group/<slug:slug>/atom/',
+        views.group_feed_atom,
+        name='group_feed_atom'
+    ),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/rss/',
+        views.author_feed_rss,
+        name='author_feed'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        views.author_feed_atom,
+        name='author_feed_atom'
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path(
+        'posts/<int:post_id>/history/',
+        views.post_history,
+        name='post_history'
+    ),
+    path(
+        'posts/<int:post_id>/history/<int:number>/',
+        views.post_revision,
+        name='post_revision'
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.add_comment,
         name='add_comment'
     ),
     path('follow/', views.follow_index, name='follow_index'),
+    path('trending/', views.trending, name='trending'),
+    path('feeds/rss/', views.feed_rss, name='feed'),
+    path('feeds/atom/', views.feed_atom, name='feed_atom'),
+    path('sitemap.xml', views.sitemap_index, name='sitemap'),
+    path(
+        'sitemap-<str:section>.xml',
+        views.sitemap_section,
+        name='sitemap_section'
+    ),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
@@ -1,8 +1,60 @@
 from django.conf import settings
+from django.core.cache.utils import make_template_fragment_key
 from django.core.paginator import Paginator
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.template import loader
+
+from core.cache import get_or_compute
+
+from .cards import render_cards
 
 
 def paginate_me(pagination_list, request):
     paginator = Paginator(pagination_list, settings.PAGE_ROWS_COUNT)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
+
+
+def _card_chunks(cards):
+    # каждая карточка и разделитель - отдельный кусок ответа
+    for number, card in enumerate(cards):
+        if number:
+            yield '<hr>'
+        yield card
+
+
+def _stream_page(request, template, context, cards_fragment):
+    template = loader.get_template(template)
+    # шапка уходит клиенту до того, как выбраны посты и отрисован подвал
+    yield template.render(dict(context, stream_part='head'), request)
+    if cards_fragment is None:
+        cards = render_cards(context['page_obj'], context)
+    else:
+        # список карточек лежит отдельно от строки, которую кладет
+        # {% cache %} в обычном режиме
+        cards = get_or_compute(
+            make_template_fragment_key(
+                cards_fragment, [context['page_obj'].number, 'stream']
+            ),
+            lambda: render_cards(context['page_obj'], context),
+            context['cards_timeout']
+        )
+    yield from _card_chunks(cards)
+    yield template.render(dict(context, stream_part='tail'), request)
+
+
+def render_post_list(request, template, context, cards_fragment=None):
+    """Рендер страницы со списком постов.
+
+    При POSTS_STREAMING = True страница отдается по частям: шапка
+    (stream_part = 'head'), каждая карточка поста и разделитель
+    отдельным куском, затем паджинатор и подвал (stream_part = 'tail').
+    cards_fragment - имя фрагмента {% cache %}, которым шаблон кэширует
+    карточки; поток кэширует их списком под тем же именем.
+    """
+    if not settings.POSTS_STREAMING:
+        return render(request, template, context)
+    return StreamingHttpResponse(
+        _stream_page(request, template, context, cards_fragment)
+    )
@@ -0,0 +1,122 @@
+from collections import defaultdict
+
+from django.conf import settings
+from PIL import Image
+from sorl.thumbnail import default, get_thumbnail
+
+from core.storage import content_digest
+
+from .models import ImageVariant
+
+THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+
+
+def variant_source(name):
+    """Ключ вариантов: копии одной картинки под разными именами делят их."""
+    return content_digest(name) or name
+
+
+def variant_formats():
+    Image.init()
+    return [
+        image_format for image_format in settings.IMAGE_VARIANTS['FORMATS']
+        if image_format in Image.SAVE
+    ]
+
+
+def variant_sizes():
+    aspect_width, aspect_height = settings.IMAGE_VARIANTS['ASPECT']
+    return [
+        (width, round(width * aspect_height / aspect_width))
+        for width in settings.IMAGE_VARIANTS['WIDTHS']
+    ]
+
+
+def generate_variants(image):
+    """Готовит все ширины и форматы картинки заранее, чтобы страницы
+    не считали миниатюры при рендере. Готовые варианты пропускаются."""
+    if not image:
+        return 0
+    source = variant_source(image.name)
+    done = set(ImageVariant.objects.filter(source=source).values_list(
+        'format', 'width'
+    ))
+    variants = []
+    for image_format in variant_formats():
+        for width, height in variant_sizes():
+            if (image_format, width) in done:
+                continue
+            thumbnail = get_thumbnail(
+                image, f'{width}x{height}', format=image_format,
+                **THUMBNAIL_OPTIONS
+            )
+            if not thumbnail.exists():
+                continue
+            variants.append(ImageVariant(
+                source=source,
+                format=image_format,
+                width=width,
+                height=height,
+                name=thumbnail.name
+            ))
+    ImageVariant.objects.bulk_create(variants, ignore_conflicts=True)
+    return len(variants)
+
+
+def _srcset(variants):
+    return ', '.join(
+        f'{default.storage.url(variant.name)} {variant.width}w'
+        for variant in variants
+    )
+
+
+class Picture:
+    """Данные для <picture>: <source> на каждый формат, кроме
+    последнего, и <img> с srcset запасного формата."""
+
+    def __init__(self, variants):
+        by_format = defaultdict(list)
+        for variant in sorted(variants, key=lambda variant: variant.width):
+            by_format[variant.format].append(variant)
+        formats = [
+            image_format for image_format in settings.IMAGE_VARIANTS['FORMATS']
+            if image_format in by_format
+        ]
+        self.sources = [
+            {'type': Image.MIME[image_format],
+             'srcset': _srcset(by_format[image_format])}
+            for image_format in formats[:-1]
+        ]
+        images = by_format[formats[-1]]
+        self.srcset = _srcset(images)
+        main = min(images, key=lambda variant: abs(
+            variant.width - settings.IMAGE_VARIANTS['DEFAULT_WIDTH']
+        ))
+        self.src = default.storage.url(main.name)
+        self.width, self.height = main.width, main.height
+
+    @property
+    def sizes(self):
+        return settings.IMAGE_VARIANTS['SIZES']
+
+
+def attach_pictures(posts):
+    """Одним запросом ставит post.picture всем постам с картинкой.
+
+    None - варианты еще не готовы, шаблон покажет оригинал.
+    """
+    sources = {
+        post.pk: variant_source(post.image.name)
+        for post in posts if post.image
+    }
+    variants = defaultdict(list)
+    if sources:
+        for variant in ImageVariant.objects.filter(
+            source__in=set(sources.values()),
+            format__in=settings.IMAGE_VARIANTS['FORMATS']
+        ):
+            variants[variant.source].append(variant)
+    for post in posts:
+        found = variants.get(sources.get(post.pk))
+        post.picture = Picture(found) if found else None
+    return posts
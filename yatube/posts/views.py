@@ -1,60 +1,120 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.contrib.sitemaps import views as sitemap_views
+from django.db import transaction
+from django.db.models import F
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils.http import http_date
 
+from core.conditional import cached_conditional
+from core.holepunch import holepunched
+
+from . import feeds
+from .archive import author_post_count, get_post_or_404, with_archive
+from .following import get_request_following, get_suggestions
 from .forms import PostForm, CommentForm
-from .models import Group, Post, User, Follow
-from .utils import paginate_me
+from .models import ArchivedPost, Group, Post, User, Follow
+from .revisions import record_edit, text_at
+from .sitemaps import get_sitemap, get_sitemaps, is_closed_section
+from .tasks import warm_post_thumbnail
+from .utils import paginate_me, render_post_list
+from .variants import attach_pictures
+
 
+# блок карточек главной кэшируется целиком: тегом {% cache %} в шаблоне
+# или в render_post_list при потоковой отдаче
+INDEX_CARDS_FRAGMENT = 'index_page'
+INDEX_CARDS_TIMEOUT = 20
 
+
+@holepunched
 def index(request):
-    post_list = Post.objects.select_related('group', 'author').all()
+    post_list = with_archive(
+        Post.objects.select_related('group', 'author'),
+        ArchivedPost.objects.select_related('group', 'author')
+    )
     page_obj = paginate_me(post_list, request)
     template = 'posts/index.html'
     context = {
         'page_obj': page_obj,
-        'index': True
+        'index': True,
+        'cards_timeout': INDEX_CARDS_TIMEOUT,
     }
-    return render(request, template, context)
+    return render_post_list(
+        request, template, context, cards_fragment=INDEX_CARDS_FRAGMENT
+    )
 
 
+@holepunched
 def group_posts(request, any_slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=any_slug)
-    post_list = group.posts.select_related('author').all()
+    post_list = with_archive(
+        group.posts.select_related('author'),
+        group.archived_posts.select_related('author')
+    )
     page_obj = paginate_me(post_list, request)
     context = {
         'group': group,
         'page_obj': page_obj,
+        'hide_group': True,
+    }
+    return render_post_list(request, template, context)
+
+
+GROUP_ORDERINGS = {
+    'activity': (F('stats__last_post_date').desc(nulls_last=True), 'title'),
+    'posts': (F('stats__post_count').desc(nulls_last=True), 'title'),
+    'title': ('title',),
+}
+
+
+def group_index(request):
+    template = 'posts/groups.html'
+    sort = request.GET.get('sort')
+    if sort not in GROUP_ORDERINGS:
+        sort = 'activity'
+    group_list = Group.objects.select_related('stats').order_by(
+        *GROUP_ORDERINGS[sort]
+    )
+    page_obj = paginate_me(group_list, request)
+    context = {
+        'page_obj': page_obj,
+        'sort': sort,
     }
     return render(request, template, context)
 
 
+@holepunched
 def profile(request, username):
     template = 'posts/profile.html'
     usr = get_object_or_404(User, username=username)
-    post_list = usr.posts.select_related('group').all()
+    post_list = with_archive(
+        usr.posts.select_related('group'),
+        usr.archived_posts.select_related('group')
+    )
     user_posts_count = post_list.count()
     page_obj = paginate_me(post_list, request)
-    following = False
-    if request.user.is_authenticated:
-        following = Follow.objects.filter(
-            user=request.user,
-            author=usr
-        ).exists()
+    following = usr.pk in get_request_following(request)
     context = {
         'usr': usr,
         'page_obj': page_obj,
         'user_posts_count': user_posts_count,
-        'following': following
+        'following': following,
+        'hide_author': True,
+        'suggestions': get_suggestions(request),
     }
-    return render(request, template, context)
+    return render_post_list(request, template, context)
 
 
+@holepunched
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    post = get_object_or_404(Post, id=post_id)
-    user_posts_count = post.author.posts.all().count()
+    post = get_post_or_404(post_id)
+    attach_pictures([post])
+    user_posts_count = author_post_count(post.author)
     form = CommentForm(request.POST or None)
     comments = post.comments.select_related('author').all()
     context = {
@@ -63,7 +123,13 @@ def post_detail(request, post_id):
         'form': form,
         'comments': comments
     }
-    return render(request, template, context)
+    response = render(request, template, context)
+    # правка поста (edited_at) и новые комментарии меняют страницу; 304
+    # не отдается: в ней есть персональные фрагменты (core.holepunch)
+    response['Last-Modified'] = http_date(max(
+        [post.last_modified] + [comment.created for comment in comments]
+    ).timestamp())
+    return response
 
 
 @login_required
@@ -74,6 +140,7 @@ def post_create(request):
         new_post = form.save(commit=False)
         new_post.author = request.user
         new_post.save()
+        warm_post_thumbnail.delay(new_post.pk)
         return redirect(
             reverse(
                 'posts:profile',
@@ -99,7 +166,11 @@ def post_edit(request, post_id):
                 'posts:post_detail',
                 kwargs={'post_id': post_id}))
     elif form.is_valid():
-        form.save()
+        with transaction.atomic():
+            if form.has_changed():
+                record_edit(post, request.user)
+            post = form.save()
+        warm_post_thumbnail.delay(post.pk)
         return redirect(
             reverse(
                 'posts:post_detail',
@@ -113,6 +184,32 @@ def post_edit(request, post_id):
         return render(request, template, context)
 
 
+def post_history(request, post_id):
+    template = 'posts/post_history.html'
+    post = get_post_or_404(post_id)
+    revisions = post.revisions.select_related('editor').defer('delta')
+    context = {
+        'post': post,
+        'page_obj': paginate_me(revisions, request),
+    }
+    return render(request, template, context)
+
+
+def post_revision(request, post_id, number):
+    template = 'posts/post_revision.html'
+    post = get_post_or_404(post_id)
+    revision = get_object_or_404(
+        post.revisions.select_related('editor').defer('delta'),
+        number=number
+    )
+    context = {
+        'post': post,
+        'revision': revision,
+        'text': text_at(post, number),
+    }
+    return render(request, template, context)
+
+
 @login_required
 def add_comment(request, post_id):
     form = CommentForm(request.POST or None)
@@ -129,17 +226,38 @@ def add_comment(request, post_id):
 def follow_index(request):
     usr = get_object_or_404(User, username=request.user)
     follow_list = Follow.objects.filter(user=usr).values('author')
-    post_list = Post.objects.filter(author__in=follow_list).select_related(
-        'group',
-        'author'
+    post_list = with_archive(
+        Post.objects.filter(author__in=follow_list).select_related(
+            'group',
+            'author'
+        ),
+        ArchivedPost.objects.filter(author__in=follow_list).select_related(
+            'group',
+            'author'
+        )
     )
     page_obj = paginate_me(post_list, request)
     template = 'posts/follow.html'
     context = {
         'page_obj': page_obj,
-        'follow': True
+        'follow': True,
+        'suggestions': get_suggestions(request),
     }
-    return render(request, template, context)
+    return render_post_list(request, template, context)
+
+
+def trending(request):
+    post_list = Post.objects.filter(trending__isnull=False).select_related(
+        'group',
+        'author'
+    ).order_by('-trending__score')
+    page_obj = paginate_me(post_list, request)
+    template = 'posts/trending.html'
+    context = {
+        'page_obj': page_obj,
+        'trending': True
+    }
+    return render_post_list(request, template, context)
 
 
 @login_required
@@ -167,3 +285,52 @@ def profile_unfollow(request, username):
         reverse(
             'posts:profile',
             kwargs={'username': username}))
+
+
+@cached_conditional(settings.SITEMAPS['TIMEOUT'])
+def sitemap_index(request):
+    sections = []
+    for name, sitemap in get_sitemaps().items():
+        location = request.build_absolute_uri(
+            reverse('posts:sitemap_section', args=[name])
+        )
+        lastmod = sitemap.last_modified()
+        sections.append({'location': location, 'lastmod': lastmod})
+        for page in range(2, sitemap.paginator.num_pages + 1):
+            sections.append({
+                'location': f'{location}?p={page}',
+                'lastmod': lastmod
+            })
+    response = render(
+        request,
+        'sitemaps/index.xml',
+        {'sections': sections},
+        content_type='application/xml'
+    )
+    dates = [section['lastmod'] for section in sections if section['lastmod']]
+    if dates:
+        response['Last-Modified'] = http_date(max(dates).timestamp())
+    return response
+
+
+def _sitemap_timeout(request, section):
+    if is_closed_section(section):
+        return settings.SITEMAPS['CLOSED_TIMEOUT']
+    return settings.SITEMAPS['TIMEOUT']
+
+
+@cached_conditional(_sitemap_timeout, params=('p',))
+def sitemap_section(request, section):
+    sitemap = get_sitemap(section)
+    if sitemap is None:
+        raise Http404(f'Нет раздела карты сайта {section}')
+    return sitemap_views.sitemap(request, {section: sitemap}, section)
+
+
+_feed = cached_conditional(settings.FEEDS['TIMEOUT'])
+feed_rss = _feed(feeds.LatestPostsFeed())
+feed_atom = _feed(feeds.LatestPostsAtomFeed())
+group_feed_rss = _feed(feeds.GroupFeed())
+group_feed_atom = _feed(feeds.GroupAtomFeed())
+author_feed_rss = _feed(feeds.AuthorFeed())
+author_feed_atom = _feed(feeds.AuthorAtomFeed())
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'name', 'status', 'attempts', 'run_at', 'duration'
+    )
+    list_filter = ('status', 'name')
+    readonly_fields = (
+        'created', 'started', 'finished', 'duration', 'progress'
+    )
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(Task, TaskAdmin)
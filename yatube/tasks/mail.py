@@ -0,0 +1,62 @@
+import base64
+from email.mime.base import MIMEBase
+
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils.encoding import force_str
+
+from .tasks import send_email
+
+
+def _strings(values):
+    return [force_str(value) for value in values]
+
+
+def _attachment(attachment):
+    """Вложение в виде, который можно сохранить в payload задачи."""
+    if isinstance(attachment, MIMEBase):
+        raise ValueError(
+            'QueuedEmailBackend не умеет ставить в очередь MIME-вложения'
+        )
+    filename, content, mimetype = attachment
+    if isinstance(content, str):
+        return [filename, content, mimetype, False]
+    return [
+        filename, base64.b64encode(content).decode('ascii'), mimetype, True
+    ]
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который только ставит письма в очередь.
+
+    Отправку через TASKS_EMAIL_BACKEND выполняет воркер. Ленивые
+    строки приводятся к str, бинарные вложения кодируются в base64.
+    """
+
+    def send_messages(self, email_messages):
+        # сначала проверяются все письма, чтобы не поставить часть из них
+        queued = [self._fields(message) for message in email_messages]
+        for fields in queued:
+            send_email.delay(**fields)
+        return len(queued)
+
+    def _fields(self, message):
+        return {
+            'subject': force_str(message.subject),
+            'body': force_str(message.body),
+            'from_email': force_str(message.from_email),
+            'to': _strings(message.to),
+            'cc': _strings(message.cc),
+            'bcc': _strings(message.bcc),
+            'reply_to': _strings(message.reply_to),
+            'headers': {
+                force_str(name): force_str(value)
+                for name, value in message.extra_headers.items()
+            },
+            'alternatives': [
+                [force_str(content), mimetype] for content, mimetype
+                in getattr(message, 'alternatives', [])
+            ],
+            'attachments': [
+                _attachment(attachment) for attachment in message.attachments
+            ],
+        }
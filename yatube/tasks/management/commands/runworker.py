@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.worker import claim, purge_finished, requeue_stale, run_in_thread
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в пуле потоков'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=settings.TASKS['WORKER_THREADS'],
+            help='Количество потоков воркера'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить задачи, готовые к запуску, и завершиться'
+        )
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        poll_interval = settings.TASKS['POLL_INTERVAL']
+        last_maintenance = 0
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            while True:
+                if time.monotonic() - last_maintenance > 60:
+                    requeue_stale()
+                    purge_finished()
+                    last_maintenance = time.monotonic()
+                claimed = claim(threads)
+                for task in pool.map(run_in_thread, claimed):
+                    self.stdout.write(
+                        f'{task.name} #{task.pk}: {task.status} '
+                        f'({task.duration:.3f} с)'
+                    )
+                if not claimed:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
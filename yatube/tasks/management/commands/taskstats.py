@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, Max, Q, Sum
+
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Статистика выполнения фоновых задач по их именам'
+
+    def handle(self, *args, **options):
+        stats = Task.objects.values('name').annotate(
+            total=Count('pk'),
+            queued=Count('pk', filter=Q(status=Task.QUEUED)),
+            failed=Count('pk', filter=Q(status=Task.FAILED)),
+            retries=Sum('attempts') - Count('pk', filter=Q(attempts__gt=0)),
+            avg_duration=Avg('duration'),
+            max_duration=Max('duration'),
+        ).order_by('name')
+        for row in stats:
+            durations = sorted(
+                Task.objects.filter(
+                    name=row['name'],
+                    duration__isnull=False
+                ).values_list('duration', flat=True)
+            )
+            p95 = durations[int(len(durations) * 0.95)] if durations else 0
+            self.stdout.write(
+                f"{row['name']}: всего {row['total']}, "
+                f"в очереди {row['queued']}, ошибок {row['failed']}, "
+                f"повторов {row['retries'] or 0}, "
+                f"среднее {row['avg_duration'] or 0:.3f} с, "
+                f"p95 {p95:.3f} с, "
+                f"максимум {row['max_duration'] or 0:.3f} с"
+            )
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 16:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='progress',
+            field=models.TextField(default='{}', verbose_name='Прогресс (JSON)'),
+        ),
+    ]
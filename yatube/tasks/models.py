@@ -0,0 +1,45 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField('Задача', max_length=200, db_index=True)
+    payload = models.TextField('Аргументы (JSON)', default='{}')
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток',
+        default=3
+    )
+    run_at = models.DateTimeField('Запустить после', default=timezone.now)
+    created = models.DateTimeField('Создана', auto_now_add=True)
+    started = models.DateTimeField('Запущена', null=True, blank=True)
+    finished = models.DateTimeField('Завершена', null=True, blank=True)
+    duration = models.FloatField('Длительность, с', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    progress = models.TextField('Прогресс (JSON)', default='{}')
+
+    class Meta:
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.status})'
@@ -0,0 +1,62 @@
+import json
+import threading
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.executor import submit_blocking
+from .models import Task
+
+registry = {}
+
+
+def enqueue(name, args=(), kwargs=None, delay=0, max_attempts=None):
+    """Ставит задачу в очередь, которую разбирает `manage.py runworker`.
+
+    При TASKS['IN_PROCESS'] задача уходит в пул потоков, а отложенная -
+    в пул по таймеру, чтобы периодические задачи не шли подряд.
+    """
+    func = registry[name]
+    if settings.TASKS['IN_PROCESS']:
+        if delay <= 0:
+            return submit_blocking(func, *args, **(kwargs or {}))
+        timer = threading.Timer(
+            delay, submit_blocking, (func,) + tuple(args), kwargs
+        )
+        timer.daemon = True
+        timer.start()
+        return timer
+    return Task.objects.create(
+        name=name,
+        payload=json.dumps({'args': list(args), 'kwargs': kwargs or {}}),
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or func.max_attempts
+    )
+
+
+def task(name=None, max_attempts=None):
+    """Регистрирует функцию как фоновую задачу.
+
+    Функция по-прежнему вызывается напрямую, а `func.delay(...)`
+    откладывает ее выполнение до воркера; `func.enqueue_in(секунды, ...)`
+    - не раньше чем через указанное время.
+    """
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+
+        @wraps(func)
+        def delay(*args, **kwargs):
+            return enqueue(task_name, args, kwargs)
+
+        def enqueue_in(seconds, *args, **kwargs):
+            return enqueue(task_name, args, kwargs, delay=seconds)
+
+        func.task_name = task_name
+        func.max_attempts = max_attempts or settings.TASKS['MAX_ATTEMPTS']
+        func.delay = delay
+        func.enqueue_in = enqueue_in
+        registry[task_name] = func
+        return func
+    return decorator
@@ -0,0 +1,21 @@
+import base64
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from .registry import task
+
+
+@task(name='tasks.send_email')
+def send_email(alternatives=(), attachments=(), **fields):
+    message = EmailMultiAlternatives(
+        connection=get_connection(settings.TASKS_EMAIL_BACKEND),
+        **fields
+    )
+    for content, mimetype in alternatives:
+        message.attach_alternative(content, mimetype)
+    for filename, content, mimetype, encoded in attachments:
+        if encoded:
+            content = base64.b64decode(content)
+        message.attach(filename, content, mimetype)
+    message.send()
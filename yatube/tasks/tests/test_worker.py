@@ -0,0 +1,127 @@
+import threading
+from datetime import timedelta
+from email.mime.text import MIMEText
+
+from django.conf import settings
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+from tasks.mail import QueuedEmailBackend
+from tasks.models import Task
+from tasks.registry import registry, task
+from tasks.worker import claim, requeue_stale, run_task
+
+CALLS = []
+
+
+@task(name='tests.record')
+def record(value):
+    CALLS.append(value)
+
+
+@task(name='tests.notify')
+def notify(event):
+    event.set()
+
+
+@task(name='tests.explode', max_attempts=2)
+def explode():
+    raise ValueError('boom')
+
+
+class WorkerTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_delay_creates_queued_task(self):
+        queued = record.delay(42)
+        self.assertEqual(queued.status, Task.QUEUED)
+        self.assertIn('tests.record', registry)
+        self.assertEqual(CALLS, [])
+
+    @override_settings(TASKS=dict(settings.TASKS, IN_PROCESS=True))
+    def test_in_process_delay_is_respected(self):
+        done = threading.Event()
+        timer = notify.enqueue_in(0.2, done)
+        self.assertFalse(done.wait(0.05))
+        self.assertTrue(done.wait(2))
+        timer.join()
+
+    def test_worker_runs_task_and_records_timing(self):
+        queued = record.delay(42)
+        self.assertEqual(claim(10), [queued.pk])
+        self.assertEqual(claim(10), [])  # повторно задачу не отдают
+        done = run_task(queued.pk)
+        self.assertEqual(CALLS, [42])
+        self.assertEqual(done.status, Task.DONE)
+        self.assertEqual(done.attempts, 1)
+        self.assertIsNotNone(done.duration)
+
+    def test_failed_task_is_retried_with_backoff(self):
+        queued = explode.delay()
+        claim(10)
+        retried = run_task(queued.pk)
+        self.assertEqual(retried.status, Task.QUEUED)
+        self.assertGreater(retried.run_at, queued.run_at)
+        self.assertIn('boom', retried.last_error)
+        Task.objects.filter(pk=queued.pk).update(run_at=queued.run_at)
+        claim(10)
+        self.assertEqual(run_task(queued.pk).status, Task.FAILED)
+
+    def test_stale_task_fails_after_last_attempt(self):
+        retried = explode.delay()
+        exhausted = explode.delay()
+        claim(10)
+        Task.objects.filter(pk=exhausted.pk).update(attempts=2)
+        Task.objects.update(started=timezone.now() - timedelta(days=1))
+        self.assertEqual(requeue_stale(), 1)
+        retried.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual(retried.status, Task.QUEUED)
+        self.assertEqual(exhausted.status, Task.FAILED)
+
+    @override_settings(
+        TASKS_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+    )
+    def test_email_is_sent_by_worker(self):
+        mail.send_mail(
+            'Тема', 'Текст', 'from@example.com', ['to@example.com'],
+            connection=QueuedEmailBackend()
+        )
+        self.assertEqual(len(mail.outbox), 0)
+        for pk in claim(10):
+            run_task(pk)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Тема')
+
+    @override_settings(
+        TASKS_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+    )
+    def test_email_attachments_are_queued(self):
+        message = mail.EmailMessage(
+            gettext_lazy('Тема'), 'Текст', 'from@example.com',
+            ['to@example.com'], connection=QueuedEmailBackend()
+        )
+        message.attach('notes.txt', 'Заметка', 'text/plain')
+        message.attach('data.bin', b'\x00\xff', 'application/octet-stream')
+        message.send()
+        for pk in claim(10):
+            run_task(pk)
+        sent = mail.outbox[0]
+        self.assertEqual(sent.subject, 'Тема')
+        self.assertEqual(sent.attachments, [
+            ('notes.txt', 'Заметка', 'text/plain'),
+            ('data.bin', b'\x00\xff', 'application/octet-stream'),
+        ])
+
+    def test_mime_attachments_are_rejected(self):
+        message = mail.EmailMessage(
+            'Тема', 'Текст', 'from@example.com', ['to@example.com'],
+            connection=QueuedEmailBackend()
+        )
+        message.attach(MIMEText('Текст'))
+        with self.assertRaises(ValueError):
+            message.send()
+        self.assertFalse(Task.objects.exists())
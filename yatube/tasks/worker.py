@@ -0,0 +1,124 @@
+import json
+import logging
+import random
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .registry import registry
+
+logger = logging.getLogger(__name__)
+
+# задача, которую выполняет текущий поток воркера
+_current = threading.local()
+
+
+def requeue_stale():
+    """Возвращает в очередь задачи, воркер которых так и не отчитался.
+
+    Задачи, исчерпавшие попытки, помечаются FAILED, иначе задача,
+    которая роняет воркер, перезапускалась бы бесконечно.
+    """
+    now = timezone.now()
+    stale = Task.objects.filter(
+        status=Task.RUNNING,
+        started__lt=now - timedelta(seconds=settings.TASKS['TIMEOUT'])
+    )
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.FAILED,
+        finished=now,
+        last_error='Воркер не отчитался о задаче'
+    )
+    return stale.update(status=Task.QUEUED)
+
+
+def claim(limit):
+    now = timezone.now()
+    candidates = Task.objects.filter(
+        status=Task.QUEUED,
+        run_at__lte=now
+    ).values_list('pk', flat=True)[:limit]
+    claimed = []
+    for pk in candidates:
+        # задачу забирает тот воркер, чей UPDATE сработал первым
+        if Task.objects.filter(pk=pk, status=Task.QUEUED).update(
+            status=Task.RUNNING,
+            started=now,
+            attempts=F('attempts') + 1
+        ):
+            claimed.append(pk)
+    return claimed
+
+
+def backoff(attempt):
+    delay = settings.TASKS['RETRY_BACKOFF'] * 2 ** (attempt - 1)
+    return delay + random.uniform(0, delay / 2)
+
+
+def report_progress(step, done):
+    """Записывает прогресс выполняемой задачи в ее строку Task.
+
+    Вне воркера (прямой вызов, TASKS['IN_PROCESS']) ничего не делает.
+    """
+    pk = getattr(_current, 'pk', None)
+    if pk is None:
+        return
+    _current.progress[step] = done
+    Task.objects.filter(pk=pk).update(
+        progress=json.dumps(_current.progress, ensure_ascii=False)
+    )
+
+
+def run_task(pk):
+    task = Task.objects.get(pk=pk)
+    payload = json.loads(task.payload)
+    started = time.monotonic()
+    _current.pk, _current.progress = task.pk, {}
+    try:
+        registry[task.name](*payload['args'], **payload['kwargs'])
+    except Exception:
+        logger.exception('Задача %s (%s) упала', task.name, task.pk)
+        task.last_error = traceback.format_exc()
+        if task.attempts < task.max_attempts:
+            task.status = Task.QUEUED
+            task.run_at = timezone.now() + timedelta(
+                seconds=backoff(task.attempts)
+            )
+        else:
+            task.status = Task.FAILED
+    else:
+        task.status = Task.DONE
+    finally:
+        _current.pk = None
+    task.duration = time.monotonic() - started
+    task.finished = timezone.now()
+    task.save(update_fields=[
+        'status', 'run_at', 'duration', 'finished', 'last_error'
+    ])
+    logger.info(
+        'Задача %s (%s): %s за %.3f с',
+        task.name, task.pk, task.status, task.duration
+    )
+    return task
+
+
+def run_in_thread(pk):
+    try:
+        return run_task(pk)
+    finally:
+        connection.close()
+
+
+def purge_finished():
+    keep = timedelta(days=settings.TASKS['KEEP_DONE_DAYS'])
+    return Task.objects.filter(
+        status=Task.DONE,
+        finished__lt=timezone.now() - keep
+    ).delete()
@@ -0,0 +1,39 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+
+from posts.deletion import delete_user
+from posts.tasks import delete_user_in_chunks
+
+User = get_user_model()
+
+
+class ChunkedDeleteUserAdmin(UserAdmin):
+    actions = ('delete_in_background',)
+
+    def get_actions(self, request):
+        # каскад по постам, комментариям и подпискам - порциями в фоне
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def delete_in_background(self, request, queryset):
+        for user in queryset:
+            delete_user_in_chunks.delay(user.pk)
+        self.message_user(
+            request,
+            'Пользователей поставлено в очередь на удаление: '
+            f'{queryset.count()}'
+        )
+    delete_in_background.short_description = 'Удалить в фоне'
+
+    def get_deleted_objects(self, objs, request):
+        # подтверждение не обходит весь каскад: его удаляет delete_user
+        return [str(obj) for obj in objs], {}, set(), []
+
+    def delete_model(self, request, obj):
+        delete_user(obj.pk)
+
+
+admin.site.unregister(User)
+admin.site.register(User, ChunkedDeleteUserAdmin)
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import transaction
+
+USER_CACHE_KEY = 'auth:user:{user_id}'
+
+
+def get_cache():
+    """Кэш AUTH_USER_CACHE, общий для всех процессов сайта."""
+    return caches[settings.AUTH_USER_CACHE]
+
+
+def forget_user(user_id):
+    """Сбрасывает кэшированного пользователя.
+
+    Сигналы вызывают ее на save() и delete(); код, меняющий
+    пользователей через QuerySet.update(), вызывает ее сам. Повторный
+    сброс после коммита убирает строку, которую параллельный запрос
+    успел закэшировать до него.
+    """
+    key = USER_CACHE_KEY.format(user_id=user_id)
+    cache = get_cache()
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берет пользователя сессии из кэша.
+
+    Проверку хэша пароля в сессии django.contrib.auth.get_user выполняет
+    как обычно, так что смена пароля по-прежнему завершает чужие сессии.
+    """
+
+    def get_user(self, user_id):
+        key = USER_CACHE_KEY.format(user_id=user_id)
+        cache = get_cache()
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
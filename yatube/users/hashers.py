@@ -0,0 +1,114 @@
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.hashers import BasePasswordHasher, mask_hash
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+from core.executor import BoundedPool
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def run_hashing(func, *args, **kwargs):
+    """Считает хэш в отдельном пуле PASSWORD_HASHING['WORKERS'] потоков:
+    шторм логинов занимает не больше этого числа ядер, остальные
+    остаются рендеру страниц."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BoundedPool(
+                'yatube-hashing',
+                settings.PASSWORD_HASHING['WORKERS'],
+                settings.PASSWORD_HASHING['QUEUE_SIZE']
+            )
+    return _pool.run(func, *args, **kwargs)
+
+
+class ScryptPasswordHasher(BasePasswordHasher):
+    """scrypt из hashlib с параметрами из PASSWORD_HASHING.
+
+    Формат совпадает с ScryptPasswordHasher из Django 4.0:
+    scrypt$<n>$<salt>$<r>$<p>$<hash>. Хэши со старыми параметрами
+    пересчитываются при следующем входе (must_update).
+    """
+    algorithm = 'scrypt'
+    dklen = 64
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_HASHING['SCRYPT_N']
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_HASHING['SCRYPT_R']
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHING['SCRYPT_P']
+
+    def _hash(self, password, salt, n, r, p):
+        digest = run_hashing(
+            hashlib.scrypt,
+            password.encode(),
+            salt=salt.encode(),
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r * p,
+            dklen=self.dklen
+        )
+        return base64.b64encode(digest).decode('ascii').strip()
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        digest = self._hash(password, salt, n, r, p)
+        return f'{self.algorithm}${n}${salt}${r}${p}${digest}'
+
+    def decode(self, encoded):
+        algorithm, n, salt, r, p, digest = encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {
+            'n': int(n),
+            'salt': salt,
+            'r': int(r),
+            'p': int(p),
+            'hash': digest,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(
+            password, decoded['salt'],
+            decoded['n'], decoded['r'], decoded['p']
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return OrderedDict([
+            (_('algorithm'), self.algorithm),
+            (_('work factor'), decoded['n']),
+            (_('block size'), decoded['r']),
+            (_('parallelism'), decoded['p']),
+            (_('salt'), mask_hash(decoded['salt'])),
+            (_('hash'), mask_hash(decoded['hash'])),
+        ])
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (decoded['n'], decoded['r'], decoded['p']) != (
+            self.work_factor, self.block_size, self.parallelism
+        )
+
+    def harden_runtime(self, password, encoded):
+        # время проверки зависит только от параметров в самом хэше
+        pass
@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Пропускная способность проверки паролей: входов в секунду на ядро'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Сколько одновременных "входов" имитировать'
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=5,
+            help='Длительность замера для каждого алгоритма'
+        )
+        parser.add_argument(
+            '--hasher',
+            action='append',
+            dest='hashers',
+            help='Алгоритм (по умолчанию scrypt и pbkdf2_sha256)'
+        )
+
+    def measure(self, encoded, threads, seconds):
+        counts = [0] * threads
+        deadline = time.monotonic() + seconds
+
+        def login(index):
+            while time.monotonic() < deadline:
+                check_password('benchmark-password', encoded)
+                counts[index] += 1
+
+        workers = [
+            threading.Thread(target=login, args=(index,))
+            for index in range(threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return sum(counts) / seconds
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        cores = os.cpu_count() or 1
+        for algorithm in options['hashers'] or ['scrypt', 'pbkdf2_sha256']:
+            encoded = make_password('benchmark-password', hasher=algorithm)
+            rate = self.measure(encoded, threads, options['seconds'])
+            busy = min(threads, cores)
+            if algorithm == 'scrypt':
+                busy = min(busy, settings.PASSWORD_HASHING['WORKERS'])
+            self.stdout.write(
+                f'{algorithm}: {rate:.1f} входов/с, '
+                f'{rate / busy:.1f} входов/с на ядро '
+                f'(потоков {threads}, занято ядер {busy} из {cores})'
+            )
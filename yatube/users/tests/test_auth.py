@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from users.backends import USER_CACHE_KEY, forget_user
+
+User = get_user_model()
+
+
+class CachedSessionUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='HasNoName',
+            password='old-password-123'
+        )
+        self.authorized_client = Client()
+        self.authorized_client.login(
+            username='HasNoName',
+            password='old-password-123'
+        )
+        self.address = reverse('about:author')
+
+    def test_authenticated_page_without_queries(self):
+        self.authorized_client.get(self.address)  # пользователь попал в кэш
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(self.address)
+        self.assertContains(response, self.user.username)
+
+    def test_password_change_invalidates_snapshot(self):
+        self.authorized_client.get(self.address)
+        self.user.set_password('new-password-456')
+        self.user.save()
+        response = self.authorized_client.get(self.address)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'auth': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'auth',
+        },
+    }, AUTH_USER_CACHE='auth')
+    def test_snapshot_lives_in_auth_cache(self):
+        caches['auth'].clear()
+        self.authorized_client.get(self.address)
+        key = USER_CACHE_KEY.format(user_id=self.user.pk)
+        self.assertIsNotNone(caches['auth'].get(key))
+        self.assertIsNone(cache.get(key))
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        forget_user(self.user.pk)
+        response = self.authorized_client.get(self.address)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_logout_clears_snapshot(self):
+        self.authorized_client.get(self.address)
+        self.authorized_client.get(reverse('users:logout'))
+        response = self.authorized_client.get(self.address)
+        self.assertFalse(response.context['user'].is_authenticated)
@@ -0,0 +1,39 @@
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import TestCase, override_settings
+
+User = get_user_model()
+
+HASHING = {
+    'SCRYPT_N': 2 ** 10,
+    'SCRYPT_R': 8,
+    'SCRYPT_P': 1,
+    'WORKERS': 1,
+    'QUEUE_SIZE': 4,
+}
+
+
+@override_settings(PASSWORD_HASHING=HASHING)
+class PasswordHashingTests(TestCase):
+    def test_new_passwords_use_scrypt(self):
+        user = User.objects.create_user('HasNoName', password='pass-1234')
+        self.assertEqual(identify_hasher(user.password).algorithm, 'scrypt')
+        self.assertTrue(user.check_password('pass-1234'))
+        self.assertFalse(user.check_password('wrong'))
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        user = User.objects.create_user('HasNoName')
+        user.password = make_password('pass-1234', hasher='pbkdf2_sha256')
+        user.save()
+        self.assertEqual(
+            authenticate(username='HasNoName', password='pass-1234'), user
+        )
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$1024$'))
+
+    def test_hash_is_upgraded_when_parameters_change(self):
+        user = User.objects.create_user('HasNoName', password='pass-1234')
+        with self.settings(PASSWORD_HASHING=dict(HASHING, SCRYPT_N=2 ** 11)):
+            authenticate(username='HasNoName', password='pass-1234')
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$2048$'))
@@ -27,7 +27,10 @@ DEBUG = True
 
 ALLOWED_HOSTS = [
     'www.avnikitenko.pythonanywhere.com',
-    'avnikitenko.pythonanywhere.com'
+    'avnikitenko.pythonanywhere.com',
+    # локальный сервер, в том числе для manage.py loadtest
+    'localhost',
+    '127.0.0.1',
     ]
 
 # Application definition
@@ -37,12 +40,15 @@ INSTALLED_APPS = [
     'core.apps.CoreConfig',
     'users.apps.UsersConfig',
     'posts.apps.PostsConfig',
+    'tasks.apps.TasksConfig',
+    'loadtest.apps.LoadtestConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'sorl.thumbnail',
 ]
 
@@ -52,6 +58,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.RateLimitMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -70,6 +77,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'posts.context_processors.following',
             ],
 
         },
@@ -78,6 +86,15 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+# компилировать все шаблоны при старте (см. settings_production)
+WARM_UP_TEMPLATES = False
+
+# пул потоков для блокирующего ввода-вывода вне запроса (core.executor)
+BLOCKING_POOL = {
+    'WORKERS': 4,
+    'QUEUE_SIZE': 32,
+}
+
 
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
@@ -109,6 +126,37 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Пароли хэшируются scrypt (users.hashers); хэши других алгоритмов и
+# со старыми параметрами пересчитываются при входе пользователя.
+# Argon2 используется, только если установлен argon2-cffi.
+PASSWORD_HASHERS = [
+    'users.hashers.ScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+PASSWORD_HASHING = {
+    # 2 ** 14 * 8 * 128 байт = 16 МБ памяти на один хэш
+    'SCRYPT_N': 2 ** 14,
+    'SCRYPT_R': 8,
+    'SCRYPT_P': 1,
+    # потоки для хэширования: не больше половины ядер
+    'WORKERS': max(1, (os.cpu_count() or 2) // 2),
+    'QUEUE_SIZE': 64,
+}
+
+# Сессии хранятся в подписанной cookie, а пользователь сессии - в кэше:
+# до вызова view запросов к БД нет. Снимок живет недолго, чтобы правка,
+# не сбросившая его (users.backends.forget_user), не держалась долго.
+# Кэш AUTH_USER_CACHE с несколькими процессами должен быть общим, иначе
+# сброс видит только один процесс (см. settings_production)
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+AUTH_USER_CACHE = 'default'
+AUTH_USER_CACHE_TIMEOUT = 60 * 5
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/2.2/topics/i18n/
 
@@ -128,26 +176,192 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+STATIC_ROOT = os.path.join(BASE_DIR, 'static_root')
+# manage.py buildstatic кладет сюда CSS без неиспользуемых правил
+STATIC_BUILD_DIR = os.path.join(BASE_DIR, 'static_build')
+STATIC_PURGE_CSS = ('css/bootstrap.min.css',)
+# классы, которые не встречаются в шаблонах, но нужны (например, из JS)
+STATIC_PURGE_SAFELIST = ('show', 'fade', 'collapse', 'collapsing', 'active')
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-#  подключаем движок filebased.EmailBackend
+
+def _profile_url(user):
+    # импорт при вызове: settings загружаются раньше кода приложений
+    from core.urlbuilder import build_url
+    return build_url('posts:profile', user.username)
+
+
+# user.get_absolute_url() - страница профиля (core.urlbuilder)
+ABSOLUTE_URL_OVERRIDES = {
+    'auth.user': _profile_url,
+}
+
+# письма отправляются сразу: очередь задач без запущенного воркера
+# (manage.py runworker) их бы не отправила. Вместе с воркером ставится
+# EMAIL_BACKEND = 'tasks.mail.QueuedEmailBackend' - письма уходят в
+# очередь, а воркер отправляет их через TASKS_EMAIL_BACKEND
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+TASKS_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 # указываем директорию, в которую будут складываться файлы писем
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# строк в одной транзакции при удалении пользователей и групп
+# (posts.deletion)
+DELETION_CHUNK_SIZE = 500
+
+# рейтинг популярных постов (posts.trending)
+TRENDING = {
+    'WINDOW_HOURS': 48,  # комментарии за это время считаются "свежими"
+    'MAX_AGE_HOURS': 24 * 7,  # более старые посты в рейтинг не попадают
+    'COMMENT_WEIGHT': 1.0,
+    'FOLLOWER_WEIGHT': 0.5,
+    'GRAVITY': 1.5,
+    'SIZE': 500,  # сколько постов хранить в таблице рейтинга
+    'INTERVAL': 300,  # период пересчета в очереди задач, секунд
+}
+
+# рекомендации "на кого подписаться" (posts.recommendations)
+RECOMMENDATIONS = {
+    'TOP_K': 20,  # сколько авторов хранить для каждого пользователя
+    'FOF_WEIGHT': 1.0,  # вес "подписки моих подписок"
+    'COFOLLOW_WEIGHT': 2.0,  # вес авторов с общими подписчиками
+    'BLOCK_SIZE': 1000,  # пользователей в одном блоке умножения матриц
+    'MAX_DEGREE': 1000,  # подписчики с большим числом подписок пропускаются
+}
+
+# RSS/Atom-ленты (posts.feeds): сколько записей и сколько секунд хранить
+# готовую ленту в кэше
+FEEDS = {
+    'SIZE': 20,
+    'TIMEOUT': 60 * 5,
+}
+
+# карта сайта (posts.sitemaps): посты разбиты по месяцам; закрытые месяцы
+# почти не меняются и кэшируются на CLOSED_TIMEOUT
+SITEMAPS = {
+    'LIMIT': 10000,  # адресов в одном файле
+    'TIMEOUT': 60 * 15,
+    'CLOSED_TIMEOUT': 60 * 60 * 24,
+}
+
+# архив старых постов (posts.archive): посты старше AGE_DAYS вместе с
+# комментариями переносятся в отдельные таблицы порциями по CHUNK_SIZE
+ARCHIVE = {
+    'AGE_DAYS': 365,
+    'CHUNK_SIZE': 500,
+    'INTERVAL': 60 * 60 * 24,  # период фоновой задачи, секунд
+    'COUNT_TIMEOUT': 60 * 5,  # сколько кэшируется число архивных постов
+}
+
+# история правок постов (posts.revisions): каждая N-я версия хранится
+# целиком, чтобы восстановление не проходило всю цепочку дельт
+REVISIONS = {
+    'SNAPSHOT_EVERY': 50,
+}
+
 # количество строк в Paginator
 PAGE_ROWS_COUNT = 10
+# отдавать списки постов потоком (StreamingHttpResponse)
+POSTS_STREAMING = False
+# срок жизни готового HTML карточки поста (posts.cards); ключ меняется
+# вместе с содержимым карточки, поэтому срок можно делать большим
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# миниатюры картинок постов именуются по хэшу содержимого (core.thumbnails)
+THUMBNAIL_BACKEND = 'core.thumbnails.ContentAddressedThumbnailBackend'
+
+# через сколько секунд после удаления последней ссылки удаляется файл
+# картинки (posts.images.release_image): загрузка того же содержимого,
+# которая уже получила имя файла, успевает сохранить свой пост
+IMAGE_RELEASE_DELAY = 60 * 60
+
+# адаптивные варианты картинок постов (posts.variants): готовятся фоновой
+# задачей для каждой ширины и формата, шаблоны отдают srcset
+IMAGE_VARIANTS = {
+    'WIDTHS': (480, 960, 1440),
+    'ASPECT': (960, 339),
+    # форматы, которые не умеет сохранять Pillow, пропускаются;
+    # последний - запасной для <img>
+    'FORMATS': ('WEBP', 'JPEG'),
+    'DEFAULT_WIDTH': 960,  # src и размеры <img>
+    'SIZES': '(max-width: 992px) 100vw, 960px',
+}
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
+
+# очередь фоновых задач (tasks); IN_PROCESS = True выполняет задачи в пуле
+# потоков веб-процесса, если отдельный воркер не запущен
+TASKS = {
+    'IN_PROCESS': False,
+    'WORKER_THREADS': 4,
+    'POLL_INTERVAL': 1,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_BACKOFF': 5,
+    'TIMEOUT': 300,
+    'KEEP_DONE_DAYS': 7,
+}
+
+# EstimatedCountPaginator: оценка числа строк вместо COUNT(*) для таблиц
+# больше порога, точный COUNT(*) кэшируется на указанное время
+ESTIMATED_COUNT_THRESHOLD = 100000
+ESTIMATED_COUNT_TIMEOUT = 60
+
+# лимиты запросов по имени view из posts.urls / users.urls
+# (core.middleware.RateLimitMiddleware): ключ - пользователь или IP,
+# burst - емкость ведра (по умолчанию равна числу запросов в rate).
+# Счетчики лежат в кэше RATELIMIT_CACHE: с несколькими процессами это
+# должен быть общий memcached (см. settings_production)
+RATELIMIT_CACHE = 'default'
+RATELIMITS = {
+    'posts:post_create': {'rate': '10/m', 'methods': ['POST']},
+    'posts:post_edit': {'rate': '20/m', 'methods': ['POST']},
+    'posts:add_comment': {'rate': '20/m', 'methods': ['POST']},
+    'posts:profile_follow': {'rate': '60/m'},
+    'posts:profile_unfollow': {'rate': '60/m'},
+    'users:signup': {'rate': '10/h', 'methods': ['POST']},
+}
+
+# общий кэш страниц с персональными фрагментами (core.holepunch)
+HOLEPUNCH = {
+    'ENABLED': False,
+    'TIMEOUT': 20,  # сколько секунд живет общая страница
+    'QUERY_PARAMS': ('page',),  # остальные параметры не входят в ключ
+    # алиас CACHES; с несколькими процессами - общий (см. settings_production)
+    'CACHE': 'default',
+}
+
+# защита кэша от одновременного пересчета (core.cache)
+STAMPEDE_CACHE = {
+    'STALE_TIMEOUT': 60,
+    'BETA': 1.0,
+    'LOCK_TIMEOUT': 10,
+    'WAIT_TIMEOUT': 2,
+}
+
+# нагрузочное тестирование (manage.py loadtest): веса сценариев смеси
+# и каталог, где хранятся прогоны для сравнения между коммитами
+LOADTEST = {
+    'MIX': {
+        'anonymous_index': 40,
+        'deep_pagination': 10,
+        'profile': 20,
+        'follow_feed': 15,
+        'comment_burst': 10,
+        'image_upload': 5,
+    },
+    'CONCURRENCY': 20,
+    'DURATION': 30,
+    'RESULTS_DIR': os.path.join(BASE_DIR, 'loadtest_results'),
+}
@@ -0,0 +1,72 @@
+"""
+Production settings for yatube project.
+
+Usage: DJANGO_SETTINGS_MODULE=yatube.settings_production
+"""
+
+import copy
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import (
+    CACHES, HOLEPUNCH, MIDDLEWARE, SECRET_KEY, STATIC_BUILD_DIR,
+    STATICFILES_DIRS, TEMPLATES
+)
+
+SECRET_KEY = os.environ.get('SECRET_KEY', SECRET_KEY)
+
+DEBUG = False
+
+# Шаблоны компилируются один раз на процесс (cached.Loader); остальное
+# берется из settings.TEMPLATES
+TEMPLATES = copy.deepcopy(TEMPLATES)
+TEMPLATES[0].pop('APP_DIRS', None)
+TEMPLATES[0]['OPTIONS'].update(
+    loaders=[
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ],
+    debug=False,
+)
+
+# при старте процесса (yatube.wsgi) компилируются все шаблоны из templates/
+WARM_UP_TEMPLATES = True
+
+# статика: manage.py buildstatic, затем хэшированные и сжатые файлы
+# отдаются с Cache-Control: immutable
+STATICFILES_DIRS = (STATIC_BUILD_DIR,) + STATICFILES_DIRS
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+MIDDLEWARE = [
+    MIDDLEWARE[0],
+    'core.middleware.StaticFilesMiddleware',
+] + MIDDLEWARE[1:]
+
+# главная, группы, профили и посты отдаются из общего кэша, персональные
+# фрагменты дорисовываются для каждого запроса. Страницы и их версия лежат
+# в memcached: после invalidate() старую страницу не отдаст ни один процесс
+HOLEPUNCH = dict(HOLEPUNCH, ENABLED=True, CACHE='holepunch')
+
+# лимиты запросов считаются в memcached, общем для всех процессов:
+# add/incr там атомарны, а LocMemCache видит только свой процесс
+CACHES = dict(CACHES, ratelimit={
+    'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+    'LOCATION': os.environ.get('RATELIMIT_MEMCACHED', '127.0.0.1:11211'),
+})
+RATELIMIT_CACHE = 'ratelimit'
+
+# пользователь сессии тоже кэшируется в общем memcached: сброс снимка
+# после смены пароля или блокировки должен увидеть каждый процесс
+CACHES['auth'] = {
+    'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+    'LOCATION': os.environ.get('AUTH_MEMCACHED', '127.0.0.1:11211'),
+    'KEY_PREFIX': 'auth',
+}
+AUTH_USER_CACHE = 'auth'
+
+CACHES['holepunch'] = {
+    'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+    'LOCATION': os.environ.get('HOLEPUNCH_MEMCACHED', '127.0.0.1:11211'),
+    'KEY_PREFIX': 'holepunch',
+}